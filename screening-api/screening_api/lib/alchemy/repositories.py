@@ -1,7 +1,9 @@
 """Screening API lib alchemy repositories module"""
+from datetime import datetime
 from typing import List, Tuple
 
 from sqlalchemy import inspect
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.sql.elements import UnaryExpression
 from sqlalchemy.orm import joinedload
@@ -136,6 +138,42 @@ class AlchemyRepository:
 
         return instance
 
+    def upsert_many(
+            self, data_list: List[dict], index_elements: List[str],
+            update_fields: List[str] = None, **options) -> None:
+        """
+        Bulk INSERT ... ON CONFLICT DO UPDATE (or DO NOTHING without
+        update_fields) in a single statement.
+
+        Rows in data_list must be unique on index_elements.
+        """
+        session = options.pop('session', None)
+        if session is None:
+            session = self.get_session()
+
+        if not data_list:
+            return
+
+        now = datetime.utcnow()
+        values = [
+            dict({'created': now, 'updated': now}, **data)
+            for data in data_list
+        ]
+
+        statement = insert(self.model.__table__).values(values)
+        if update_fields:
+            set_ = {
+                field_name: statement.excluded[field_name]
+                for field_name in update_fields + ['updated']
+            }
+            statement = statement.on_conflict_do_update(
+                index_elements=index_elements, set_=set_)
+        else:
+            statement = statement.on_conflict_do_nothing(
+                index_elements=index_elements)
+
+        session.execute(statement)
+
     def delete(self, **kwargs):
         query = self._filter_query(**kwargs)
 
@@ -164,9 +202,10 @@ class AlchemyRepository:
 
         query = session.query(self.model)
 
-        ids = kwargs.pop('id__in', None)
-        if ids is not None:
-            query = query.filter(self.model.id.in_(ids))
+        # <field>__in filters, i.e. id__in
+        for key in [key for key in kwargs if key.endswith('__in')]:
+            attr = self.get_attr(key[:-len('__in')])
+            query = query.filter(attr.in_(kwargs.pop(key)))
 
         joinedload_related = kwargs.pop('joinedload_related', None)
         subqueryload = kwargs.pop('subqueryload', None)
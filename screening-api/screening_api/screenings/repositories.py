@@ -1,24 +1,62 @@
 """Screening API screenings repositories module"""
 import logging
 from datetime import datetime
-from typing import List
+from typing import Iterator, List, Tuple, Type
 
-from sqlalchemy.sql.expression import or_
+from sqlalchemy.schema import Column
+from sqlalchemy.sql.dml import Update
+from sqlalchemy.sql.expression import (
+    ColumnClause, and_, bindparam, case, cast, func, literal_column, or_,
+)
+from sqlalchemy.types import ARRAY, String
 
 from screening_api.lib.alchemy.paginators import AlchemyPaginator
 from screening_api.lib.alchemy.queries import ExtendedQuery
 from screening_api.lib.alchemy.repositories import AlchemyRepository
-from screening_api.screenings.enums import Severity, SeverityChange, Status
+from screening_api.screenings.enums import (
+    ComparableEnum, Severity, SeverityChange, Status,
+)
 from screening_api.screenings.models import Screening
 from screening_api.screenings.signals import bulk_screen_screenings
 
 log = logging.getLogger(__name__)
 
+# screening severity columns calculated from the checks severity columns
+CHECKS_SEVERITY_GROUPS = {
+    'company_sanctions_severity': [
+        'ship_registered_owner_company_severity',
+        'ship_operator_company_severity',
+        'ship_beneficial_owner_company_severity',
+        'ship_manager_company_severity',
+        'ship_technical_manager_company_severity',
+        'ship_company_associates_severity',
+    ],
+    'ship_sanctions_severity': [
+        'ship_association_severity', 'ship_sanction_severity',
+    ],
+    'country_sanctions_severity': [
+        'ship_flag_severity', 'ship_registered_owner_severity',
+        'ship_operator_severity', 'ship_beneficial_owner_severity',
+        'ship_manager_severity', 'ship_technical_manager_severity',
+        'doc_company_severity',
+    ],
+    'ship_inspections_severity': [
+        'ship_inspections_severity',
+    ],
+    'ship_movements_severity': [
+        'port_visits_severity', 'zone_visits_severity',
+    ],
+}
+
 
 class ScreeningsRepository(AlchemyRepository):
 
     model = Screening
 
+    # update_check statements (and their compiled forms) per updated columns
+    _update_check_statements = {}
+    _update_check_compiled_cache = {}
+
     def create(
             self, account_id: int, ship_id: int,
             **kwargs) -> Screening:
@@ -76,6 +114,194 @@ class ScreeningsRepository(AlchemyRepository):
             session.refresh(instance)
             return instance
 
+    def update_check(self, id: int, **kwargs) -> Status:
+        """
+        Lightweight update of screening checks status/severity columns.
+
+        Same result as `update`, but with a single UPDATE statement: the
+        screening status, and severities when the screening gets done, are
+        recalculated in SQL, so no row lock is held between reading and
+        writing the screening.
+
+        Returns:
+            New screening status
+        """
+        session = kwargs.pop('session', None)
+        if session is None:
+            session = self.get_session()
+
+        statement = self._get_update_check_statement(tuple(sorted(kwargs)))
+
+        session.begin()
+        try:
+            connection = session.connection().execution_options(
+                compiled_cache=self._update_check_compiled_cache)
+            params = {'new_' + key: value for key, value in kwargs.items()}
+            new_status = connection.execute(
+                statement, screening_id=id, **params).scalar()
+        except Exception as e:
+            log.error('Unable to update screening %s: %s', id, e)
+            session.rollback()
+            raise
+        else:
+            session.commit()
+
+        if new_status == Status.DONE:
+            log.info('Finished screening %s', id)
+
+        return new_status
+
+    def _get_update_check_statement(self, keys: Tuple[str]) -> Update:
+        if keys in self._update_check_statements:
+            return self._update_check_statements[keys]
+
+        table = self.model.__table__
+        values = {
+            table.c[key]: bindparam('new_' + key, type_=table.c[key].type)
+            for key in keys
+        }
+
+        # SET expressions see the row values from before the update
+        def greatest(names, enum):
+            return func.greatest(*[
+                self._get_rank_expression(
+                    values.get(table.c[name], table.c[name]), enum)
+                for name in names
+            ])
+
+        def when_done(name, expression):
+            return case([(done, expression)], else_=table.c[name])
+
+        check_severity_names = [
+            name
+            for names in CHECKS_SEVERITY_GROUPS.values() for name in names
+        ]
+        check_status_names = [
+            name.replace('_severity', '_status')
+            for name in check_severity_names
+        ]
+
+        status = greatest(check_status_names, Status)
+        done = and_(
+            table.c.status != Status.DONE,
+            status == self._get_rank(Status.DONE),
+        )
+
+        severity = greatest(check_severity_names, Severity)
+        previous_severity = self._get_rank_expression(
+            table.c.severity, Severity)
+        unknown = self._get_rank(Severity.UNKNOWN)
+        severity_change = case([
+            (or_(previous_severity == unknown, severity == unknown),
+             SeverityChange.NOCHANGE.name),
+            (previous_severity > severity, SeverityChange.DECREASED.name),
+            (previous_severity < severity, SeverityChange.INCREASED.name),
+        ], else_=SeverityChange.NOCHANGE.name)
+
+        values.update({
+            table.c.status: self._get_enum_expression(
+                status, table.c.status),
+            table.c.previous_severity: when_done(
+                'previous_severity', table.c.severity),
+            table.c.previous_severity_date: when_done(
+                'previous_severity_date', table.c.updated),
+            table.c.severity: when_done(
+                'severity', self._get_enum_expression(
+                    severity, table.c.severity)),
+            table.c.severity_change: when_done(
+                'severity_change', cast(
+                    severity_change, table.c.severity_change.type)),
+        })
+        for name, names in CHECKS_SEVERITY_GROUPS.items():
+            if names == [name]:
+                continue
+            values[table.c[name]] = when_done(
+                name, self._get_enum_expression(
+                    greatest(names, Severity), table.c[name]))
+
+        statement = table.update().where(
+            table.c.id == bindparam('screening_id'),
+        ).values(values).returning(table.c.status)
+
+        self._update_check_statements[keys] = statement
+        return statement
+
+    def _get_enum_array(self, enum: Type[ComparableEnum]) -> ColumnClause:
+        # enum member names ordered by their values
+        names = ','.join(member.name for member in sorted(enum))
+        return literal_column(
+            "('{{{0}}}'::text[])".format(names), type_=ARRAY(String))
+
+    def _get_rank(self, member: ComparableEnum) -> int:
+        return sorted(type(member)).index(member) + 1
+
+    def _get_rank_expression(self, expression, enum: Type[ComparableEnum]):
+        return func.array_position(
+            self._get_enum_array(enum), cast(expression, String))
+
+    def _get_enum_expression(self, rank, column: Column):
+        enum_array = self._get_enum_array(column.type.enum_class)
+        return cast(enum_array[rank], column.type)
+
+    def update_many(self, ids: List[int], **kwargs) -> List[int]:
+        """
+        Set-based update of screenings, with a single UPDATE statement.
+
+        Calculated status and severities are not recalculated, kwargs are
+        either the update values or `statuses` to update only the screenings
+        with one of the given statuses. Joins the session transaction if
+        one is already begun.
+
+        Returns:
+            IDs of the updated screenings
+        """
+        session = kwargs.pop('session', None)
+        if session is None:
+            session = self.get_session()
+
+        statuses = kwargs.pop('statuses', None)
+
+        table = self.model.__table__
+        statement = table.update().where(
+            table.c.id.in_(ids),
+        ).values(**kwargs).returning(table.c.id)
+        if statuses is not None:
+            statement = statement.where(table.c.status.in_(statuses))
+
+        session.begin(subtransactions=True)
+        try:
+            updated_ids = [
+                updated_id for updated_id, in session.execute(statement)]
+        except Exception as e:
+            log.error('Unable to update screenings: %s', e)
+            session.rollback()
+            raise
+        else:
+            session.commit()
+
+        return updated_ids
+
+    def find_ids(
+            self, batch_size: int = 1000, **kwargs) -> Iterator[List[int]]:
+        """
+        Screening IDs (ordered by ID) in batches of `batch_size`.
+
+        IDs only are streamed from a server side cursor, no screening is
+        loaded.
+        """
+        query = self._filter_query(**kwargs).with_entities(
+            self.model.id).order_by(self.model.id).yield_per(batch_size)
+
+        batch = []
+        for screening_id, in query:
+            batch.append(screening_id)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
     def screen_many(self, **kwargs) -> None:
         query = self._filter_query(**kwargs)
 
@@ -136,7 +362,9 @@ class ScreeningsRepository(AlchemyRepository):
             ship_inspections_severities: List[Severity] = None,
             ship_movements_severities: List[Severity] = None,
             severity_change: SeverityChange = None,
+            statuses: List[Status] = None,
             created__lte: datetime = None,
+            updated__lte: datetime = None,
             ship__country_ids: List[str] = None,
             ship__types: List[str] = None,
             search: str = None,
@@ -186,11 +414,21 @@ class ScreeningsRepository(AlchemyRepository):
                 self.model.severity_change == severity_change,
             )
 
+        if statuses is not None:
+            query = query.filter(
+                self.model.status.in_(statuses),
+            )
+
         if created__lte is not None:
             query = query.filter(
                 self.model.created <= created__lte,
             )
 
+        if updated__lte is not None:
+            query = query.filter(
+                self.model.updated <= updated__lte,
+            )
+
         if ship__country_ids is not None:
             query = query.filter(
                 self.model.ship_id == ship_model.id,
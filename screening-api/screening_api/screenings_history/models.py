@@ -1,7 +1,7 @@
 """Screening API screenings history models module"""
 from sqlalchemy.orm import backref, relationship
 from sqlalchemy.schema import Column, ForeignKey
-from sqlalchemy.types import Integer, DateTime
+from sqlalchemy.types import Integer, DateTime, JSON, String
 
 from screening_api.models import BaseModel
 from screening_api.screenings.models import ScreeningResult
@@ -19,6 +19,9 @@ class ScreeningHistory(ScreeningResult, BaseScreeningReport, BaseModel):
         nullable=False, index=True,
     )
 
+    # report section name: ScreeningHistoryReport hash
+    reports_hashes = Column(JSON())
+
     screening = relationship(
         "Screening",
         backref=backref("history", cascade="all, delete-orphan"),
@@ -39,3 +42,12 @@ class ScreeningHistory(ScreeningResult, BaseScreeningReport, BaseModel):
             'ship_sanctions_severity', 'country_sanctions_severity',
             'ship_inspections_severity', 'ship_movements_severity',
         ]
+
+
+class ScreeningHistoryReport(BaseModel):
+    """Screening history report section, stored once per content."""
+
+    __tablename__ = 'screenings_history_reports'
+
+    hash = Column(String(64), nullable=False, unique=True)
+    data = Column(JSON(), nullable=False)
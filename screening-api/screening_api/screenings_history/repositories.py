@@ -1,25 +1,144 @@
 """Screening API screenings history repositories module"""
+import hashlib
+import json
 from datetime import datetime
-from typing import List
+from typing import Dict, Iterable, List
+
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.session import Session
+from sqlalchemy.orm.scoping import scoped_session
 
 from screening_api.lib.alchemy.queries import ExtendedQuery
 from screening_api.lib.alchemy.repositories import AlchemyRepository
-from screening_api.screenings_history.models import ScreeningHistory
+from screening_api.screenings_history.models import (
+    ScreeningHistory, ScreeningHistoryReport,
+)
+
+
+class ScreeningsHistoryReportsRepository(AlchemyRepository):
+
+    model = ScreeningHistoryReport
+
+    @staticmethod
+    def get_hash(data) -> str:
+        content = json.dumps(data, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def store(self, reports: dict, session: Session = None) -> Dict[str, str]:
+        """
+        Store report sections by content hash, unchanged sections reference
+        the already stored data.
+
+        Returns report section name to hash mapping.
+        """
+        hashes = {}
+        data_list = {}
+        for name, data in reports.items():
+            if data is None:
+                continue
+
+            report_hash = self.get_hash(data)
+            hashes[name] = report_hash
+            data_list[report_hash] = {'hash': report_hash, 'data': data}
+
+        self.upsert_many(
+            list(data_list.values()), ['hash'], session=session)
+
+        return hashes
+
+    def get_data(
+            self, hashes: Iterable[str], session: Session = None,
+    ) -> Dict[str, dict]:
+        hashes = list(set(hashes))
+        if not hashes:
+            return {}
+
+        reports = self._filter_query(hash__in=hashes, session=session)
+        return {report.hash: report.data for report in reports}
 
 
 class ScreeningsHistoryRepository(AlchemyRepository):
 
     model = ScreeningHistory
 
+    def __init__(self, session_factory: scoped_session):
+        super(ScreeningsHistoryRepository, self).__init__(session_factory)
+        self.reports_repository = ScreeningsHistoryReportsRepository(
+            session_factory)
+
+    def get(self, **kwargs) -> ScreeningHistory:
+        history = super(ScreeningsHistoryRepository, self).get(**kwargs)
+        self._load_reports([history], session=kwargs.get('session'))
+        return history
+
+    def get_or_none(self, **kwargs) -> ScreeningHistory:
+        history = super(ScreeningsHistoryRepository, self).get_or_none(
+            **kwargs)
+        if history is not None:
+            self._load_reports([history], session=kwargs.get('session'))
+        return history
+
+    def find(self, limit: int = None, **kwargs) -> List[ScreeningHistory]:
+        histories = super(ScreeningsHistoryRepository, self).find(
+            limit=limit, **kwargs)
+        self._load_reports(histories, session=kwargs.get('session'))
+        return histories
+
     def create(
-        self, screening_id: int, severity_date: datetime, **kwargs,
+        self, screening_id: int, severity_date: datetime,
+        reports: dict = None, **kwargs,
     ) -> ScreeningHistory:
+        """
+        Create screening history, report sections are stored by content
+        hash (see ScreeningsHistoryReportsRepository.store).
+        """
+        session = kwargs.pop('session', None)
+        if session is None:
+            session = self.get_session()
+
+        if reports:
+            kwargs['reports_hashes'] = self.reports_repository.store(
+                reports, session=session)
+
         kwargs.update({
             'screening_id': screening_id,
             'severity_date': severity_date,
         })
 
-        return super(ScreeningsHistoryRepository, self).create(**kwargs)
+        history = super(ScreeningsHistoryRepository, self).create(
+            session=session, **kwargs)
+        if reports:
+            self._set_reports(history, reports)
+        return history
+
+    def _load_reports(
+            self, histories: List[ScreeningHistory],
+            session: Session = None,
+    ) -> None:
+        reports_data = self.reports_repository.get_data(
+            (
+                report_hash
+                for history in histories if history.reports_hashes
+                for report_hash in history.reports_hashes.values()
+            ),
+            session=session,
+        )
+        if not reports_data:
+            return
+
+        for history in histories:
+            if not history.reports_hashes:
+                continue
+
+            self._set_reports(history, {
+                name: reports_data.get(report_hash)
+                for name, report_hash in history.reports_hashes.items()
+            })
+
+    def _set_reports(self, history: ScreeningHistory, reports: dict):
+        # loaded as the columns values (not changed, never written back)
+        for name, data in reports.items():
+            set_committed_value(history, name, data)
 
     def _find_query(
             self,
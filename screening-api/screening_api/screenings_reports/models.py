@@ -1,9 +1,10 @@
 """Screening API screenings reports models module"""
 from sqlalchemy.orm import backref, relationship
-from sqlalchemy.schema import Column, ForeignKey
-from sqlalchemy.types import Integer, JSON
+from sqlalchemy.schema import Column, ForeignKey, UniqueConstraint
+from sqlalchemy.types import Enum, Integer, JSON, String
 
 from screening_api.models import BaseModel
+from screening_api.screenings.enums import Severity
 
 
 class BaseScreeningReport:
@@ -48,3 +49,30 @@ class ScreeningReport(BaseScreeningReport, BaseModel):
         "Screening",
         backref=backref("report", cascade="all, delete-orphan", uselist=False),
     )
+
+
+class ScreeningReportFingerprint(BaseModel):
+
+    __tablename__ = 'screenings_reports_fingerprints'
+
+    screening_id = Column(
+        Integer,
+        ForeignKey('screenings.id', onupdate="CASCADE", ondelete="CASCADE"),
+        nullable=False,
+    )
+    check_name = Column(String(64), nullable=False)
+    # sha256 of the check inputs the stored check report was made of
+    fingerprint = Column(String(64), nullable=False)
+    severity = Column(Enum(Severity), nullable=False)
+
+    screening = relationship(
+        "Screening",
+        backref=backref("reports_fingerprints", cascade="all, delete-orphan"),
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            'screening_id', 'check_name',
+            name='screening_id_check_name',
+        ),
+    )
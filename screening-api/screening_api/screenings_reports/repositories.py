@@ -1,11 +1,15 @@
 """Screening API screenings reports repositories module"""
 from datetime import datetime
 
+from sqlalchemy.orm.session import Session
 from sqlalchemy.orm.scoping import scoped_session
 
 from screening_api.lib.alchemy.queries import ExtendedQuery
 from screening_api.lib.alchemy.repositories import AlchemyRepository
-from screening_api.screenings_reports.models import ScreeningReport
+from screening_api.screenings.enums import Severity
+from screening_api.screenings_reports.models import (
+    ScreeningReport, ScreeningReportFingerprint,
+)
 from screening_api.screenings_reports.validators import (
     ReportSchemaValidator,
 )
@@ -171,3 +175,23 @@ class ScreeningsReportsRepository(AlchemyRepository):
             )
 
         return query
+
+
+class ScreeningsReportsFingerprintsRepository(AlchemyRepository):
+
+    model = ScreeningReportFingerprint
+
+    def set_fingerprint(
+            self, screening_id: int, check_name: str, fingerprint: str,
+            severity: Severity, session: Session = None,
+    ) -> None:
+        data = {
+            'screening_id': screening_id,
+            'check_name': check_name,
+            'fingerprint': fingerprint,
+            'severity': severity,
+        }
+        self.upsert_many(
+            [data, ], ['screening_id', 'check_name'],
+            update_fields=['fingerprint', 'severity'], session=session,
+        )
@@ -0,0 +1,67 @@
+import pytest
+
+from screening_api.screenings_history.models import ScreeningHistoryReport
+from screening_api.screenings_history.repositories import (
+    ScreeningsHistoryRepository,
+)
+
+
+class TestScreeningsHistoryRepositoryCreate:
+
+    @pytest.fixture
+    def repository(self, session_factory):
+        return ScreeningsHistoryRepository(session_factory)
+
+    @pytest.fixture
+    def screening(self, factory):
+        ship = factory.create_ship(imo_id=1234567)
+        return factory.create_screening(ship=ship)
+
+    def test_reports_stored_by_content(self, repository, screening):
+        ship_info = {'imo': '1234567', 'name': 'Ship'}
+        port_visits = {'port_visits': [], 'ihs_movement_data': []}
+
+        first = repository.create(
+            screening.id, screening.updated,
+            reports={'ship_info': ship_info, 'port_visits': port_visits},
+        )
+        second = repository.create(
+            screening.id, screening.updated,
+            reports={
+                'ship_info': dict(ship_info, name='New name'),
+                'port_visits': port_visits,
+                'zone_visits': None,
+            },
+        )
+
+        session = repository.get_session()
+        assert session.query(ScreeningHistoryReport).count() == 3
+        assert first.reports_hashes['port_visits'] == \
+            second.reports_hashes['port_visits']
+        assert first.reports_hashes['ship_info'] != \
+            second.reports_hashes['ship_info']
+        assert 'zone_visits' not in second.reports_hashes
+        assert second.ship_info == {'imo': '1234567', 'name': 'New name'}
+
+    def test_reports_loaded(self, repository, screening):
+        history = repository.create(
+            screening.id, screening.updated,
+            reports={'ship_info': {'imo': '1234567'}},
+        )
+        repository.get_session().expire_all()
+
+        result = repository.get_or_none(id=history.id)
+
+        assert result.ship_info == {'imo': '1234567'}
+        assert result.port_visits is None
+        assert repository.find(screening_id=screening.id)[0].ship_info == \
+            {'imo': '1234567'}
+
+    def test_legacy_reports(self, repository, factory, screening):
+        history = factory.create_screenings_history(
+            screening=screening, ship_info={'imo': '7654321'})
+
+        result = repository.get(id=history.id)
+
+        assert result.reports_hashes is None
+        assert result.ship_info == {'imo': '7654321'}
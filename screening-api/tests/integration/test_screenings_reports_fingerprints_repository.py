@@ -0,0 +1,33 @@
+import pytest
+
+from screening_api.screenings.enums import Severity
+from screening_api.screenings_reports.repositories import (
+    ScreeningsReportsFingerprintsRepository,
+)
+
+
+class TestScreeningsReportsFingerprintsRepositorySetFingerprint:
+
+    @pytest.fixture
+    def repository(self, session_factory):
+        return ScreeningsReportsFingerprintsRepository(session_factory)
+
+    @pytest.fixture
+    def screening(self, factory):
+        ship = factory.create_ship(imo_id=1234567)
+        return factory.create_screening(ship=ship)
+
+    def test_set_and_replaced(self, repository, screening):
+        repository.set_fingerprint(
+            screening.id, 'ship_flag', 'a' * 64, Severity.OK)
+        repository.set_fingerprint(
+            screening.id, 'ship_sanction', 'b' * 64, Severity.CRITICAL)
+        repository.set_fingerprint(
+            screening.id, 'ship_flag', 'c' * 64, Severity.WARNING)
+
+        result = repository.get(
+            screening_id=screening.id, check_name='ship_flag')
+
+        assert result.fingerprint == 'c' * 64
+        assert result.severity == Severity.WARNING
+        assert len(repository.find(screening_id=screening.id)) == 2
@@ -89,3 +89,164 @@ class TestScreeningsRepositoryUpdate:
         assert result.previous_severity_date == screening.updated
         assert result.severity == new_severity
         assert result.severity_change == new_severity_change
+
+
+class TestScreeningsRepositoryUpdateCheck:
+
+    checks = [
+        'ship_registered_owner_company', 'ship_operator_company',
+        'ship_beneficial_owner_company', 'ship_manager_company',
+        'ship_technical_manager_company', 'ship_company_associates',
+        'ship_association', 'ship_sanction', 'ship_flag',
+        'ship_registered_owner', 'ship_operator', 'ship_beneficial_owner',
+        'ship_manager', 'ship_technical_manager', 'doc_company',
+        'ship_inspections', 'port_visits', 'zone_visits',
+    ]
+
+    @pytest.fixture
+    def repository(self, session_factory):
+        return ScreeningsRepository(session_factory)
+
+    def create_screening(self, factory, status, **kwargs):
+        data = {}
+        for check in self.checks:
+            data['{0}_status'.format(check)] = Status.DONE
+            data['{0}_severity'.format(check)] = Severity.OK
+        data.update(kwargs)
+        ship = factory.create_ship()
+        return factory.create_screening(
+            ship=ship, status=status, severity=Severity.CRITICAL,
+            severity_change=SeverityChange.INCREASED,
+            previous_severity=Severity.WARNING, **data
+        )
+
+    def test_status_pending(self, repository, factory, session_factory):
+        screening = self.create_screening(factory, Status.DONE)
+
+        result = repository.update_check(
+            screening.id, ship_flag_status=Status.PENDING)
+
+        assert result == Status.PENDING
+        updated = session_factory().query(Screening).get(screening.id)
+        assert updated.ship_flag_status == Status.PENDING
+        assert updated.status == Status.PENDING
+        assert updated.severity == Severity.CRITICAL
+        assert updated.previous_severity == Severity.WARNING
+        assert updated.severity_change == SeverityChange.INCREASED
+
+    def test_severity_not_recalculated(
+            self, repository, factory, session_factory):
+        screening = self.create_screening(
+            factory, Status.PENDING,
+            ship_flag_status=Status.PENDING, port_visits_status=Status.PENDING,
+        )
+
+        result = repository.update_check(
+            screening.id, ship_flag_status=Status.DONE,
+            ship_flag_severity=Severity.WARNING,
+        )
+
+        assert result == Status.PENDING
+        updated = session_factory().query(Screening).get(screening.id)
+        assert updated.ship_flag_severity == Severity.WARNING
+        assert updated.severity == Severity.CRITICAL
+
+    def test_severity_recalculated(
+            self, repository, factory, session_factory):
+        screening = self.create_screening(
+            factory, Status.PENDING,
+            ship_flag_status=Status.PENDING,
+            port_visits_severity=Severity.UNKNOWN,
+            zone_visits_severity=Severity.WARNING,
+        )
+
+        result = repository.update_check(
+            screening.id, ship_flag_status=Status.DONE,
+            ship_flag_severity=Severity.WARNING,
+        )
+
+        assert result == Status.DONE
+        updated = session_factory().query(Screening).get(screening.id)
+        assert updated.status == Status.DONE
+        assert updated.previous_severity == Severity.CRITICAL
+        assert updated.previous_severity_date == screening.updated
+        assert updated.company_sanctions_severity == Severity.OK
+        assert updated.ship_sanctions_severity == Severity.OK
+        assert updated.country_sanctions_severity == Severity.WARNING
+        assert updated.ship_inspections_severity == Severity.OK
+        assert updated.ship_movements_severity == Severity.UNKNOWN
+        assert updated.severity == Severity.UNKNOWN
+        assert updated.severity_change == SeverityChange.NOCHANGE
+
+    def test_severity_decreased(self, repository, factory, session_factory):
+        screening = self.create_screening(
+            factory, Status.PENDING, ship_flag_status=Status.PENDING)
+
+        repository.update_check(
+            screening.id, ship_flag_status=Status.DONE,
+            ship_flag_severity=Severity.WARNING,
+        )
+
+        updated = session_factory().query(Screening).get(screening.id)
+        assert updated.severity == Severity.WARNING
+        assert updated.severity_change == SeverityChange.DECREASED
+
+
+class TestScreeningsRepositoryFindIds:
+
+    @pytest.fixture
+    def repository(self, session_factory):
+        return ScreeningsRepository(session_factory)
+
+    def test_batches(self, repository, factory):
+        ship = factory.create_ship()
+        screenings = [
+            factory.create_screening(ship=ship, status=Status.DONE)
+            for _ in range(5)
+        ]
+        factory.create_screening(ship=ship, status=Status.PENDING)
+
+        result = list(repository.find_ids(
+            batch_size=2, statuses=[Status.CREATED, Status.DONE]))
+
+        ids = sorted(screening.id for screening in screenings)
+        assert result == [ids[:2], ids[2:4], ids[4:]]
+
+
+class TestScreeningsRepositoryUpdateMany:
+
+    @pytest.fixture
+    def repository(self, session_factory):
+        return ScreeningsRepository(session_factory)
+
+    def test_statuses(self, repository, factory, session_factory):
+        ship = factory.create_ship()
+        done = factory.create_screening(ship=ship, status=Status.DONE)
+        pending = factory.create_screening(ship=ship, status=Status.PENDING)
+
+        result = repository.update_many(
+            [done.id, pending.id], statuses=[Status.CREATED, Status.DONE],
+            status=Status.SCHEDULED, ship_flag_status=Status.SCHEDULED,
+        )
+
+        assert result == [done.id]
+        session = session_factory()
+        updated_done = session.query(Screening).get(done.id)
+        assert updated_done.status == Status.SCHEDULED
+        assert updated_done.ship_flag_status == Status.SCHEDULED
+        assert session.query(Screening).get(pending.id).status ==\
+            Status.PENDING
+
+    def test_session_transaction(self, repository, factory, session_factory):
+        ship = factory.create_ship()
+        screening = factory.create_screening(ship=ship, status=Status.DONE)
+        session = session_factory()
+
+        session.begin()
+        repository.update_many(
+            [screening.id], status=Status.SCHEDULED, session=session)
+        assert session.transaction is not None
+        session.commit()
+
+        assert session.query(Screening).get(screening.id).status ==\
+            Status.SCHEDULED
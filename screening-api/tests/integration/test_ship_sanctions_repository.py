@@ -43,3 +43,76 @@ class TestShipSanctionsRepositoryFind:
 
         assert len(result) == 1
         assert result[0].id == sanction.id
+
+    def test_in_filter(self, repository, factory):
+        ship = factory.create_ship(imo_id=1234567)
+        sanction = factory.create_ship_sanction(
+            ship_id=ship.id, code=1, sanction_list_name='OFAC')
+        factory.create_ship_sanction(
+            ship_id=ship.id, code=2, sanction_list_name='EU')
+
+        result = repository.find(sanction_list_name__in=['OFAC', 'UN'])
+
+        assert len(result) == 1
+        assert result[0].id == sanction.id
+
+
+class TestShipSanctionsRepositoryUpsertMany:
+
+    @pytest.fixture
+    def repository(self, session_factory):
+        return ShipSanctionsRepository(session_factory)
+
+    def test_insert_and_update(self, repository, factory):
+        ship = factory.create_ship(imo_id=1234567)
+        sanction = factory.create_ship_sanction(
+            ship_id=ship.id, code=1, sanction_list_name='OFAC',
+            is_active=True,
+        )
+
+        repository.upsert_many(
+            [
+                {
+                    'ship_id': ship.id,
+                    'code': 1,
+                    'sanction_list_name': 'OFAC',
+                    'is_active': False,
+                },
+                {
+                    'ship_id': ship.id,
+                    'code': 2,
+                    'sanction_list_name': 'EU',
+                    'is_active': True,
+                },
+            ],
+            index_elements=['ship_id', 'sanction_list_name'],
+            update_fields=['code', 'is_active'],
+        )
+
+        result = repository.find(ship_id=ship.id, sort=['id'])
+        assert len(result) == 2
+        assert result[0].id == sanction.id
+        assert result[0].is_active is False
+        assert result[1].sanction_list_name == 'EU'
+        assert result[1].is_active is True
+
+    def test_do_nothing(self, repository, factory):
+        ship = factory.create_ship(imo_id=1234567)
+        factory.create_ship_sanction(
+            ship_id=ship.id, code=1, sanction_list_name='OFAC',
+            is_active=True,
+        )
+
+        repository.upsert_many(
+            [{
+                'ship_id': ship.id,
+                'code': 1,
+                'sanction_list_name': 'OFAC',
+                'is_active': False,
+            }],
+            index_elements=['ship_id', 'sanction_list_name'],
+        )
+
+        result = repository.find(ship_id=ship.id)
+        assert len(result) == 1
+        assert result[0].is_active is True
@@ -0,0 +1 @@
+"""Screening Workers benchmarks package"""
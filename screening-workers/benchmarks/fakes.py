@@ -0,0 +1,510 @@
+"""Screening Workers benchmark service fakes module
+
+In process stand-ins of the external services used by the checks. Data is
+generated from the IMO number, so every run screens the same ships.
+"""
+from collections import Counter
+from concurrent import futures
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import json
+import re
+from socketserver import ThreadingMixIn
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+import grpc
+
+from screening_workers.lib.ports_api.grpc_health_v1 import (
+    health_pb2, health_pb2_grpc,
+)
+from screening_workers.lib.ports_api.grpc_portservice_v1 import (
+    portservice_pb2, portservice_pb2_grpc,
+)
+
+FLAGS = (
+    ('PAN', 'PA', 'Panama'),
+    ('LBR', 'LR', 'Liberia'),
+    ('MHL', 'MH', 'Marshall Islands'),
+    ('IRN', 'IR', 'Iran'),
+)
+COMPANY_TYPES = (
+    ('registered_owner', 'registered_owner_code'),
+    ('operator', 'operator_company_code'),
+    ('group_beneficial_owner', 'group_beneficial_owner_company_code'),
+    ('ship_manager', 'ship_manager_company_code'),
+    ('technical_manager', 'technical_manager_code'),
+)
+PORTS = (
+    ('Rotterdam', 'NLRTM', 'Netherlands', 51.95, 4.14),
+    ('Singapore', 'SGSIN', 'Singapore', 1.26, 103.84),
+    ('Bandar Abbas', 'IRBND', 'Iran', 27.14, 56.21),
+)
+SANCTIONED_EVERY = 10  # every n-th ship and company is sanctioned
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+
+    daemon_threads = True
+
+
+class FakeRequestHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {
+            name: values[-1] for name, values in parse_qs(url.query).items()}
+        status, data = self.server.service.handle(url.path, query)
+
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # request logs would be most of the benchmark output
+        pass
+
+
+class FakeHTTPService:
+    """
+    HTTP service fake served from a daemon thread on a random local port.
+
+    Subclasses list (path pattern, handler name) routes, handlers get the
+    path match and the query parameters.
+    """
+
+    routes = ()
+
+    def __init__(self, latency: float = 0):
+        self.latency = latency
+        self.requests = Counter()
+        self._lock = threading.Lock()
+        self._routes = [
+            (re.compile(pattern), name) for pattern, name in self.routes]
+        self._server = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return 'http://{0}:{1}/'.format(host, port)
+
+    def start(self):
+        self._server = ThreadingHTTPServer(
+            ('127.0.0.1', 0), FakeRequestHandler)
+        self._server.service = self
+        thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True)
+        thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def handle(self, path: str, query: dict):
+        if self.latency:
+            time.sleep(self.latency)
+
+        for pattern, name in self._routes:
+            match = pattern.search(path)
+            if match is None:
+                continue
+
+            with self._lock:
+                self.requests[name] += 1
+            return 200, getattr(self, name)(match, query)
+
+        with self._lock:
+            self.requests['not_found'] += 1
+        return 404, {'message': 'Not found: {0}'.format(path)}
+
+
+def get_mmsi(imo_id: int) -> str:
+    return str(200000000 + int(imo_id))
+
+
+def is_sanctioned(number: int) -> bool:
+    return int(number) % SANCTIONED_EVERY == 0
+
+
+class FakeSISService(FakeHTTPService):
+
+    routes = (
+        (r'/ships/(?P<ship_id>\d+)/inspections/$', 'get_inspections'),
+        (r'/ships/$', 'get_ships'),
+        (r'/inspections/$', 'get_inspections'),
+        (r'/ship_movement/$', 'get_ship_movements'),
+    )
+
+    def __init__(self, latency: float = 0, companies: int = 50):
+        super(FakeSISService, self).__init__(latency)
+        self.companies = companies
+
+    def get_ship(self, imo_id: int) -> dict:
+        flag_code, flag_iso, flag_name = FLAGS[imo_id % len(FLAGS)]
+        ship = {
+            'imo_id': str(imo_id),
+            'mmsi': get_mmsi(imo_id),
+            'ship_name': 'BENCHMARK {0}'.format(imo_id),
+            'ship_status': 'In Service/Commission',
+            'shiptype_level_5': 'Bulk Carrier',
+            'call_sign': 'B{0}'.format(imo_id % 10000),
+            'flag': {
+                'alt_name': None,
+                'code': flag_code,
+                'iso_3166_1_alpha_2': flag_iso,
+                'name': flag_name,
+            },
+            'flag_effective_date': '200001',
+            'flag_name': flag_name,
+            'port_of_registry': flag_name,
+            'classification_society': 'Lloyds Register',
+            'deadweight': '16149',
+            'breadth': '32.200',
+            'displacement': '0',
+            'draught': '9.417',
+            'country_of_build': 'Japan',
+            'year_of_build': '2005',
+            'shipbuilder': 'Imabari Shbldg',
+            'pandi_club': 'Unknown',
+            'gross_tonnage': '43684',
+            'length_overall_loa': '183.532',
+            'doc_company': 'Unknown',
+            'document_of_compliance_doc_company_code': '9991001',
+            'safety_management_certificate_doc_company': 'Unknown',
+            'safety_management_certificate_date_issued': '20090408',
+        }
+        for index, (name_field, code_field) in enumerate(COMPANY_TYPES):
+            number = (imo_id + index) % self.companies
+            ship[name_field] = 'Benchmark Company {0}'.format(number)
+            ship[code_field] = str(9000000 + number)
+            for suffix in (
+                    'country_of_control', 'country_of_registration',
+                    'country_of_domicile', 'country_of_domicile_name'):
+                ship['{0}_{1}'.format(name_field, suffix)] = flag_name
+            ship['{0}_country_of_domicile_code'.format(name_field)] = \
+                flag_code
+
+        return ship
+
+    def get_ships(self, match, query) -> dict:
+        objects = []
+        if query.get('imo_id'):
+            objects.append(self.get_ship(int(query['imo_id'])))
+
+        return {'objects': objects}
+
+    def get_inspections(self, match, query) -> dict:
+        today = datetime.utcnow().date()
+        objects = [
+            {
+                'inspection_id': '{0}-{1}'.format(
+                    query.get('imo_id') or match.groupdict().get('ship_id'),
+                    number),
+                'inspection_date': str(today - timedelta(days=90 * number)),
+                'authorisation': 'Paris MOU',
+                'detained': number == 0,
+                'number_part_days_detained': '1.0' if number == 0 else '0',
+                'no_defects': str(number * 2),
+                'port_name': PORTS[number][0],
+                'country_name': PORTS[number][2],
+            }
+            for number in range(len(PORTS))
+        ]
+        return {'objects': objects}
+
+    def get_ship_movements(self, match, query) -> dict:
+        return {'objects': []}
+
+
+class FakeComplianceService(FakeHTTPService):
+
+    routes = (
+        (r'/ships/$', 'get_ships'),
+        (r'/organisation_names/$', 'get_organisation_names'),
+    )
+
+    @staticmethod
+    def get_sanctions(entity_id: int) -> list:
+        if not is_sanctioned(entity_id):
+            return []
+
+        return [
+            {
+                'id': entity_id,
+                'status': 'active',
+                'since_date': '2018-01-01T00:00:00Z',
+                'to_date': None,
+                'sanction': {
+                    'code': 1,
+                    'name': 'OFAC - Specially Designated Nationals',
+                    'status': 'active',
+                },
+            },
+        ]
+
+    def get_ships(self, match, query) -> dict:
+        imo_id = int(query['imo_number'])
+        ship = {
+            'id': imo_id,
+            'name': 'BENCHMARK {0}'.format(imo_id),
+            'status': 'active',
+            'imo_number': str(imo_id),
+            'ship_sanctions': self.get_sanctions(imo_id),
+        }
+        return {'results': [ship]}
+
+    def get_organisation_names(self, match, query) -> dict:
+        code = query.get('sis_company_code')
+        if not code:
+            return {'results': []}
+
+        organisation_id = int(code)
+        organisation = {
+            'id': organisation_id,
+            'name': query.get('sis_company_name', code),
+            'status': 'active',
+            'organisation_sanctions': self.get_sanctions(organisation_id),
+            'organisation_associations': [],
+        }
+        name = {
+            'id': organisation_id,
+            'name': organisation['name'],
+            'name_type': 'primary',
+            'organisation': organisation,
+        }
+        return {'results': [name]}
+
+
+class FakeSMHService(FakeHTTPService):
+
+    routes = (
+        (r'/shipmovementhistory/(?P<imo_id>\d+)$', 'get_smh'),
+        (r'/portdata/$', 'get_port_data'),
+    )
+
+    def get_smh(self, match, query) -> dict:
+        now = datetime.utcnow()
+        visits = []
+        for number, (name, code, country, lat, lon) in enumerate(PORTS):
+            entered = now - timedelta(days=30 * (number + 1))
+            visits.append({
+                'entered': entered.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'departed': (entered + timedelta(days=2)).strftime(
+                    '%Y-%m-%dT%H:%M:%SZ'),
+                'port': {
+                    'port_name': name,
+                    'port_code': code,
+                    'port_country_name': country,
+                    'port_latitude': lat,
+                    'port_longitude': lon,
+                },
+            })
+
+        return {
+            'visits': visits,
+            'positions': [],
+            'ihs_movement_data': [],
+            'metadata': {'error': None, 'elapsed_seconds': 0},
+        }
+
+    def get_port_data(self, match, query) -> dict:
+        name, code, country, lat, lon = PORTS[0]
+        return {
+            'port_name': name,
+            'port_code': code,
+            'port_country_name': country,
+        }
+
+
+class FakeAISService(FakeHTTPService):
+
+    routes = (
+        (r'/api/v2/track/(?P<mmsi>\d+)$', 'get_track'),
+    )
+
+    def __init__(self, latency: float = 0, positions: int = 500):
+        super(FakeAISService, self).__init__(latency)
+        self.positions = positions
+
+    def get_track(self, match, query) -> dict:
+        # one page track, a position every hour going back through ports
+        now = datetime.utcnow().replace(microsecond=0)
+        data = []
+        for number in range(self.positions):
+            name, code, country, lat, lon = PORTS[number % len(PORTS)]
+            timestamp = now - timedelta(hours=number)
+            data.append({
+                'mmsi': int(match.group('mmsi')),
+                'latitude': lat,
+                'longitude': lon,
+                'speed': 0.1,
+                'course': 0,
+                'heading': 0,
+                'timestamp': timestamp.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            })
+
+        return {'count': len(data), 'data': data}
+
+
+class FakeGeoServerService(FakeHTTPService):
+
+    routes = (
+        (r'/(ows|wfs)$', 'get_zones'),
+    )
+
+    def get_zones(self, match, query) -> dict:
+        # a square zone around every port
+        features = []
+        for name, code, country, lat, lon in PORTS:
+            ring = [
+                [lon - 1, lat - 1], [lon + 1, lat - 1], [lon + 1, lat + 1],
+                [lon - 1, lat + 1], [lon - 1, lat - 1],
+            ]
+            features.append({
+                'type': 'Feature',
+                'id': 'zone.{0}'.format(code),
+                'properties': {'zone_name': '{0} zone'.format(name)},
+                'geometry': {'type': 'Polygon', 'coordinates': [ring]},
+            })
+
+        return {'type': 'FeatureCollection', 'features': features}
+
+
+class FakePortServicer(
+        portservice_pb2_grpc.FindPortServicer,
+        health_pb2_grpc.HealthServicer,
+):
+
+    def __init__(self, service: 'FakePortService'):
+        self.service = service
+
+    def _count(self, name: str):
+        if self.service.latency:
+            time.sleep(self.service.latency)
+        with self.service._lock:
+            self.service.requests[name] += 1
+
+    @staticmethod
+    def _get_port(lat: float = None, lon: float = None):
+        # nearest of the known ports by plain coordinates distance
+        port = PORTS[0]
+        if lat is not None and lon is not None:
+            port = min(
+                PORTS, key=lambda p: (p[3] - lat) ** 2 + (p[4] - lon) ** 2)
+        name, code, country, port_lat, port_lon = port
+        return portservice_pb2.Port(
+            code=code, name=name, country_name=country,
+            latitude=port_lat, longitude=port_lon,
+        )
+
+    def Check(self, request, context):
+        self._count('health_check')
+        return health_pb2.HealthCheckResponse(
+            status=health_pb2.HealthCheckResponse.SERVING)
+
+    def FindNearestPort(self, request, context):
+        self._count('find_nearest_port')
+        return self._get_port(request.latitude, request.longitude)
+
+    def GetPort(self, request, context):
+        self._count('get_port')
+        return self._get_port()
+
+    def FindClosestPorts(self, request_iterator, context):
+        self._count('find_closest_ports')
+        for position in request_iterator:
+            yield self._get_port(position.latitude, position.longitude)
+
+    def GetPortHistory(self, request_iterator, context):
+        self._count('get_port_history')
+        for position in request_iterator:
+            yield portservice_pb2.PortHistory(
+                port=self._get_port(position.latitude, position.longitude),
+                timestamp_enter=position.timestamp,
+                timestamp_exit=position.timestamp + 3600,
+            )
+
+
+class FakePortService:
+    """
+    PortService gRPC fake served on a random local port.
+    """
+
+    MAX_WORKERS = 10
+
+    def __init__(self, latency: float = 0):
+        self.latency = latency
+        self.requests = Counter()
+        self._lock = threading.Lock()
+        self._server = None
+        self._port = None
+
+    @property
+    def base_url(self) -> str:
+        return '127.0.0.1:{0}'.format(self._port)
+
+    def start(self):
+        self._server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=self.MAX_WORKERS))
+        servicer = FakePortServicer(self)
+        portservice_pb2_grpc.add_FindPortServicer_to_server(
+            servicer, self._server)
+        health_pb2_grpc.add_HealthServicer_to_server(servicer, self._server)
+        self._port = self._server.add_insecure_port('127.0.0.1:0')
+        self._server.start()
+
+    def stop(self):
+        self._server.stop(grace=None)
+
+
+class FakeServices:
+    """
+    All the service fakes, started and stopped together.
+    """
+
+    def __init__(self, latency: float = 0, positions: int = 500):
+        self.sis = FakeSISService(latency)
+        self.compliance = FakeComplianceService(latency)
+        self.smh = FakeSMHService(latency)
+        self.ais = FakeAISService(latency, positions=positions)
+        self.geoserver = FakeGeoServerService(latency)
+        self.portservice = FakePortService(latency)
+
+    @property
+    def services(self) -> dict:
+        return {
+            'sis': self.sis,
+            'compliance': self.compliance,
+            'smh': self.smh,
+            'ais': self.ais,
+            'geoserver': self.geoserver,
+            'portservice': self.portservice,
+        }
+
+    def start(self):
+        for service in self.services.values():
+            service.start()
+
+    def stop(self):
+        for service in self.services.values():
+            service.stop()
+
+    def get_config(self) -> dict:
+        return {
+            'SIS_BASE_URL': self.sis.base_url,
+            'COMPLIANCE_BASE_URL': self.compliance.base_url,
+            'SMH_REST_BASE_URL': self.smh.base_url.rstrip('/'),
+            'AIS_BASE_URL': self.ais.base_url + 'api/v2',
+            'GEOSERVER_BASE_URL': self.geoserver.base_url,
+            'PORTSERVICE_BASE_URL': self.portservice.base_url,
+        }
+
+    def get_requests(self) -> dict:
+        return {
+            name: sum(service.requests.values())
+            for name, service in self.services.items()
+        }
@@ -0,0 +1,86 @@
+"""Screening Workers benchmark recorders module"""
+from collections import Counter, defaultdict
+import time
+from typing import Dict, List
+
+from celery import signals
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+OTHER = '<other>'
+
+
+class TaskRecorder:
+    """
+    Records task times, DB queries and task messages of eager runs.
+
+    Eager tasks run nested in the task that applied them, so the time and
+    the queries of a task exclude its subtasks ones. Queries run by task
+    threads (i.e. updaters pools) count for the running task too.
+    """
+
+    def __init__(self):
+        self.times = defaultdict(list)
+        self.queries = Counter()
+        self.messages = Counter()
+        self._stack = []
+
+    def connect(self, engine: Engine):
+        signals.task_prerun.connect(self.on_task_prerun, weak=False)
+        signals.task_postrun.connect(self.on_task_postrun, weak=False)
+        event.listen(
+            engine, 'before_cursor_execute', self.on_before_cursor_execute)
+
+    def disconnect(self, engine: Engine):
+        signals.task_prerun.disconnect(self.on_task_prerun)
+        signals.task_postrun.disconnect(self.on_task_postrun)
+        event.remove(
+            engine, 'before_cursor_execute', self.on_before_cursor_execute)
+
+    def reset(self):
+        self.times.clear()
+        self.queries.clear()
+        self.messages.clear()
+        del self._stack[:]
+
+    def on_task_prerun(self, sender=None, **kwargs):
+        # every task run would be a broker message without eager mode
+        self.messages[sender.name] += 1
+        self._stack.append([sender.name, time.perf_counter(), 0.0])
+
+    def on_task_postrun(self, sender=None, **kwargs):
+        name, started, subtasks_time = self._stack.pop()
+        elapsed = time.perf_counter() - started
+        self.times[name].append(elapsed - subtasks_time)
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def on_before_cursor_execute(self, *args, **kwargs):
+        name = self._stack[-1][0] if self._stack else OTHER
+        self.queries[name] += 1
+
+    def get_stats(self) -> List[Dict]:
+        stats = []
+        for name in sorted(set(self.times) | set(self.queries)):
+            times = sorted(self.times.get(name, []))
+            runs = len(times)
+            stats.append({
+                'name': name,
+                'runs': runs,
+                'mean': sum(times) / runs if runs else 0.0,
+                'p50': _percentile(times, 50),
+                'p95': _percentile(times, 95),
+                'max': times[-1] if times else 0.0,
+                'queries': self.queries[name] / runs if runs else
+                self.queries[name],
+            })
+
+        return stats
+
+
+def _percentile(values: List[float], percent: int) -> float:
+    if not values:
+        return 0.0
+
+    index = int(round((len(values) - 1) * percent / 100.0))
+    return values[index]
@@ -0,0 +1,320 @@
+"""Screening Workers end to end screening benchmark
+
+Screens ships through the application wired by ``setup_app``, with eager
+Celery tasks, local PostgreSQL and Redis and in process fakes of the
+external services. Run from the screening-workers directory:
+
+    $ python -m benchmarks.run --database screening_benchmark \\
+        --redis-host localhost --redis-db 15 --screenings 100
+
+The database server (DBHOST, DBUSER, ...) settings are read from the
+environment like by the workers, but the database is the one given with
+``--database`` (never DBNAME). It must be a dedicated, empty database: the
+benchmark refuses to run if it has tables, creates the tables and drops the
+ones it created when finished.
+
+Locks and caches use the Redis database given with ``--redis-host`` and
+``--redis-db`` (never LOCKERHOST and LOCKERNAME). It must be empty and not
+the Redis database of the workers, it is flushed when finished.
+"""
+import argparse
+import json
+import logging
+import os
+import socket
+import time
+
+from celery import Celery
+from redis import StrictRedis
+from sqlalchemy import inspect
+from sqlalchemy.orm import sessionmaker
+
+from screening_api.models import BaseModel
+from screening_api.screenings.enums import Severity, Status
+from screening_api.testing.factories import Factory
+
+from screening_workers.main import (
+    CONFIG_ENVIRON_NAME, get_ais_client, get_cache_manager,
+    get_compliance_client, get_database, get_file_config, get_locker,
+    get_portservice_client, get_redis_url, get_sis_client, get_smh_client,
+    setup_app,
+)
+
+from benchmarks.fakes import FakeServices, get_mmsi
+from benchmarks.recorders import TaskRecorder
+
+FIRST_IMO_ID = 1000000
+SCREEN_TASK_NAME = 'screening.screenings.screen'
+BULK_SCREEN_TASK_NAME = 'screening.screenings.bulk_screen'
+# worker Redis databases (LOCKERNAME) of the locker and the cache manager
+WORKER_REDIS_NAMES = ('2', '3')
+# worker update date caches, must not survive the recreated tables
+UPDATE_CACHES = (
+    'ship_update_cache', 'company_sanctions_update_cache',
+    'ship_inspections_update_cache', 'ship_sanctions_update_cache',
+)
+
+
+def get_arguments(args=None):
+    parser = argparse.ArgumentParser(
+        description='End to end screening throughput benchmark.')
+    parser.add_argument(
+        '--database', required=True,
+        help=(
+            'name of a dedicated, empty database the benchmark tables are '
+            'created in and dropped from (DBNAME is ignored)'
+        ))
+    parser.add_argument(
+        '--redis-host', required=True,
+        help=(
+            'host of the dedicated Redis the benchmark locks and caches are '
+            'kept in (LOCKERHOST is ignored)'
+        ))
+    parser.add_argument(
+        '--redis-db', type=int, required=True,
+        help=(
+            'number of a dedicated, empty Redis database on --redis-host, '
+            'flushed when finished (LOCKERNAME is ignored)'
+        ))
+    parser.add_argument(
+        '--screenings', type=int, default=50,
+        help='number of screened ships (default: %(default)s)')
+    parser.add_argument(
+        '--rounds', type=int, default=2,
+        help=(
+            'number of times all ships are screened, first round with cold '
+            'caches (default: %(default)s)'
+        ))
+    parser.add_argument(
+        '--bulk', action='store_true',
+        help='screen with the bulk screen task instead of one by one')
+    parser.add_argument(
+        '--latency', type=float, default=0,
+        help='fake services response latency in ms (default: %(default)s)')
+    parser.add_argument(
+        '--positions', type=int, default=500,
+        help='AIS track positions per ship (default: %(default)s)')
+    parser.add_argument(
+        '--no-zones', action='store_true',
+        help='disable zone visits check (no GeoServer)')
+    parser.add_argument(
+        '--ini-file',
+        help='INI file of the logging config (default: warnings only)')
+    parser.add_argument(
+        '--output', help='JSON file the results are written to')
+    return parser.parse_args(args)
+
+
+def get_config(arguments, services: FakeServices) -> dict:
+    config = dict(os.environ)
+    config['DBNAME'] = arguments.database
+    config['LOCKERHOST'] = arguments.redis_host
+    config['LOCKERNAME'] = str(arguments.redis_db)
+    config.update(services.get_config())
+    if arguments.no_zones:
+        del config['GEOSERVER_BASE_URL']
+    if arguments.ini_file:
+        config[CONFIG_ENVIRON_NAME] = arguments.ini_file
+
+    return config
+
+
+def check_database(database):
+    table_names = inspect(database).get_table_names()
+    if table_names:
+        raise SystemExit(
+            'Database {0} has tables ({1}), the benchmark needs a dedicated '
+            'empty database'.format(
+                database.url.database, ', '.join(sorted(table_names))))
+
+
+def _get_address(host: str) -> str:
+    try:
+        return socket.gethostbyname(host)
+    except socket.error:
+        return host
+
+
+def get_redis(arguments) -> StrictRedis:
+    worker_names = (
+        (os.environ['LOCKERNAME'], ) if 'LOCKERNAME' in os.environ
+        else WORKER_REDIS_NAMES
+    )
+    worker_host = os.environ.get('LOCKERHOST', 'localhost')
+    if _get_address(arguments.redis_host) == _get_address(worker_host) and \
+            str(arguments.redis_db) in worker_names:
+        raise SystemExit(
+            'Redis database {0}/{1} is used by the workers (LOCKERHOST, '
+            'LOCKERNAME), the benchmark needs a dedicated one'.format(
+                arguments.redis_host, arguments.redis_db))
+
+    redis = StrictRedis.from_url(
+        get_redis_url(arguments.redis_host, str(arguments.redis_db)))
+    size = redis.dbsize()
+    if size:
+        raise SystemExit(
+            'Redis database {0}/{1} has {2} keys, the benchmark needs a '
+            'dedicated empty database'.format(
+                arguments.redis_host, arguments.redis_db, size))
+
+    return redis
+
+
+def create_app(config: dict, database) -> Celery:
+    # broker settings are required by the config module only
+    for name in ('BROKERHOST', 'RESULTHOST', 'REDBEATHOST'):
+        os.environ.setdefault(name, config.get('LOCKERHOST', 'localhost'))
+
+    app = Celery(__name__)
+    app.config_from_object('screening_workers.celeryconfig')
+    app.conf.update(
+        # check tasks are published through a producer, kept in memory
+        broker_url='memory://',
+        task_always_eager=True,
+        task_eager_propagates=True,
+    )
+    setup_app(
+        app, config, database, get_sis_client(config),
+        get_compliance_client(config), get_smh_client(config),
+        get_ais_client(config), get_portservice_client(config),
+        get_cache_manager(config), get_locker(config),
+    )
+
+    for cache_name in UPDATE_CACHES:
+        getattr(app, cache_name).clear()
+
+    return app
+
+
+def create_screenings(database, count: int) -> list:
+    session = sessionmaker(bind=database)()
+    factory = Factory.create(session)
+    factory.create_blacklisted_country(
+        country_id='IR', country_name='Iran', severity=Severity.CRITICAL)
+
+    screening_ids = []
+    for number in range(count):
+        imo_id = FIRST_IMO_ID + number
+        ship = factory.create_ship(imo_id=imo_id, mmsi=get_mmsi(imo_id))
+        screening = factory.create_screening(ship=ship, status=Status.DONE)
+        screening_ids.append(screening.id)
+
+    session.commit()
+    session.close()
+    return screening_ids
+
+
+def screen(app: Celery, screening_ids: list, bulk: bool = False):
+    if bulk:
+        app.tasks[BULK_SCREEN_TASK_NAME].apply().get()
+        return
+
+    task = app.tasks[SCREEN_TASK_NAME]
+    for screening_id in screening_ids:
+        task.apply((screening_id, )).get()
+
+
+def run_round(
+        app: Celery, screening_ids: list, recorder: TaskRecorder,
+        services: FakeServices, bulk: bool = False,
+) -> dict:
+    recorder.reset()
+    for service in services.services.values():
+        service.requests.clear()
+
+    started = time.perf_counter()
+    screen(app, screening_ids, bulk=bulk)
+    elapsed = time.perf_counter() - started
+
+    count = len(screening_ids)
+    return {
+        'screenings': count,
+        'elapsed': elapsed,
+        'screenings_per_second': count / elapsed,
+        'messages_per_screening': sum(recorder.messages.values()) / count,
+        'requests_per_screening': {
+            name: requests / count
+            for name, requests in services.get_requests().items()
+        },
+        'tasks': recorder.get_stats(),
+    }
+
+
+def print_round(number: int, result: dict):
+    print()
+    print(
+        'Round {0}: {1} screenings in {2:.2f}s, {3:.2f} screenings/s, '
+        '{4:.1f} messages/screening'.format(
+            number, result['screenings'], result['elapsed'],
+            result['screenings_per_second'],
+            result['messages_per_screening'],
+        ))
+    print('Requests/screening: {0}'.format(', '.join(
+        '{0} {1:.1f}'.format(name, requests)
+        for name, requests in result['requests_per_screening'].items()
+    )))
+    print('{0:<58} {1:>5} {2:>8} {3:>8} {4:>8} {5:>8} {6:>8}'.format(
+        'task', 'runs', 'mean ms', 'p50 ms', 'p95 ms', 'max ms', 'queries'))
+    for stats in result['tasks']:
+        print(
+            '{name:<58} {runs:>5} {mean:>8.1f} {p50:>8.1f} {p95:>8.1f} '
+            '{max:>8.1f} {queries:>8.1f}'.format(**dict(
+                stats,
+                mean=stats['mean'] * 1000, p50=stats['p50'] * 1000,
+                p95=stats['p95'] * 1000, max=stats['max'] * 1000,
+            )))
+
+
+def main(args=None):
+    arguments = get_arguments(args)
+    redis = get_redis(arguments)
+
+    services = FakeServices(
+        latency=arguments.latency / 1000.0, positions=arguments.positions)
+    services.start()
+
+    config = get_config(arguments, services)
+    if arguments.ini_file:
+        get_file_config(config)
+    else:
+        logging.basicConfig(level=logging.WARNING)
+
+    database = get_database(config)
+    try:
+        check_database(database)
+    except BaseException:
+        services.stop()
+        raise
+
+    created_tables = []
+    recorder = TaskRecorder()
+    recorder.connect(database)
+    try:
+        for table in BaseModel.metadata.sorted_tables:
+            # fails if the table exists, then it is never dropped
+            table.create(database)
+            created_tables.append(table)
+
+        app = create_app(config, database)
+        screening_ids = create_screenings(database, arguments.screenings)
+
+        results = []
+        for number in range(1, arguments.rounds + 1):
+            result = run_round(
+                app, screening_ids, recorder, services, bulk=arguments.bulk)
+            print_round(number, result)
+            results.append(result)
+    finally:
+        recorder.disconnect(database)
+        BaseModel.metadata.drop_all(database, tables=created_tables)
+        # the database was empty, all the keys are the benchmark ones
+        redis.flushdb()
+        services.stop()
+
+    if arguments.output:
+        with open(arguments.output, 'w') as output:
+            json.dump({'rounds': results}, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -25,8 +25,9 @@ result_serializer = 'extended-json'
 beat_max_loop_interval = os.environ.get('BEAT_MAX_LOOP_INTERVAL', '0')
 if beat_max_loop_interval is not None:
     beat_max_loop_interval = int(beat_max_loop_interval)
+broker_backend = os.environ.get('BROKERBACKEND', 'redis')
 broker_url = get_url(
-    os.environ.get('BROKERBACKEND', 'redis'),
+    broker_backend,
     os.environ['BROKERHOST'], os.environ.get('BROKERNAME', '0'),
     os.environ.get('BROKERUSER', ''), os.environ.get('BROKERPASSWORD', ''),
     os.environ.get('BROKERPORT', '6379'),
@@ -54,17 +55,36 @@ if redbeat_lock_timeout is not None:
 
 screenings_bulk_screen_time = os.environ.get(
     'SCREENINGS_BULK_SCREEN_TIME', '0 1 * * *')
+screenings_bulk_screen_batch_size = int(os.environ.get(
+    'SCREENINGS_BULK_SCREEN_BATCH_SIZE', '500'))
 
 statsd_host = os.environ.get('STATSD_HOST', '127.0.0.1')
 statsd_port = os.environ.get('STATSD_PORT', '8125')
 if statsd_port is not None:
     statsd_port = int(statsd_port)
 statsd_prefix = os.environ.get('STATSD_PREFIX')
+statsd_max_buffer_size = int(os.environ.get('STATSD_MAX_BUFFER_SIZE', '50'))
+statsd_flush_interval = float(os.environ.get('STATSD_FLUSH_INTERVAL', '1'))
 
 task_default_queue = os.environ.get('TASK_DEFAULT_QUEUE', 'screening')
+# check tasks are routed to their cost class queue by CheckTasksRegistry
+check_queue_max_priority = 10
+if broker_backend == 'redis':
+    # redis ignores x-max-priority, priorities are emulated with one list per
+    # step and 0 is the highest one (inverted by ScreeningScheduler)
+    broker_transport_options = {
+        'priority_steps': list(range(check_queue_max_priority)),
+        'queue_order_strategy': 'priority',
+    }
 task_queues = [
     Queue('heartbeat', routing_key='heartbeat'),
     Queue(task_default_queue, routing_key='screening'),
+    Queue(
+        'screening.checks.slow',
+        routing_key='screening.checks.slow',
+        queue_arguments={'x-max-priority': check_queue_max_priority},
+    ),
+    # former per check task queues, consumed until drained
     Queue(
         'screening.bulk_screenings.validation',
         routing_key='screening.bulk_screenings.validation',
@@ -147,6 +167,10 @@ task_queues = [
         'screening.ship_movements.port_visits_check',
         routing_key='screening.ship_movements.port_visits_check',
     ),
+    Queue(
+        'screening.ship_movements.port_visits_comparison',
+        routing_key='screening.ship_movements.port_visits_comparison',
+    ),
     Queue(
         'screening.ship_movements.zone_visits_check',
         routing_key='screening.ship_movements.zone_visits_check',
@@ -173,45 +197,6 @@ task_routes = {
     'screening.bulk_screenings.validation': {
         'queue': 'screening.bulk_screenings.validation',
     },
-    'screening.company_sanctions.ship_beneficial_owner_check': {
-        'queue': 'screening.company_sanctions.ship_beneficial_owner_check',
-    },
-    'screening.company_sanctions.ship_company_associates_check': {
-        'queue': 'screening.company_sanctions.ship_company_associates_check',
-    },
-    'screening.company_sanctions.ship_manager_check': {
-        'queue': 'screening.company_sanctions.ship_manager_check',
-    },
-    'screening.company_sanctions.ship_operator_check': {
-        'queue': 'screening.company_sanctions.ship_operator_check',
-    },
-    'screening.company_sanctions.ship_registered_owner_check': {
-        'queue': 'screening.company_sanctions.ship_registered_owner_check',
-    },
-    'screening.company_sanctions.ship_technical_manager_check': {
-        'queue': 'screening.company_sanctions.ship_technical_manager_check',
-    },
-    'screening.country_sanctions.doc_company_check': {
-        'queue': 'screening.country_sanctions.doc_company_check',
-    },
-    'screening.country_sanctions.ship_beneficial_owner_check': {
-        'queue': 'screening.country_sanctions.ship_beneficial_owner_check',
-    },
-    'screening.country_sanctions.ship_flag_check': {
-        'queue': 'screening.country_sanctions.ship_flag_check',
-    },
-    'screening.country_sanctions.ship_manager_check': {
-        'queue': 'screening.country_sanctions.ship_manager_check',
-    },
-    'screening.country_sanctions.ship_operator_check': {
-        'queue': 'screening.country_sanctions.ship_operator_check',
-    },
-    'screening.country_sanctions.ship_registered_owner_check': {
-        'queue': 'screening.country_sanctions.ship_registered_owner_check',
-    },
-    'screening.country_sanctions.ship_technical_manager_check': {
-        'queue': 'screening.country_sanctions.ship_technical_manager_check',
-    },
     'screening.screenings.bulk_screen': {
         'queue': 'screening.screenings.bulk_screen',
     },
@@ -224,20 +209,8 @@ task_routes = {
     'screening.screenings.bulk_screen_killer': {
         'queue': 'screening.screenings.bulk_screen_killer',
     },
-    'screening.ship_inspections.ship_inspections_check': {
-        'queue': 'screening.ship_inspections.ship_inspections_check',
-    },
-    'screening.ship_movements.port_visits_check': {
-        'queue': 'screening.ship_movements.port_visits_check',
-    },
-    'screening.ship_movements.zone_visits_check': {
-        'queue': 'screening.ship_movements.zone_visits_check',
-    },
-    'screening.ship_sanctions.ship_association_check': {
-        'queue': 'screening.ship_sanctions.ship_association_check',
-    },
-    'screening.ship_sanctions.ship_sanction_check': {
-        'queue': 'screening.ship_sanctions.ship_sanction_check',
+    'screening.ship_movements.port_visits_comparison': {
+        'queue': 'screening.ship_movements.port_visits_comparison',
     },
     'screening.ships.ship_cache_update': {
         'queue': 'screening.ships.ship_cache_update',
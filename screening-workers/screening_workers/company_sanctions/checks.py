@@ -3,13 +3,17 @@ from typing import List
 
 from screening_api.screenings.models import Screening
 from screening_api.screenings.repositories import ScreeningsRepository
+from screening_api.sanctions.models import ComplianceEntitySanction
 from screening_api.screenings_reports.repositories import (
     ScreeningsReportsRepository,
+    ScreeningsReportsFingerprintsRepository as FingerprintsRepository,
 )
 from screening_api.ships.enums import ShipAssociateType
 from screening_api.ships.models import Ship
 
 from screening_workers.lib.screening.checks import ReportCheck
+from screening_workers.lib.screening.contexts import ScreeningDataContext
+from screening_workers.lib.screening.fingerprints import get_model_data
 from screening_workers.lib.screening.providers import DataProvider
 from screening_workers.lib.compliance_api.cache.collections import (
     CompanySanctionsCollection, CompanyAssociationsCollection,
@@ -22,6 +26,18 @@ from screening_workers.company_sanctions.reports.models import (
     ShipAssociatedCompanyReport,
 )
 
+# context key of a company sanctions refresh, shared by the company checks
+COMPANY_SANCTIONS_REFRESH = 'company_sanctions_refresh'
+
+
+def get_sanction_data(sanction: ComplianceEntitySanction) -> dict:
+    # activity depends on the current date
+    return get_model_data(
+        sanction,
+        is_active=sanction.is_active,
+        compliance_sanction=get_model_data(sanction.compliance_sanction),
+    )
+
 
 class BaseAssociateCompanyCheck(ReportCheck):
 
@@ -33,8 +49,12 @@ class BaseAssociateCompanyCheck(ReportCheck):
             screenings_reports_repository: ScreeningsReportsRepository,
             ships_collection: ShipsCollection,
             company_sanctions_collection: CompanySanctionsCollection,
+            fingerprints_repository: FingerprintsRepository = None,
     ):
-        super().__init__(screenings_repository, screenings_reports_repository)
+        super().__init__(
+            screenings_repository, screenings_reports_repository,
+            fingerprints_repository,
+        )
         self.company_sanctions_collection = company_sanctions_collection
         self.ships_collection = ships_collection
 
@@ -42,12 +62,11 @@ class BaseAssociateCompanyCheck(ReportCheck):
         data_provider = super(BaseAssociateCompanyCheck, self).\
             get_data_provider(screening)
 
-        ship = self._get_ship(screening.ship_id)
-        self.ships_collection.refresh(screening.ship_id)
+        ship = self._get_ship(data_provider.context, screening.ship_id)
 
         company = self._get_company(ship)
         if company:
-            self.company_sanctions_collection.refresh(company.id)
+            self._refresh_company_sanctions(data_provider.context, company.id)
 
         sanctions = self._find_sanctions(
             screening.ship_id,
@@ -68,14 +87,28 @@ class BaseAssociateCompanyCheck(ReportCheck):
             data_provider.screening_profile, self.associate_type,
         ).make_report(data_provider)
 
-    def _get_ship(self, ship_id: int) -> Ship:
-        company_field = Ship.get_company_field_name(self.associate_type)
-        return self.ships_collection.get(
-            ship_id, joinedload_related=[company_field, ])
+    def get_fingerprint_data(self, data_provider: DataProvider) -> dict:
+        return {
+            'company': get_model_data(data_provider.company),
+            'sanctions': list(map(get_sanction_data, data_provider.sanctions)),
+        }
+
+    def _get_ship(self, context: ScreeningDataContext, ship_id: int) -> Ship:
+        return context.get_value(
+            ('ship', ship_id),
+            lambda: self.ships_collection.get_with_companies(ship_id),
+        )
 
     def _get_company(self, ship: Ship):
         return ship.get_company(self.associate_type)
 
+    def _refresh_company_sanctions(
+            self, context: ScreeningDataContext, company_id: int):
+        return context.get_value(
+            (COMPANY_SANCTIONS_REFRESH, company_id),
+            lambda: self.company_sanctions_collection.refresh([company_id]),
+        )
+
     def _find_sanctions(
             self, ship_id: int, blacklisted_sanction_list_id: int = None):
         return self.company_sanctions_collection.query(
@@ -123,19 +156,25 @@ class ShipCompanyAssociatesCheck(ReportCheck):
             screenings_reports_repository: ScreeningsReportsRepository,
             ships_collection: ShipsCollection,
             company_associations_collection: CompanyAssociationsCollection,
+            fingerprints_repository: FingerprintsRepository = None,
     ):
-        super().__init__(screenings_repository, screenings_reports_repository)
+        super().__init__(
+            screenings_repository, screenings_reports_repository,
+            fingerprints_repository,
+        )
         self.company_associations_collection = company_associations_collection
         self.ships_collection = ships_collection
 
     def get_data_provider(self, screening: Screening) -> DataProvider:
         data_provider = super(ShipCompanyAssociatesCheck, self).\
             get_data_provider(screening)
-        ship = self._get_ship(screening.ship_id)
+        ship = self._get_ship(data_provider.context, screening.ship_id)
         company_ids = ship.get_company_ids()
 
         company_ids_fitlered = list(filter(None, company_ids))
 
+        self._refresh_companies_sanctions(
+            data_provider.context, company_ids_fitlered)
         associations = self._find_associations(company_ids_fitlered)
 
         data_provider.update(
@@ -151,8 +190,42 @@ class ShipCompanyAssociatesCheck(ReportCheck):
             data_provider.screening_profile,
         ).make_report(data_provider)
 
-    def _get_ship(self, ship_id: int):
-        return self.ships_collection.get(ship_id)
+    def get_fingerprint_data(self, data_provider: DataProvider) -> dict:
+        return {
+            'associations': [
+                get_model_data(
+                    association,
+                    src=get_model_data(association.src),
+                    dst=get_model_data(association.dst),
+                    dst_sanctions=list(map(
+                        get_sanction_data, association.dst.entity_sanctions)),
+                )
+                for association in data_provider.associations
+            ],
+        }
+
+    def _get_ship(self, context: ScreeningDataContext, ship_id: int) -> Ship:
+        return context.get_value(
+            ('ship', ship_id),
+            lambda: self.ships_collection.get_with_companies(ship_id),
+        )
+
+    def _refresh_companies_sanctions(
+            self, context: ScreeningDataContext, company_ids: List[int]):
+        # companies not refreshed by the associate company checks yet are
+        # refreshed concurrently
+        def refresh(keys):
+            result = self.company_associations_collection.refresh(
+                [company_id for _, company_id in keys])
+            return [result] * len(keys)
+
+        return context.get_values(
+            [(COMPANY_SANCTIONS_REFRESH, company_id)
+             for company_id in company_ids],
+            refresh,
+        )
 
     def _find_associations(self, company_ids: List[int]):
-        return self.company_associations_collection.query(company_ids)
+        # refreshed with the screening data context
+        return self.company_associations_collection.query(
+            company_ids, refresh=False)
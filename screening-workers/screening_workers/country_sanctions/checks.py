@@ -7,9 +7,14 @@ from screening_api.screenings.models import Screening
 from screening_api.screenings.repositories import ScreeningsRepository
 from screening_api.screenings_reports.repositories import (
     ScreeningsReportsRepository,
+    ScreeningsReportsFingerprintsRepository as FingerprintsRepository,
 )
 
 from screening_workers.lib.screening.checks import BaseCheck, ReportCheck
+from screening_workers.lib.screening.contexts import ScreeningDataContext
+from screening_workers.lib.screening.fingerprints import (
+    get_model_data, get_models_data,
+)
 from screening_workers.lib.screening.providers import DataProvider
 from screening_workers.lib.sis_api.cache.collections import ShipsCollection
 from screening_workers.country_sanctions.reports.makers import (
@@ -30,8 +35,12 @@ class BaseCountryCheck(ReportCheck):
             screenings_reports_repository: ScreeningsReportsRepository,
             ships_collection: ShipsCollection,
             blacklisted_countries_repository: BlacklistedCountriesRepository,
+            fingerprints_repository: FingerprintsRepository = None,
     ):
-        super().__init__(screenings_repository, screenings_reports_repository)
+        super().__init__(
+            screenings_repository, screenings_reports_repository,
+            fingerprints_repository,
+        )
         self.ships_collection = ships_collection
         self.blacklisted_countries_repository =\
             blacklisted_countries_repository
@@ -39,14 +48,33 @@ class BaseCountryCheck(ReportCheck):
     def get_data_provider(self, screening: Screening) -> DataProvider:
         data_provider = super(BaseCountryCheck, self).get_data_provider(
             screening)
-        ship = self._get_ship(screening.ship_id)
+        ship = self._get_ship(data_provider.context, screening.ship_id)
 
         data_provider.update(ship=ship)
 
         return data_provider
 
-    def _get_ship(self, ship_id: int):
-        return self.ships_collection.get(ship_id)
+    def get_fingerprint_data(self, data_provider: DataProvider) -> dict:
+        return {
+            'ship': get_model_data(data_provider.ship),
+            'blacklisted_countries': self._get_blacklisted_countries_data(
+                data_provider.context),
+        }
+
+    def _get_ship(self, context: ScreeningDataContext, ship_id: int):
+        # shared with the company sanctions checks of the screening
+        return context.get_value(
+            ('ship', ship_id),
+            lambda: self.ships_collection.get_with_companies(ship_id),
+        )
+
+    def _get_blacklisted_countries_data(
+            self, context: ScreeningDataContext) -> list:
+        return context.get_value(
+            ('blacklisted_countries', ),
+            lambda: get_models_data(
+                self.blacklisted_countries_repository.find(sort=['id'])),
+        )
 
 
 class BaseAssociateCountryCheck(BaseCountryCheck):
@@ -1,3 +1,6 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+
 from requests.exceptions import HTTPError
 
 from screening_workers.lib.utils import str2date
@@ -6,8 +9,8 @@ from screening_workers.lib.exceptions import ClientError
 
 
 class AISClient(Client):
-    def __init__(self, base_uri, user, password):
-        super(AISClient, self).__init__(base_uri)
+    def __init__(self, base_uri, user, password, **options):
+        super(AISClient, self).__init__(base_uri, **options)
         self.set_basic_auth(user, password)
 
     def get_track(self, mmsi, end_date=None, position_count=None) -> dict:
@@ -70,45 +73,80 @@ class AISClient(Client):
             NotFoundError: When MMSI is not found on AIS.
             RemoteServiceError: When the AIS returns a 500 status code.
         """
+        return list(self.iter_track(
+            mmsi, stop_date=stop_date, position_count=position_count))
+
+    def iter_track(
+            self, mmsi, stop_date=None, position_count=None) -> Iterator:
+        """ Iterate over positions for a given MMSI up to stop_date.
+
+        The next page of the track is fetched while the positions of the
+        current page are consumed.
+
+        Args:
+            mmsi (str): 9 digit MMSI number.
+            stop_date (`obj`:datetime.datetime, optional) A timezone aware
+                ``datetime.datetime`` object.
+            position_count (`obj`:int, optional): Number of positions to
+                return per page.
+        Yields:
+            dict: Position, latest first.
+        Raises:
+            ClientError: When code doesn't execute as expected.
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            page = executor.submit(
+                self._get_track_page, mmsi, None, position_count)
+            while page is not None:
+                positions, end_date = page.result()
+
+                page = None
+                if end_date is not None and \
+                        not (stop_date and end_date <= stop_date):
+                    page = executor.submit(
+                        self._get_track_page, mmsi,
+                        end_date.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                        position_count,
+                    )
+
+                yield from positions
+
+    def _get_track_page(self, mmsi, end_date=None, position_count=None):
+        """ Get a page of positions with the end date of the next page.
+        Args:
+            mmsi (str): 9 digit MMSI number.
+            end_date (`obj`:str, optional): End date of the page.
+            position_count (`obj`:int, optional): Number of positions to
+                return.
+        Returns:
+            tuple: Of positions list and next page end date (``None`` if
+                there is no more data).
+        """
         starts_with = 'track returned no results for mmsi'
-        track = []
-        end_date = None
-        while True:
-            try:
-                track_data, status_code = self.get_track(
-                    mmsi=mmsi,
-                    end_date=end_date,
-                    position_count=position_count,
-                )
-            except HTTPError as exc:
-                if exc.response.status_code == 404:
-                    break
-                raise
-
-            if status_code == 404 or \
-                    track_data.get('message', '').lower(). \
-                    startswith(starts_with):
-                # We've reached the end of the data stream so stop calling AIS.
-                break
-
-            track.extend(track_data.get('data', []))
-
-            next_link = track_data.get('next_link')
-
-            end_date_str = None
-            try:
-                end_date_str = next_link.split('=')[1]
-                end_date = str2date(end_date_str)
-            except Exception:
-                pass
-
-            if end_date_str is None:
-                # There's no more data to consume. Stop processing it.
-                break
-
-            if stop_date and end_date <= stop_date:
-                break
-
-            end_date = end_date.strftime('%Y-%m-%dT%H:%M:%SZ')
-
-        return track
+        try:
+            track_data, status_code = self.get_track(
+                mmsi=mmsi,
+                end_date=end_date,
+                position_count=position_count,
+            )
+        except HTTPError as exc:
+            if exc.response.status_code == 404:
+                return [], None
+            raise
+
+        if status_code == 404 or \
+                track_data.get('message', '').lower(). \
+                startswith(starts_with):
+            # We've reached the end of the data stream so stop calling AIS.
+            return [], None
+
+        positions = track_data.get('data', [])
+
+        next_link = track_data.get('next_link')
+        try:
+            next_end_date = str2date(next_link.split('=')[1])
+        except Exception:
+            # There's no more data to consume.
+            next_end_date = None
+
+        return positions, next_end_date
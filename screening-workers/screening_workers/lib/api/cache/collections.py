@@ -1,3 +1,73 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable
+
+
+class ReadCache:
+    """
+    Bounded in process LRU cache of cached collection reads.
+
+    Every value is stored with the version of the item it was read for
+    (last update date of the item cache updater, shared by all the workers),
+    so a value is read again as soon as any worker updates the item. Values
+    older than ttl seconds are read again too, for writes made outside the
+    updaters.
+
+    Values are shared by the worker threads, model instances are cached as
+    snapshots (plain data, see snapshots module).
+    """
+
+    def __init__(self, ttl: int = 300, max_size: int = 1000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._values)
+
+    def get_value(
+            self, key: Hashable, version: Hashable,
+            createfunc: Callable[[], Any],
+            item_ids: Iterable[Hashable] = None,
+    ) -> Any:
+        """
+        Get the value read for key, created again if the version of the
+        items read (item_ids, key by default) changed.
+        """
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is not None and entry[0] == version and \
+                    time.monotonic() - entry[1] <= self.ttl:
+                self._values.move_to_end(key)
+                return entry[2]
+
+        # read outside of the lock, concurrent misses read the value twice
+        created = time.monotonic()
+        value = createfunc()
+
+        if item_ids is None:
+            item_ids = (key, )
+
+        with self._lock:
+            self._values[key] = (version, created, value, frozenset(item_ids))
+            self._values.move_to_end(key)
+            while len(self._values) > self.max_size:
+                self._values.popitem(last=False)
+
+        return value
+
+    def discard(self, item_id: Hashable) -> None:
+        """
+        Discard the values read for the item.
+        """
+        with self._lock:
+            for key, entry in list(self._values.items()):
+                if item_id in entry[3]:
+                    del self._values[key]
+
+
 class BaseCachedCollection(object):
 
     def invalidate(self, *args, **kwargs):
@@ -0,0 +1,66 @@
+"""Screening Workers cached model snapshots module"""
+from collections import namedtuple
+from typing import Any
+
+from sqlalchemy import inspect
+from sqlalchemy.orm.attributes import set_committed_value
+
+ModelSnapshot = namedtuple(
+    'ModelSnapshot', ['model', 'columns', 'relationships'])
+
+
+def get_snapshot(value: Any, memo: dict = None) -> Any:
+    """
+    Get the plain data of model instances (an instance, a list of instances
+    or None): the loaded column values and loaded relationships, without
+    any session state.
+    """
+    if value is None:
+        return None
+
+    if isinstance(value, list):
+        return [get_snapshot(item, memo=memo) for item in value]
+
+    if memo is None:
+        memo = {}
+    if id(value) in memo:
+        return memo[id(value)]
+
+    state = inspect(value)
+    loaded = state.dict
+    snapshot = memo[id(value)] = ModelSnapshot(state.class_, {
+        attr.key: loaded[attr.key]
+        for attr in state.mapper.column_attrs if attr.key in loaded
+    }, {})
+    for relationship in state.mapper.relationships:
+        if relationship.key in loaded:
+            snapshot.relationships[relationship.key] = get_snapshot(
+                loaded[relationship.key], memo=memo)
+
+    return snapshot
+
+
+def from_snapshot(snapshot: Any, memo: dict = None) -> Any:
+    """
+    Make new (transient) model instances of plain data got with
+    get_snapshot.
+    """
+    if snapshot is None:
+        return None
+
+    if isinstance(snapshot, list):
+        return [from_snapshot(item, memo=memo) for item in snapshot]
+
+    if memo is None:
+        memo = {}
+    if id(snapshot) in memo:
+        return memo[id(snapshot)]
+
+    instance = memo[id(snapshot)] = \
+        inspect(snapshot.model).class_manager.new_instance()
+    for key, value in snapshot.columns.items():
+        set_committed_value(instance, key, value)
+    for key, related in snapshot.relationships.items():
+        set_committed_value(instance, key, from_snapshot(related, memo=memo))
+
+    return instance
@@ -1,12 +1,23 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from typing import Iterable, Tuple
 
 from beaker.cache import Cache
 from redlock.lock import RedLockFactory, RedLock
 
+log = logging.getLogger(__name__)
+
 
 class BaseCacheUpdater:
 
     UPDATE_INTERVAL = 3600  # seconds
+    LOCK_TTL = 300  # seconds
+    WAIT_TIMEOUT = 10  # seconds
+    WAIT_DELAY = 0.2  # seconds
+    MAX_WORKERS = 4
 
     lock_name_prefix = NotImplemented
 
@@ -19,28 +30,84 @@ class BaseCacheUpdater:
         self.locker = locker
 
     def update(self, item_id: int):
-        lock = self._get_lock(item_id)
-        lock.acquire()
-
         now = datetime.utcnow()
         if not self._is_interval_passed(item_id, now):
             return
 
-        self.process(item_id)
+        with self._lock(item_id) as acquired:
+            if not acquired:
+                # another worker is updating the item
+                self._wait_for_update(item_id, now)
+                return
+
+            # the item could have been updated before the lock was acquired
+            if not self._is_interval_passed(item_id, now):
+                return
+
+            self.process(item_id)
+
+            self._set_last_update_date(item_id, now)
 
-        self._set_last_update_date(item_id, now)
+    def update_many(self, item_ids: Iterable[int]):
+        now = datetime.utcnow()
+        item_ids = [
+            item_id for item_id in sorted(set(item_ids))
+            if self._is_interval_passed(item_id, now)
+        ]
+        if len(item_ids) <= 1:
+            return list(map(self.update, item_ids))
+
+        # items are locked one by one, at most MAX_WORKERS updated at once
+        max_workers = min(self.MAX_WORKERS, len(item_ids))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self.update, item_id) for item_id in item_ids]
 
-        lock.release()
+        return [future.result() for future in futures]
 
     def process(self, item_id: int) -> None:
         raise NotImplementedError
 
+    def get_version(self, item_id: int) -> datetime:
+        # last update date changes with every update of the item
+        return self._get_last_update_date(item_id)
+
+    def get_versions(self, item_ids: Iterable[int]) -> Tuple[datetime, ...]:
+        return tuple(
+            self.get_version(item_id) for item_id in sorted(set(item_ids)))
+
+    @contextmanager
+    def _lock(self, item_id: int):
+        lock = self._get_lock(item_id)
+        acquired = lock.acquire()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                lock.release()
+
+    def _wait_for_update(self, item_id: int, current_date: datetime) -> None:
+        # wait for the update date set by the lock owner, or give up and
+        # use the current data
+        timeout = time.monotonic() + self.WAIT_TIMEOUT
+        while time.monotonic() < timeout:
+            time.sleep(self.WAIT_DELAY)
+            if not self._is_interval_passed(item_id, current_date):
+                return
+
+        log.warning(
+            'Update of <%s> still in progress',
+            self._get_lock_name(item_id),
+        )
+
     def _get_lock_name(self, item_id: int) -> str:
         return '{0}_{1}'.format(self.lock_name_prefix, item_id)
 
     def _get_lock(self, item_id: int) -> RedLock:
         lock_name = self._get_lock_name(item_id)
-        return self.locker.create_lock(lock_name)
+        # one attempt only, lock owner is waited for with the update date
+        return self.locker.create_lock(
+            lock_name, ttl=self.LOCK_TTL * 1000, retry_times=1)
 
     def _get_cache_key(self, item_id: int) -> str:
         return str(item_id)
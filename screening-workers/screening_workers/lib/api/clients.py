@@ -1,21 +1,46 @@
+from collections import OrderedDict, namedtuple
+from threading import Lock
 from time import time
 from urllib.parse import urljoin
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from screening_workers.lib.utils import json_logger
 
+# validators and decoded body of the last response of a conditional GET
+ConditionalResponse = namedtuple(
+    'ConditionalResponse', ['etag', 'last_modified', 'content', 'encoding'])
+
 
 class Client(object):
 
+    POOL_SIZE = 10
+    CONNECT_TIMEOUT = 5  # seconds
+    READ_TIMEOUT = 60  # seconds
+    RETRIES = 3
+    RETRY_BACKOFF_FACTOR = 0.5  # seconds
+    RETRY_STATUSES = (502, 503, 504)
+    CONDITIONAL_CACHE_SIZE = 32 * 1024 * 1024  # bytes of response bodies
+
     def __init__(
-            self, base_uri, verify=False, log_level='INFO', encoding=None):
+            self, base_uri, verify=False, log_level='INFO', encoding=None,
+            pool_size=None, timeout=None, retries=None, conditional=False):
         self.base_uri = base_uri
         self.logger = json_logger(__name__, level=log_level)
         self.verify = verify
         self.encoding = encoding
+        self.pool_size = pool_size or self.POOL_SIZE
+        self.timeout = timeout or (self.CONNECT_TIMEOUT, self.READ_TIMEOUT)
+        self.retries = self.RETRIES if retries is None else retries
+        self.conditional = conditional
         self._session = None
         self._auth = None
         self._headers = {}
+        # last responses with validators (ETag/Last-Modified) by url
+        self._conditional_responses = OrderedDict()
+        self._conditional_size = 0
+        self._conditional_lock = Lock()
 
     def set_basic_auth(self, user, password):
         self.session.auth = (user, password)
@@ -28,9 +53,26 @@ class Client(object):
     @property
     def session(self):
         if self._session is None:
-            self._session = requests.Session()
+            self._session = self._create_session()
         return self._session
 
+    def _create_session(self):
+        session = requests.Session()
+        # idempotent methods only, failed status returned to the caller
+        max_retries = Retry(
+            total=self.retries,
+            backoff_factor=self.RETRY_BACKOFF_FACTOR,
+            status_forcelist=self.RETRY_STATUSES,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size, pool_maxsize=self.pool_size,
+            max_retries=max_retries,
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
     def log_request(self, request):
         if isinstance(request, str):
             self.logger.debug('GET %s' % request)
@@ -48,8 +90,9 @@ class Client(object):
         if isinstance(request, str):
             joined = urljoin(self.base_uri, request)
             self.log_request(joined)
-            response = self.session.get(joined, params=params,
-                                        verify=self.verify)
+            prepared = self.session.prepare_request(
+                requests.Request('GET', joined, params=params))
+            response = self._send(prepared)
         elif isinstance(request, requests.Request):
             request.url = urljoin(self.base_uri, request.url)
             request.auth = self.session.auth
@@ -58,7 +101,7 @@ class Client(object):
             request.headers = headers
             self.log_request(request)
             prepared = request.prepare()
-            response = self.session.send(prepared, verify=self.verify)
+            response = self._send(prepared)
         else:
             raise TypeError(
                 'Request should be an instance of request.Request or a string')
@@ -70,11 +113,73 @@ class Client(object):
 
         return response
 
+    def _send(self, prepared):
+        # proxies and CA bundle from the environment, like Session.request
+        settings = self.session.merge_environment_settings(
+            prepared.url, {}, None, self.verify, None)
+        if not self.conditional or prepared.method != 'GET':
+            return self.session.send(
+                prepared, timeout=self.timeout, **settings)
+
+        with self._conditional_lock:
+            cached = self._conditional_responses.get(prepared.url)
+
+        if cached is not None:
+            if cached.etag:
+                prepared.headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                prepared.headers['If-Modified-Since'] = cached.last_modified
+
+        response = self.session.send(
+            prepared, timeout=self.timeout, **settings)
+
+        if response.status_code == 304 and cached is not None:
+            # unchanged, no body sent
+            return self._get_conditional_response(response, cached)
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code == 200 and (etag or last_modified):
+            self._set_conditional_response(prepared.url, ConditionalResponse(
+                etag, last_modified, response.content, response.encoding))
+
+        return response
+
+    def _get_conditional_response(self, not_modified, cached):
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.headers = not_modified.headers
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.elapsed = not_modified.elapsed
+        response.encoding = cached.encoding
+        response._content = cached.content
+        return response
+
+    def _set_conditional_response(self, url, conditional_response):
+        size = len(conditional_response.content)
+        with self._conditional_lock:
+            previous = self._conditional_responses.pop(url, None)
+            if previous is not None:
+                self._conditional_size -= len(previous.content)
+            if size > self.CONDITIONAL_CACHE_SIZE:
+                return
+
+            self._conditional_responses[url] = conditional_response
+            self._conditional_size += size
+            while self._conditional_size > self.CONDITIONAL_CACHE_SIZE:
+                _, oldest = self._conditional_responses.popitem(last=False)
+                self._conditional_size -= len(oldest.content)
+
 
 class TastyPieClient(Client):
 
-    def __init__(self, base_url, username='', api_key='', encoding=None):
-        super(TastyPieClient, self). __init__(base_url, encoding=encoding)
+    def __init__(
+            self, base_url, username='', api_key='', encoding=None,
+            **options):
+        super(TastyPieClient, self). __init__(
+            base_url, encoding=encoding, **options)
         self.username = username
         self.api_key = api_key
 
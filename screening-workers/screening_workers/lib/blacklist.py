@@ -27,6 +27,43 @@ default_blacklisted_ports = [
 ]
 
 
+class BlacklistedPorts(list):
+    """
+    Blacklisted ports list indexed by port and country name.
+
+    Built once (i.e. per check) so port country severity lookups don't scan
+    the whole list. The list is not meant to be modified after creation.
+    """
+
+    def __init__(self, blacklisted_ports=()):
+        super(BlacklistedPorts, self).__init__(blacklisted_ports)
+        self.port_countries = {}
+        self.ports = {}
+        self.countries = {}
+        for position, bp in enumerate(self):
+            if bp['port'] is None:
+                self.countries[bp['country']] = (position, bp)
+            elif bp['country'] is None:
+                self.ports[bp['port']] = (position, bp)
+            else:
+                self.port_countries.setdefault(
+                    (bp['port'], bp['country']), bp)
+
+    def find(self, port_name=None, country_name=None) -> dict:
+        # port and country entry first, otherwise the last port or
+        # country entry of the list
+        found_bl_port = self.port_countries.get((port_name, country_name))
+        if found_bl_port is not None:
+            return found_bl_port
+
+        found = max(
+            self.ports.get(port_name, (-1, {})),
+            self.countries.get(country_name, (-1, {})),
+            key=lambda item: item[0],
+        )
+        return found[1]
+
+
 def get_port_country_severity(blacklisted_ports,
                               port_name=None,
                               country_name=None) -> dict:
@@ -35,6 +72,9 @@ def get_port_country_severity(blacklisted_ports,
          When the Country is blacklisted, all Ports belonging to that
          Country will also be blacklisted.
     """
+    if isinstance(blacklisted_ports, BlacklistedPorts):
+        return blacklisted_ports.find(port_name, country_name)
+
     found_bl_port = {}
     for bp in blacklisted_ports:
         if bp['port'] is None:
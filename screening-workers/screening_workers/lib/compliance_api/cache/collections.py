@@ -8,7 +8,12 @@ from screening_api.ship_sanctions.repositories import (
     ShipSanctionsRepository,
 )
 
-from screening_workers.lib.api.cache.collections import BaseCachedCollection
+from screening_workers.lib.api.cache.collections import (
+    BaseCachedCollection, ReadCache,
+)
+from screening_workers.lib.api.cache.snapshots import (
+    from_snapshot, get_snapshot,
+)
 from screening_workers.lib.compliance_api.cache.updaters import (
     ShipSanctionsUpdater, CompanySanctionsUpdater,
 )
@@ -20,11 +25,15 @@ class ShipSanctionsCollection(BaseCachedCollection):
             self,
             ship_sanctions_repository: ShipSanctionsRepository,
             ship_sanctions_updater: ShipSanctionsUpdater,
+            read_cache: ReadCache = None,
     ):
         self.ship_sanctions_repository = ship_sanctions_repository
         self.ship_sanctions_updater = ship_sanctions_updater
+        self.read_cache = read_cache
 
     def invalidate(self, ship_id):
+        if self.read_cache is not None:
+            self.read_cache.discard(ship_id)
         return self.ship_sanctions_repository.delete(ship_id=ship_id)
 
     def refresh(self, ship_id):
@@ -33,6 +42,18 @@ class ShipSanctionsCollection(BaseCachedCollection):
     def query(self, ship_id, blacklisted_sanction_list_id=None):
         self.refresh(ship_id)
         # always use cache
+        if self.read_cache is None:
+            return self._find(ship_id, blacklisted_sanction_list_id)
+
+        return from_snapshot(self.read_cache.get_value(
+            (ship_id, blacklisted_sanction_list_id),
+            self.ship_sanctions_updater.get_version(ship_id),
+            lambda: get_snapshot(
+                self._find(ship_id, blacklisted_sanction_list_id)),
+            item_ids=[ship_id],
+        ))
+
+    def _find(self, ship_id, blacklisted_sanction_list_id=None):
         return self.ship_sanctions_repository.find(
             ship_id=ship_id,
             blacklisted_sanction_list_id=blacklisted_sanction_list_id,
@@ -53,8 +74,8 @@ class CompanySanctionsCollection(BaseCachedCollection):
         # @todo: remove related
         return self.sanctions_repository.delete(ship_id=ship_id)
 
-    def refresh(self, company_id):
-        return self.company_sanctions_updater.update(company_id)
+    def refresh(self, company_ids):
+        return self.company_sanctions_updater.update_many(company_ids)
 
     def query(
             self, ship_id, associate_type, blacklisted_sanction_list_id=None):
@@ -73,21 +94,38 @@ class CompanyAssociationsCollection(BaseCachedCollection):
             self,
             company_associations_repository: CompanyAssociationsRepository,
             company_sanctions_updater: CompanySanctionsUpdater,
+            read_cache: ReadCache = None,
     ):
         self.company_associations_repository = company_associations_repository
         self.company_sanctions_updater = company_sanctions_updater
+        self.read_cache = read_cache
 
     def invalidate(self, company_id):
         # @todo: remove related
+        if self.read_cache is not None:
+            self.read_cache.discard(company_id)
         return self.company_associations_repository.delete(
             entity_id=company_id)
 
     def refresh(self, company_ids):
-        return list(map(self.company_sanctions_updater.update, company_ids))
+        return self.company_sanctions_updater.update_many(company_ids)
 
-    def query(self, company_ids):
-        self.refresh(company_ids)
+    def query(self, company_ids, refresh=True):
+        if refresh:
+            self.refresh(company_ids)
         # always use cache
+        if self.read_cache is None:
+            return self._find(company_ids)
+
+        company_ids = tuple(sorted(set(company_ids)))
+        return from_snapshot(self.read_cache.get_value(
+            company_ids,
+            self.company_sanctions_updater.get_versions(company_ids),
+            lambda: get_snapshot(self._find(list(company_ids))),
+            item_ids=company_ids,
+        ))
+
+    def _find(self, company_ids):
         return self.company_associations_repository.find_all_associations(
             company_ids,
             joinedload_related=['dst.entity_sanctions', ],
@@ -1,11 +1,10 @@
 """Screening Workers ship sanctions cache updaters module"""
-from collections import deque
-from functools import partial
+from datetime import date, datetime
 import logging
+from typing import Dict, List, Optional
 
 from beaker.cache import Cache
 from redlock.lock import RedLockFactory
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm.session import Session
 
 from screening_api.ships.models import Ship
@@ -19,9 +18,11 @@ from screening_api.company_associations.repositories import (
     CompanyAssociationsRepository,
 )
 from screening_api.entities.enums import EntityType
+from screening_api.entities.models import ComplianceEntity
 from screening_api.entities.repositories import (
     ComplianceEntitiesRepository,
 )
+from screening_api.sanctions.models import ComplianceSanction
 from screening_api.sanctions.repositories import (
     ComplianceSanctionsRepository, ComplianceEntitySanctionsRepository,
 )
@@ -34,7 +35,7 @@ from screening_workers.lib.compliance_api.collections import (
     ShipsCollection, OrganisationNamesCollection,
 )
 from screening_workers.lib.compliance_api.models import (
-    Entity, EntitySanction, EntityAssociation,
+    Entity, EntitySanction,
 )
 
 log = logging.getLogger(__name__)
@@ -70,35 +71,40 @@ class ShipSanctionsUpdater(BaseShipCacheUpdater):
 
         compliance_ship = ships[0]
 
-        create_func = partial(self._create_sanction, ship.id)
-        deque(map(create_func, compliance_ship.ship_sanctions))
+        sanctions = {
+            sanction.sanction_list_name: sanction
+            for sanction in self.ship_sanctions_repository.find(
+                ship_id=ship.id)
+        }
+
+        # only new and changed sanctions are written
+        data_list = {}
+        for entity_sanction in compliance_ship.ship_sanctions:
+            data = self._get_sanction_data(ship.id, entity_sanction)
+            sanction = sanctions.get(data['sanction_list_name'])
+            if sanction is not None and _is_unchanged(sanction, data):
+                continue
+
+            data_list[data['sanction_list_name']] = data
 
-    def _create_sanction(
-            self, ship_id: int, entity_sanction: EntitySanction) -> None:
-        # we don't use optimistic pattern coz of used lock
-        sanction_list_name = entity_sanction.sanction.name
-        sanction = self.ship_sanctions_repository.get_or_none(
-            ship_id=ship_id, sanction_list_name=sanction_list_name)
+        self.ship_sanctions_repository.upsert_many(
+            list(data_list.values()),
+            index_elements=['ship_id', 'sanction_list_name'],
+            update_fields=['code', 'start_date', 'end_date', 'is_active'],
+        )
 
+    def _get_sanction_data(
+            self, ship_id: int, entity_sanction: EntitySanction) -> dict:
         is_active = entity_sanction.status.lower() == 'active'
-        data = {
+        return {
+            'ship_id': ship_id,
             'code': entity_sanction.sanction.code,
-            'sanction_list_name': sanction_list_name,
-            'start_date': entity_sanction.since_date,
-            'end_date': entity_sanction.to_date,
+            'sanction_list_name': entity_sanction.sanction.name,
+            'start_date': _to_date(entity_sanction.since_date),
+            'end_date': _to_date(entity_sanction.to_date),
             'is_active': is_active,
         }
 
-        if sanction is not None:
-            self.ship_sanctions_repository.update(sanction, **data)
-            return
-
-        try:
-            self.ship_sanctions_repository.create(ship_id, **data)
-        # inspection already exists
-        except IntegrityError:
-            pass
-
 
 class CompanySanctionsUpdater(BaseCompanyCacheUpdater):
 
@@ -137,160 +143,251 @@ class CompanySanctionsUpdater(BaseCompanyCacheUpdater):
             sis_company_code=company.sis_code,
         )
 
-        compliance_companies = map(
-            lambda x: x.organisation, organisation_names)
+        data = CompanySanctionsData()
+        for organisation_name in organisation_names:
+            data.add_entity(
+                organisation_name.organisation, EntityType.ORGANISATION)
 
-        self._clear_related_companies(company.id, session=session)
-        create_related_company_func = partial(
-            self._create_entity, entity_type=EntityType.ORGANISATION,
-            sis_company_id=company.id, session=session,
+        session.begin()
+        try:
+            entities = self._upsert_entities(data, session=session)
+            self._set_related_companies(
+                company, entities, data, session=session)
+            self._upsert_associations(entities, data, session=session)
+            sanctions = self._upsert_sanctions(data, session=session)
+            self._upsert_entity_sanctions(
+                entities, sanctions, data, session=session)
+        except Exception:
+            session.rollback()
+            raise
+        else:
+            session.commit()
+
+    def _upsert_entities(
+            self, data: 'CompanySanctionsData', session: Session = None,
+    ) -> Dict[int, ComplianceEntity]:
+        entities = self._find_entities(
+            list(data.entities.keys()), session=session)
+
+        data_list = [
+            entity_data for compliance_id, entity_data in data.entities.items()
+            if compliance_id not in entities or
+            not _is_unchanged(entities[compliance_id], entity_data)
+        ]
+        self.compliance_entities_repository.upsert_many(
+            data_list, index_elements=['compliance_id'],
+            update_fields=['name', 'entity_type'], session=session,
         )
-        deque(map(create_related_company_func, compliance_companies))
 
-    def _clear_related_companies(
-            self, sis_company_id: int, session: Session = None):
-        company = self.companies_repository.get(
-            id=sis_company_id, session=session)
-        company.compliance.clear()
+        new_ids = [
+            compliance_id for compliance_id in data.entities
+            if compliance_id not in entities
+        ]
+        entities.update(self._find_entities(new_ids, session=session))
+        return entities
+
+    def _find_entities(
+            self, compliance_ids: List[int], session: Session = None,
+    ) -> Dict[int, ComplianceEntity]:
+        if not compliance_ids:
+            return {}
+
+        entities = self.compliance_entities_repository.find(
+            compliance_id__in=compliance_ids, session=session)
+        return {entity.compliance_id: entity for entity in entities}
+
+    def _set_related_companies(
+            self, company: SISCompany, entities: Dict[int, ComplianceEntity],
+            data: 'CompanySanctionsData', session: Session = None,
+    ) -> None:
+        # collection diff is flushed as bulk delete/insert
+        company.compliance = [
+            entities[compliance_id] for compliance_id in data.organisations]
         session.flush()
 
-    def _create_entity(
-            self, entity_data: Entity, entity_type: EntityType,
-            sis_company_id: int = None, session: Session = None,
-    ):
-        data = {
-            'compliance_id': entity_data.id,
-            'name': entity_data.name,
-            'entity_type': entity_type,
-        }
+    def _upsert_associations(
+            self, entities: Dict[int, ComplianceEntity],
+            data: 'CompanySanctionsData', session: Session = None,
+    ) -> None:
+        associations_data = {}
+        for src_compliance_id, relationships in data.associations.items():
+            for dst_compliance_id, relationship in relationships.items():
+                src_id = entities[src_compliance_id].id
+                dst_id = entities[dst_compliance_id].id
+                associations_data[src_id, dst_id] = {
+                    'src_id': src_id,
+                    'dst_id': dst_id,
+                    'relationship': relationship,
+                }
+
+        src_ids = [
+            entities[compliance_id].id for compliance_id in data.associations]
+        if not src_ids:
+            return
 
-        if sis_company_id is not None:
-            data['sis_company_ids'] = [sis_company_id, ]
+        associations = self.company_associations_repository.find(
+            src_id__in=src_ids, session=session)
 
-        # we don't use optimistic pattern coz of used lock
-        entity = self.compliance_entities_repository.get_or_none(
-            compliance_id=entity_data.id,
-            joinedload_related=['associations', ],
-            session=session,
+        deleted_ids = []
+        for association in associations:
+            key = association.src_id, association.dst_id
+            association_data = associations_data.get(key)
+            if association_data is None:
+                deleted_ids.append(association.id)
+            elif _is_unchanged(association, association_data):
+                del associations_data[key]
+
+        if deleted_ids:
+            self.company_associations_repository.delete(
+                id__in=deleted_ids, session=session)
+        self.company_associations_repository.upsert_many(
+            list(associations_data.values()),
+            index_elements=['src_id', 'dst_id'],
+            update_fields=['relationship'], session=session,
         )
 
-        if entity is None:
-            try:
-                entity = self.compliance_entities_repository.create(
-                    **data, session=session)
-            # entity already exists
-            except IntegrityError:
-                return
-        else:
-            if sis_company_id and sis_company_id not in entity.sis_company_ids:
-                entity.sis_company_ids.append(sis_company_id)
+    def _upsert_sanctions(
+            self, data: 'CompanySanctionsData', session: Session = None,
+    ) -> Dict[int, ComplianceSanction]:
+        sanctions = self._find_sanctions(
+            list(data.sanctions.keys()), session=session)
+
+        data_list = [
+            sanction_data for code, sanction_data in data.sanctions.items()
+            if code not in sanctions or
+            not _is_unchanged(sanctions[code], sanction_data)
+        ]
+        self.compliance_sanctions_repository.upsert_many(
+            data_list, index_elements=['code'],
+            update_fields=['sanction_list_name'], session=session,
+        )
 
-        if hasattr(entity_data, 'associations'):
-            self.company_associations_repository.delete(
-                src_id=entity.id, session=session)
-            create_association_func = partial(
-                self._create_association, entity.id, session=session)
-            deque(map(create_association_func, entity_data.associations))
+        new_codes = [code for code in data.sanctions if code not in sanctions]
+        sanctions.update(self._find_sanctions(new_codes, session=session))
+        return sanctions
 
-        if hasattr(entity_data, 'sanctions'):
-            self.entity_sanctions_repository.delete(
-                compliance_entity_id=entity.id, session=session)
-            create_sanction_func = partial(
-                self._create_sanction, entity.id, session=session)
-            deque(map(create_sanction_func, entity_data.sanctions))
+    def _find_sanctions(
+            self, codes: List[int], session: Session = None,
+    ) -> Dict[int, ComplianceSanction]:
+        if not codes:
+            return {}
 
-        return entity
+        sanctions = self.compliance_sanctions_repository.find(
+            code__in=codes, session=session)
+        return {sanction.code: sanction for sanction in sanctions}
 
-    def _create_association(
-            self, compliance_entity_id: int,
-            association_data: EntityAssociation,
-            session: Session = None,
+    def _upsert_entity_sanctions(
+            self, entities: Dict[int, ComplianceEntity],
+            sanctions: Dict[int, ComplianceSanction],
+            data: 'CompanySanctionsData', session: Session = None,
     ) -> None:
-        # backward compatibility
-        # skip associations without sanctions
-        if not association_data.entity.sanctions:
+        entity_sanctions_data = {}
+        for entity_compliance_id, entity_sanctions in\
+                data.entity_sanctions.items():
+            for compliance_id, (code, entity_sanction_data) in\
+                    entity_sanctions.items():
+                entity_sanctions_data[compliance_id] = dict(
+                    entity_sanction_data,
+                    compliance_sanction_id=sanctions[code].id,
+                    compliance_entity_id=entities[entity_compliance_id].id,
+                )
+
+        entity_ids = [
+            entities[compliance_id].id
+            for compliance_id in data.entity_sanctions
+        ]
+        if not entity_ids:
             return
-        entity_type = EntityType(association_data.entity_type)
-        entity = self._create_entity(
-            association_data.entity, entity_type,
-            session=session,
-        )
-
-        association = self.company_associations_repository.get_or_none(
-            src_id=compliance_entity_id,
-            dst_id=entity.id,
-            session=session,
-        )
 
-        data = {
-            'src_id': compliance_entity_id,
-            'dst_id': entity.id,
-            'relationship': association_data.relationship,
-        }
+        entity_sanctions = self.entity_sanctions_repository.find(
+            compliance_entity_id__in=entity_ids, session=session)
 
-        if association is not None:
-            return
+        deleted_ids = []
+        for entity_sanction in entity_sanctions:
+            entity_sanction_data = entity_sanctions_data.get(
+                entity_sanction.compliance_id)
+            if entity_sanction_data is None:
+                deleted_ids.append(entity_sanction.id)
+            elif _is_unchanged(entity_sanction, entity_sanction_data):
+                del entity_sanctions_data[entity_sanction.compliance_id]
 
-        try:
-            self.company_associations_repository.create(
-                **data, session=session)
-        # association already exists
-        except IntegrityError:
-            pass
-
-    def _create_sanction(
-        self, compliance_entity_id: int, sanction_data: EntitySanction,
-        session: Session = None,
-    ) -> None:
-        sanction = self.compliance_sanctions_repository.get_or_none(
-            code=sanction_data.sanction.code,
+        if deleted_ids:
+            self.entity_sanctions_repository.delete(
+                id__in=deleted_ids, session=session)
+        self.entity_sanctions_repository.upsert_many(
+            list(entity_sanctions_data.values()),
+            index_elements=['compliance_id'],
+            update_fields=[
+                'compliance_sanction_id', 'compliance_entity_id',
+                'start_date', 'end_date', 'severity',
+            ],
             session=session,
         )
 
-        data = {
-            'code': sanction_data.sanction.code,
-            'sanction_list_name': sanction_data.sanction.name,
-        }
 
-        entity_sanction_data = {
-            'compliance_id': sanction_data.id,
-            'start_date': sanction_data.since_date,
-            'end_date': sanction_data.to_date,
-            # backward compatibility
-            'severity': Severity.WARNING,
-        }
+class CompanySanctionsData:
+    """
+    Compliance entities, associations and sanctions of a company payload,
+    keyed by their compliance ids (sanctions by code).
+    """
 
-        if sanction is not None:
-            self.compliance_sanctions_repository.update(
-                sanction, **data, session=session)
-            entity_sanction = self.entity_sanctions_repository.get_or_none(
-                **entity_sanction_data,
-                compliance_sanction_id=sanction.id,
-                compliance_entity_id=compliance_entity_id,
-                session=session,
-            )
-            if entity_sanction is None:
-                try:
-                    self.entity_sanctions_repository.create(
-                        **entity_sanction_data,
-                        compliance_sanction_id=sanction.id,
-                        compliance_entity_id=compliance_entity_id,
-                        session=session,
-                        refresh=False,
-                    )
-                # entity sanction already exists
-                except IntegrityError:
-                    pass
+    def __init__(self):
+        # ordered set, a name can match the same organisation more than once
+        self.organisations = {}
+        self.entities = {}
+        self.associations = {}
+        self.sanctions = {}
+        self.entity_sanctions = {}
 
-            return
+    def add_entity(self, entity_data: Entity, entity_type: EntityType):
+        if entity_type == EntityType.ORGANISATION and\
+                hasattr(entity_data, 'associations'):
+            self.organisations[entity_data.id] = None
 
-        data['compliance_entity_ids'] = {
-            compliance_entity_id: entity_sanction_data,
+        self.entities[entity_data.id] = {
+            'compliance_id': entity_data.id,
+            'name': entity_data.name,
+            'entity_type': entity_type,
         }
 
-        try:
-            self.compliance_sanctions_repository.create(
-                **data, session=session)
-        # sanction already exists
-        except IntegrityError:
-            pass
+        if hasattr(entity_data, 'associations'):
+            relationships = self.associations[entity_data.id] = {}
+            for association_data in entity_data.associations:
+                # backward compatibility
+                # skip associations without sanctions
+                if not association_data.entity.sanctions:
+                    continue
+
+                self.add_entity(
+                    association_data.entity,
+                    EntityType(association_data.entity_type),
+                )
+                relationships[association_data.entity.id] =\
+                    association_data.relationship
+
+        if hasattr(entity_data, 'sanctions'):
+            entity_sanctions = self.entity_sanctions[entity_data.id] = {}
+            for sanction_data in entity_data.sanctions:
+                code = sanction_data.sanction.code
+                self.sanctions[code] = {
+                    'code': code,
+                    'sanction_list_name': sanction_data.sanction.name,
+                }
+                entity_sanctions[sanction_data.id] = (code, {
+                    'compliance_id': sanction_data.id,
+                    'start_date': _to_date(sanction_data.since_date),
+                    'end_date': _to_date(sanction_data.to_date),
+                    # backward compatibility
+                    'severity': Severity.WARNING,
+                })
+
+
+def _to_date(value: Optional[datetime]) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _is_unchanged(instance, data: dict) -> bool:
+    return all(
+        getattr(instance, key) == value for key, value in data.items())
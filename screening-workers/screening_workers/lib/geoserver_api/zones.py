@@ -0,0 +1,239 @@
+"""Screening Workers GeoServer zones index module"""
+import logging
+import math
+import threading
+import time
+from typing import Iterable, List, Sequence, Tuple
+
+from screening_workers.lib.geoserver_api.geoserver_client import (
+    GeoServiceClient,
+)
+
+log = logging.getLogger(__name__)
+
+BBox = Tuple[float, float, float, float]  # min lon, min lat, max lon, max lat
+
+
+def _get_bbox(points: Iterable[Sequence[float]]) -> BBox:
+    lons, lats = zip(*((point[0], point[1]) for point in points))
+    return min(lons), min(lats), max(lons), max(lats)
+
+
+def _bbox_contains(bbox: BBox, lon: float, lat: float) -> bool:
+    return bbox[0] <= lon <= bbox[2] and bbox[1] <= lat <= bbox[3]
+
+
+class PreparedRing:
+    """
+    Polygon ring prepared for point in polygon tests.
+
+    Ring edges are bucketed in latitude bands, so a test only crosses the
+    edges of the band of the point instead of all the ring edges.
+    """
+
+    BAND_SIZE = 8  # average number of edges per band
+
+    def __init__(self, coordinates: Sequence[Sequence[float]]):
+        points = [(float(point[0]), float(point[1])) for point in coordinates]
+        self.bbox = _get_bbox(points)
+
+        edges = [
+            (x1, y1, x2, y2)
+            for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1])
+            if y1 != y2
+        ]
+        min_lat, max_lat = self.bbox[1], self.bbox[3]
+        self.bands_count = max(1, len(edges) // self.BAND_SIZE)
+        self.band_height = (max_lat - min_lat) / self.bands_count or 1.0
+        self.bands = [[] for _ in range(self.bands_count)]
+        for edge in edges:
+            first = self._get_band(min(edge[1], edge[3]))
+            last = self._get_band(max(edge[1], edge[3]))
+            for band in self.bands[first:last + 1]:
+                band.append(edge)
+
+    def _get_band(self, lat: float) -> int:
+        band = int((lat - self.bbox[1]) / self.band_height)
+        return min(max(band, 0), self.bands_count - 1)
+
+    def contains(self, lon: float, lat: float) -> bool:
+        if not _bbox_contains(self.bbox, lon, lat):
+            return False
+
+        # ray casting, only edges crossing the point latitude count
+        inside = False
+        for x1, y1, x2, y2 in self.bands[self._get_band(lat)]:
+            if (y1 > lat) != (y2 > lat) and \
+                    lon < (x2 - x1) * (lat - y1) / (y2 - y1) + x1:
+                inside = not inside
+
+        return inside
+
+
+class PreparedZone:
+    """
+    Zone (GeoJSON feature) geometry prepared for point in zone tests.
+    """
+
+    def __init__(self, zone_id: str, zone_type: str, name: str, geometry):
+        self.id = zone_id
+        self.type = zone_type
+        self.name = name
+        self.polygons = [
+            (PreparedRing(exterior), [PreparedRing(hole) for hole in holes])
+            for exterior, *holes in self._get_polygons(geometry)
+            if exterior
+        ]
+        self.bbox = None
+        if self.polygons:
+            self.bbox = _get_bbox(
+                point
+                for exterior, _ in self.polygons
+                for point in (exterior.bbox[:2], exterior.bbox[2:])
+            )
+
+    @staticmethod
+    def _get_polygons(geometry) -> list:
+        if not geometry:
+            return []
+
+        if geometry['type'] == 'Polygon':
+            return [geometry['coordinates']]
+        if geometry['type'] == 'MultiPolygon':
+            return geometry['coordinates']
+
+        return []
+
+    def contains(self, lon: float, lat: float) -> bool:
+        for exterior, holes in self.polygons:
+            if exterior.contains(lon, lat) and \
+                    not any(hole.contains(lon, lat) for hole in holes):
+                return True
+
+        return False
+
+
+class ZoneIndex:
+    """
+    Sort-Tile-Recursive (STR) packed R-tree of prepared zones.
+
+    Zones are found by their bounding boxes first and only the candidate
+    zone geometries are tested for the point.
+    """
+
+    NODE_CAPACITY = 10
+
+    def __init__(self, zones: Iterable[PreparedZone]):
+        self.zones = [zone for zone in zones if zone.bbox is not None]
+        nodes = [(zone.bbox, zone, None) for zone in self.zones]
+        while len(nodes) > self.NODE_CAPACITY:
+            nodes = self._pack(nodes)
+        self.root = nodes
+
+    def __len__(self):
+        return len(self.zones)
+
+    def _pack(self, nodes: list) -> list:
+        def center(node, axis):
+            return node[0][axis] + node[0][axis + 2]
+
+        capacity = self.NODE_CAPACITY
+        slices_count = math.ceil(math.sqrt(math.ceil(len(nodes) / capacity)))
+        slice_size = slices_count * capacity
+
+        nodes = sorted(nodes, key=lambda node: center(node, 0))
+        parents = []
+        for start in range(0, len(nodes), slice_size):
+            tiles = sorted(
+                nodes[start:start + slice_size],
+                key=lambda node: center(node, 1),
+            )
+            for index in range(0, len(tiles), capacity):
+                children = tiles[index:index + capacity]
+                bbox = _get_bbox(
+                    point
+                    for child in children
+                    for point in (child[0][:2], child[0][2:])
+                )
+                parents.append((bbox, None, children))
+
+        return parents
+
+    def query(self, lon: float, lat: float) -> List[PreparedZone]:
+        """
+        Get the zones containing the point.
+        """
+        zones = []
+        nodes = list(self.root)
+        while nodes:
+            bbox, zone, children = nodes.pop()
+            if not _bbox_contains(bbox, lon, lat):
+                continue
+
+            if children is not None:
+                nodes.extend(children)
+            elif zone.contains(lon, lat):
+                zones.append(zone)
+
+        return zones
+
+
+class ZonesCache:
+    """
+    In process zone index of GeoServer sanction zones, war zones and
+    active cyclones, rebuilt every UPDATE_INTERVAL seconds.
+    """
+
+    UPDATE_INTERVAL = 3600  # seconds
+
+    SANCTION_ZONE = 'sanction'
+    WAR_ZONE = 'warzone'
+    CYCLONE = 'cyclone'
+
+    def __init__(self, geoserver_client: GeoServiceClient):
+        self.geoserver_client = geoserver_client
+        self._index = None
+        self._updated = None
+        self._lock = threading.Lock()
+
+    def get_index(self) -> ZoneIndex:
+        with self._lock:
+            if self._is_interval_passed():
+                try:
+                    self._index = self._build_index()
+                except Exception:
+                    if self._index is None:
+                        raise
+                    # keep screening with the previous zones
+                    log.exception('Zone index update failed')
+                self._updated = time.monotonic()
+
+            return self._index
+
+    def _is_interval_passed(self) -> bool:
+        return self._updated is None or \
+            time.monotonic() - self._updated > self.UPDATE_INTERVAL
+
+    def _get_features(self) -> Iterable[Tuple[str, dict]]:
+        zone_collections = (
+            (self.SANCTION_ZONE, self.geoserver_client.get_sanction_zones),
+            (self.WAR_ZONE, self.geoserver_client.get_war_zones),
+            (self.CYCLONE, self.geoserver_client.get_active_cyclones),
+        )
+        for zone_type, get_zones in zone_collections:
+            for feature in get_zones()['features']:
+                yield zone_type, feature
+
+    def _build_index(self) -> ZoneIndex:
+        zones = []
+        for number, (zone_type, feature) in enumerate(self._get_features()):
+            properties = feature.get('properties') or {}
+            zone_id = feature.get('id') or '{0}.{1}'.format(zone_type, number)
+            name = properties.get('zone_name') or properties.get('name') or ''
+            zones.append(PreparedZone(
+                zone_id, zone_type, name.strip(), feature.get('geometry'),
+            ))
+
+        index = ZoneIndex(zones)
+        log.info('Zone index updated with %d zones', len(index))
+        return index
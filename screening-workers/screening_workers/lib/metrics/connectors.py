@@ -1,5 +1,6 @@
 from functools import partialmethod
 import logging
+import time
 
 from celery import Task
 
@@ -12,6 +13,9 @@ log = logging.getLogger(__name__)
 
 class CeleryMetricsConnector(object):
 
+    # message header with the publish (wall clock) time
+    PUBLISHED_HEADER = 'published_at'
+
     def __init__(self, publisher: MetricsPublisher, namespace: str = ''):
         self.publisher = publisher
         self.namespace = namespace
@@ -26,14 +30,21 @@ class CeleryMetricsConnector(object):
         signals.task_revoked.connect(weak=False)(self.on_revoked)
         signals.task_prerun.connect(weak=False)(self.on_prerun)
         signals.task_postrun.connect(weak=False)(self.on_postrun)
+        signals.before_task_publish.connect(weak=False)(
+            self.on_before_publish)
 
     # timers
 
+    def on_before_publish(self, sender: str, headers: dict = None, **kwargs):
+        if headers is not None:
+            headers[self.PUBLISHED_HEADER] = time.time()
+
     def on_prerun(self, sender: Task, **kwargs):
         log.debug("Recording prerun time on %s celery task", sender)
         self._timers.start(sender.request.id)
+        self._publish_queue_time(sender)
 
-    def on_postrun(self, sender: Task, **kwargs):
+    def on_postrun(self, sender: Task, state: str = None, **kwargs):
         log.debug("Recording postrun time on %s celery task", sender)
         delta_milis = self._timers.end(sender.request.id)
         if delta_milis is None:
@@ -48,6 +59,40 @@ class CeleryMetricsConnector(object):
         dimensions = self._get_task_metric_dimensions(sender, event)
         self._publish_time(name, delta_milis, dimensions)
 
+        check = getattr(sender, 'check', None)
+        if check is not None:
+            event = MetricsEvent.CHECK_TIME
+            name = self._get_task_metric_name(sender, event)
+            dimensions = self._get_task_metric_dimensions(sender, event)
+            dimensions.update({
+                'CheckName': check.name,
+                'Outcome': state or 'UNKNOWN',
+            })
+            self._publish_time(name, delta_milis, dimensions)
+
+        # task metrics sent together
+        self.publisher.flush()
+
+    def _publish_queue_time(self, sender: Task):
+        request = sender.request
+        # delayed (countdown, eta and retried) tasks wait on purpose
+        if request.eta:
+            return
+
+        published = getattr(request, self.PUBLISHED_HEADER, None)
+        if published is None:
+            published = (request.headers or {}).get(self.PUBLISHED_HEADER)
+        if published is None:
+            log.debug(
+                "Publish time of %s celery task wasn't recorded", sender)
+            return
+
+        delta_milis = max(time.time() - published, 0) * 1000
+        event = MetricsEvent.TASK_QUEUE_TIME
+        name = self._get_task_metric_name(sender, event)
+        dimensions = self._get_task_metric_dimensions(sender, event)
+        self._publish_time(name, delta_milis, dimensions)
+
     # counters
 
     def on_event_count(self, event: MetricsEvent, sender: Task, **kwargs):
@@ -7,3 +7,6 @@ class MetricsEvent(Enum):
     TASK_FAILURE = 'TaskFailure'
     TASK_REVOKED = 'TaskRevoked'
     TASK_TIME = 'TaskTime'
+    TASK_QUEUE_TIME = 'TaskQueueTime'
+    CHECK_TIME = 'CheckTime'
+    PORT_VISITS_COMPARISON = 'PortVisitsComparison'
@@ -1,3 +1,6 @@
+import threading
+import time
+
 import statsd
 
 
@@ -9,21 +12,70 @@ class MetricsPublisher(object):
     def time(self, stat: str, delta: int, rate: int = 1):
         raise NotImplementedError
 
+    def flush(self):
+        pass
+
 
 class StatsDMetricsPublisher(MetricsPublisher):
+    """
+    StatsD metrics publisher.
+
+    Metrics are buffered and sent together, as many per UDP packet as fit
+    MAX_UDP_SIZE, when MAX_BUFFER_SIZE metrics are buffered, FLUSH_INTERVAL
+    passed since the last send or on flush.
+    """
 
-    def __init__(self, address='127.0.0.1', port=8125, prefix=None):
+    MAX_BUFFER_SIZE = 50  # metrics
+    FLUSH_INTERVAL = 1  # seconds
+    MAX_UDP_SIZE = 1432  # bytes, fits ethernet MTU
+
+    def __init__(
+        self, address='127.0.0.1', port=8125, prefix=None,
+        max_buffer_size: int = None, flush_interval: float = None,
+        max_udp_size: int = None,
+    ):
         self.client = statsd.StatsClient(
-            host=address, port=port, prefix=prefix)
+            host=address, port=port, prefix=prefix,
+            maxudpsize=max_udp_size or self.MAX_UDP_SIZE,
+        )
+        self.max_buffer_size = max_buffer_size or self.MAX_BUFFER_SIZE
+        if flush_interval is None:
+            flush_interval = self.FLUSH_INTERVAL
+        self.flush_interval = flush_interval
+
+        self._pipeline = self.client.pipeline()
+        self._buffer_size = 0
+        self._flushed = time.monotonic()
+        self._lock = threading.Lock()
 
     def increase(
         self, stat: str,
         count: int = 1, rate: int = 1, dimensions: dict = None,
     ):
-        self.client.incr(stat, count=count, rate=rate, tags=dimensions)
+        with self._lock:
+            self._pipeline.incr(stat, count=count, rate=rate, tags=dimensions)
+            self._buffered()
 
     def time(
         self, stat: str, delta: int,
         rate: int = 1, dimensions: dict = None,
     ):
-        self.client.timing(stat, delta=delta, rate=rate, tags=dimensions)
+        with self._lock:
+            self._pipeline.timing(
+                stat, delta=delta, rate=rate, tags=dimensions)
+            self._buffered()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _buffered(self):
+        self._buffer_size += 1
+        if self._buffer_size >= self.max_buffer_size or \
+                time.monotonic() - self._flushed >= self.flush_interval:
+            self._flush()
+
+    def _flush(self):
+        self._pipeline.send()
+        self._buffer_size = 0
+        self._flushed = time.monotonic()
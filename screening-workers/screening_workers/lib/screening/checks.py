@@ -12,8 +12,13 @@ from screening_api.screenings.repositories import ScreeningsRepository
 from screening_api.screenings_reports.models import ScreeningReport
 from screening_api.screenings_reports.repositories import (
     ScreeningsReportsRepository,
+    ScreeningsReportsFingerprintsRepository as FingerprintsRepository,
 )
 
+from screening_workers.lib.screening.contexts import screening_data_contexts
+from screening_workers.lib.screening.fingerprints import (
+    get_fingerprint, get_profile_data,
+)
 from screening_workers.lib.screening.providers import DataProvider
 from screening_workers.lib.screening.reports.models import Report
 
@@ -117,15 +122,15 @@ class BaseCheck(CheckInterface):
     def _set_screening_check_status_pending(self, screening_id: int):
         status_field_name = self._get_check_status_field_name()
         data = {status_field_name: Status.PENDING}
-        return self.screenings_repository.update(screening_id, **data)
+        return self.screenings_repository.update_check(screening_id, **data)
 
     def _set_screening_check_status_done(
-            self, screening_id: int, severity: Severity) -> Screening:
+            self, screening_id: int, severity: Severity) -> Status:
         status_field_name = self._get_check_status_field_name()
         severity_field_name = self._get_check_severity_field_name()
         data = {status_field_name: Status.DONE, severity_field_name: severity}
         self.logger.info(data)
-        return self.screenings_repository.update(screening_id, **data)
+        return self.screenings_repository.update_check(screening_id, **data)
 
 
 class ReportCheck(BaseCheck):
@@ -134,15 +139,26 @@ class ReportCheck(BaseCheck):
 
     A report object can be used to extract relevant information from the
     provided check data.
+
+    When the check inputs fingerprint matches the one stored with the
+    previous report of the screening, the stored report and severity are
+    kept and the report is not made again.
     """
 
+    data_contexts = screening_data_contexts
+
+    # bump to make the reports again after a report maker change
+    report_version = 1
+
     def __init__(
             self,
             screenings_repository: ScreeningsRepository,
             screenings_reports_repository: ScreeningsReportsRepository,
+            fingerprints_repository: FingerprintsRepository = None,
     ):
         super(ReportCheck, self).__init__(screenings_repository)
         self.screenings_reports_repository = screenings_reports_repository
+        self.fingerprints_repository = fingerprints_repository
 
     def process(
             self,
@@ -150,6 +166,14 @@ class ReportCheck(BaseCheck):
             session: Session = None,
     ) -> Severity:
         data_provider = self.get_data_provider(screening)
+
+        fingerprint = self.get_fingerprint(data_provider)
+        severity = self._get_fingerprint_severity_or_none(
+            screening.id, fingerprint)
+        if severity is not None:
+            # inputs unchanged since the stored report
+            return severity
+
         check_report = self.make_report(data_provider)
 
         session = session or self._get_session()
@@ -157,13 +181,19 @@ class ReportCheck(BaseCheck):
             data_provider, session)
 
         self._set_check_report(screening_report, check_report, session)
+        self._set_fingerprint(
+            screening.id, fingerprint, check_report.severity)
         return check_report.severity
 
     def get_data_provider(self, screening: Screening) -> DataProvider:
         """
         Generate a data provider for a given screening.
+
+        The data provider context is shared by the checks of the same
+        screening run.
         """
-        return DataProvider(screening)
+        context = self.data_contexts.get(screening.id)
+        return DataProvider(screening, context=context)
 
     def make_report(self, data_provider: DataProvider) -> Report:
         """
@@ -171,6 +201,49 @@ class ReportCheck(BaseCheck):
         """
         raise NotImplementedError
 
+    def get_fingerprint_data(self, data_provider: DataProvider):
+        """
+        JSON serializable data of all the check report inputs, or None to
+        always make the report.
+        """
+        return None
+
+    def get_fingerprint(self, data_provider: DataProvider) -> str:
+        if self.fingerprints_repository is None:
+            return None
+
+        data = self.get_fingerprint_data(data_provider)
+        if data is None:
+            return None
+
+        return get_fingerprint({
+            'report_version': self.report_version,
+            'screening_profile': get_profile_data(
+                data_provider.screening_profile),
+            'data': data,
+        })
+
+    def _get_fingerprint_severity_or_none(
+            self, screening_id: int, fingerprint: str) -> Severity:
+        if fingerprint is None:
+            return None
+
+        stored = self.fingerprints_repository.get_or_none(
+            screening_id=screening_id, check_name=self.name)
+        if stored is None or stored.fingerprint != fingerprint:
+            return None
+
+        return stored.severity
+
+    def _set_fingerprint(
+            self, screening_id: int, fingerprint: str, severity: Severity,
+    ) -> None:
+        if fingerprint is None:
+            return
+
+        self.fingerprints_repository.set_fingerprint(
+            screening_id, self.name, fingerprint, severity)
+
     def _get_session(self):
         return self.screenings_reports_repository.get_session()
 
@@ -0,0 +1,107 @@
+"""Screening Workers screening data contexts module"""
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Hashable, List
+
+
+class ScreeningDataContext:
+    """
+    Data shared by the checks of one screening run.
+
+    The country sanctions and company sanctions/associates checks get the
+    ship with its companies, the blacklisted countries and the company
+    sanctions refreshes from it: the first check asking for a value creates
+    it and the next checks of the same run reuse it. The ship info report is
+    made by the ship flag check from the same ship.
+
+    The other checks (ship sanctions, inspections, movements, ...) read data
+    no other check needs and fetch it themselves.
+    """
+
+    def __init__(self, screening_id: int, run_id: str = None):
+        self.screening_id = screening_id
+        self.run_id = run_id
+        self.created = time.monotonic()
+        self._values = {}
+        self._lock = threading.RLock()
+
+    def get_value(self, key: Hashable, createfunc: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key not in self._values:
+                self._values[key] = createfunc()
+
+            return self._values[key]
+
+    def get_values(
+            self, keys: List[Hashable],
+            createfunc: Callable[[List[Hashable]], List[Any]],
+    ) -> List[Any]:
+        # values of all the missing keys are created by one createfunc call
+        with self._lock:
+            missing_keys = list(dict.fromkeys(
+                key for key in keys if key not in self._values))
+            if missing_keys:
+                values = createfunc(missing_keys)
+                self._values.update(zip(missing_keys, values))
+
+            return [self._values[key] for key in keys]
+
+
+class ScreeningDataContexts:
+    """
+    Registry of the screening data contexts of this worker process.
+
+    Check tasks of one screening run are published by the same scheduling
+    task, so its id (task parent id) is used to tell the runs apart. Without
+    an active run every check gets its own (unshared) context.
+    """
+
+    def __init__(self, ttl: int = 600, max_size: int = 1000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._contexts = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def activate(self, run_id: str = None):
+        previous_run_id = getattr(self._local, 'run_id', None)
+        self._local.run_id = run_id
+        try:
+            yield
+        finally:
+            self._local.run_id = previous_run_id
+
+    def get(self, screening_id: int) -> ScreeningDataContext:
+        run_id = getattr(self._local, 'run_id', None)
+        if run_id is None:
+            return ScreeningDataContext(screening_id)
+
+        with self._lock:
+            self._expire()
+
+            context = self._contexts.get(screening_id)
+            if context is None or context.run_id != run_id:
+                context = ScreeningDataContext(screening_id, run_id)
+                self._contexts[screening_id] = context
+            self._contexts.move_to_end(screening_id)
+
+            while len(self._contexts) > self.max_size:
+                self._contexts.popitem(last=False)
+
+            return context
+
+    def discard(self, screening_id: int) -> None:
+        with self._lock:
+            self._contexts.pop(screening_id, None)
+
+    def _expire(self) -> None:
+        expired = time.monotonic() - self.ttl
+        for screening_id, context in list(self._contexts.items()):
+            if context.created < expired:
+                del self._contexts[screening_id]
+
+
+screening_data_contexts = ScreeningDataContexts()
@@ -0,0 +1,13 @@
+"""Screening Workers screening enums module"""
+from enum import Enum
+
+
+class CheckCost(Enum):
+    """
+    Check task cost class, each class has its own queue.
+
+    Every check reads the ship or company through the SIS and compliance
+    collections, which refresh them from upstream, so there is no class of
+    checks served by the screening database only.
+    """
+    SLOW = 'slow'  # upstream services (SIS, compliance, AIS, SMH, ...)
@@ -0,0 +1,47 @@
+"""Screening Workers screening check fingerprints module"""
+import hashlib
+import json
+from typing import Any, Iterable
+
+from screening_api.models import BaseModel
+
+# change on every SIS / compliance refresh, even with the same data
+IGNORED_FIELDS = ('created', 'updated')
+
+
+def get_model_data(instance: BaseModel, **extra) -> dict:
+    """
+    Get the column values of a model instance (None for no instance).
+    """
+    if instance is None:
+        return None
+
+    data = {
+        column.key: getattr(instance, column.key)
+        for column in instance.__table__.columns
+        if column.key not in IGNORED_FIELDS
+    }
+    data.update(extra)
+    return data
+
+
+def get_models_data(instances: Iterable[BaseModel]) -> list:
+    return list(map(get_model_data, instances))
+
+
+def get_profile_data(screening_profile) -> dict:
+    return {
+        name: getattr(screening_profile, name)
+        for name in dir(screening_profile)
+        if not name.startswith('_') and
+        not callable(getattr(screening_profile, name))
+    }
+
+
+def get_fingerprint(data: Any) -> str:
+    """
+    Get a stable fingerprint of the check inputs data.
+    """
+    content = json.dumps(
+        data, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
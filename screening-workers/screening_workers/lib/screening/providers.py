@@ -1,5 +1,6 @@
 from screening_api.ships.models import Ship
 
+from screening_workers.lib.screening.contexts import ScreeningDataContext
 from screening_workers.screenings_profiles.models import (
     DefaultScreeningProfile as ScreeningProfile,
 )
@@ -13,8 +14,10 @@ class DataProvider:
     in one of these objects.
     """
 
-    def __init__(self, screening, **kwargs):
+    def __init__(
+            self, screening, context: ScreeningDataContext = None, **kwargs):
         self.screening = screening
+        self.context = context or ScreeningDataContext(screening.id)
 
         self.update(**kwargs)
 
@@ -1,15 +1,42 @@
-from celery import Celery
+from typing import List
+
+from celery import Celery, Task
 from celery.app.registry import TaskRegistry
 
+from screening_workers.lib.screening.enums import CheckCost
+
 
 class CheckTasksRegistry(dict):
 
+    QUEUE_NAME_FORMAT = 'screening.checks.{0}'
+    # cheaper cost classes are published first
+    COST_ORDER = [CheckCost.SLOW]
+
     @classmethod
     def create(cls, *tasks):
         data = {task.name: task for task in tasks}
         return cls(**data)
 
+    @classmethod
+    def get_queue_name(cls, cost: CheckCost) -> str:
+        return cls.QUEUE_NAME_FORMAT.format(cost.value)
+
     def register(self, app: Celery, app_registry: TaskRegistry):
         for task in self.values():
             app_registry.register(task)
             app.register_task(task)
+
+    def get_tasks(self) -> List[Task]:
+        return sorted(
+            self.values(), key=lambda task: self.COST_ORDER.index(task.cost))
+
+    def route(self, name: str, args, kwargs, options, task=None, **kw):
+        """
+        Celery router (task_routes) of check tasks to their cost class
+        queue.
+        """
+        check_task = self.get(name)
+        if check_task is None:
+            return None
+
+        return {'queue': self.get_queue_name(check_task.cost)}
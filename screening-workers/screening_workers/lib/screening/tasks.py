@@ -2,6 +2,8 @@ from requests.exceptions import HTTPError
 
 from screening_workers.lib.messaging.tasks import CountdownRetryTask
 from screening_workers.lib.screening.checks import CheckInterface
+from screening_workers.lib.screening.contexts import screening_data_contexts
+from screening_workers.lib.screening.enums import CheckCost
 
 
 class CheckTask(CountdownRetryTask):
@@ -10,6 +12,7 @@ class CheckTask(CountdownRetryTask):
     """
     task_serializer = 'extended-json'
     retry_errors = (HTTPError, )
+    cost = CheckCost.SLOW
 
     def __init__(self, check: CheckInterface, soft_time_limit: int =None):
         self.check = check
@@ -19,7 +22,9 @@ class CheckTask(CountdownRetryTask):
         return 2 ** self.request.retries
 
     def retry_run(self, screening_id: int):
-        return self.check.do_check(screening_id)
+        # check tasks of a screening run are sent by the same parent task
+        with screening_data_contexts.activate(self.request.parent_id):
+            return self.check.do_check(screening_id)
 
     def on_failure(self, exc, task_id, args, kwargs, einfo):
         self.check.on_failure(*args, **kwargs)
@@ -1,9 +1,16 @@
+from screening_api.ships.enums import ShipAssociateType
+from screening_api.ships.models import Ship
 from screening_api.ships.repositories import ShipsRepository
 from screening_api.ship_inspections.repositories import (
     ShipInspectionsRepository,
 )
 
-from screening_workers.lib.api.cache.collections import BaseCachedCollection
+from screening_workers.lib.api.cache.collections import (
+    BaseCachedCollection, ReadCache,
+)
+from screening_workers.lib.api.cache.snapshots import (
+    from_snapshot, get_snapshot,
+)
 from screening_workers.lib.sis_api.cache.updaters import (
     ShipUpdater, ShipInspectionsUpdater,
 )
@@ -15,12 +22,17 @@ class ShipsCollection(BaseCachedCollection):
             self,
             ships_repository: ShipsRepository,
             ship_updater: ShipUpdater,
+            read_cache: ReadCache = None,
     ):
         self.ships_repository = ships_repository
         self.ship_updater = ship_updater
+        self.read_cache = read_cache
 
     def invalidate(self, ship_id):
-        raise NotImplementedError
+        if self.read_cache is None:
+            raise NotImplementedError
+
+        return self.read_cache.discard(ship_id)
 
     def refresh(self, ship_id):
         return self.ship_updater.update(ship_id)
@@ -28,7 +40,23 @@ class ShipsCollection(BaseCachedCollection):
     def get(self, ship_id, **kwargs):
         self.refresh(ship_id)
         # always use cache
-        return self.ships_repository.get(id=ship_id, **kwargs)
+        if self.read_cache is None or 'session' in kwargs:
+            return self.ships_repository.get(id=ship_id, **kwargs)
+
+        return from_snapshot(self.read_cache.get_value(
+            (ship_id, repr(sorted(kwargs.items()))),
+            self.ship_updater.get_version(ship_id),
+            lambda: get_snapshot(
+                self.ships_repository.get(id=ship_id, **kwargs)),
+            item_ids=[ship_id],
+        ))
+
+    def get_with_companies(self, ship_id, **kwargs):
+        company_fields = [
+            Ship.get_company_field_name(associate_type)
+            for associate_type in ShipAssociateType.__members__.values()
+        ]
+        return self.get(ship_id, joinedload_related=company_fields, **kwargs)
 
 
 class ShipInspectionsCollection(BaseCachedCollection):
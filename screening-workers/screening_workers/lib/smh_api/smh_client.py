@@ -5,8 +5,8 @@ from screening_workers.lib.exceptions import ClientError
 
 
 class SMHClient(Client):
-    def __init__(self, base_uri, user, password):
-        super(SMHClient, self).__init__(base_uri)
+    def __init__(self, base_uri, user, password, **options):
+        super(SMHClient, self).__init__(base_uri, **options)
         self.base_uri = base_uri
         self.set_basic_auth(user, password)
 
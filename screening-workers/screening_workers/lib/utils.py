@@ -1,5 +1,6 @@
 from datetime import datetime
 import logging
+import re
 import structlog
 
 from screening_workers.lib.structlog.processors import SentryProcessor
@@ -8,12 +9,24 @@ DATETIME_FORMAT_DEFAULT = "%Y-%m-%dT%H:%M:%SZ"
 DATETIME_FORMAT_FALLBACK = "%Y-%m-%dT%H:%M:%S"
 DATETIME_FORMAT_FULL = "%Y-%m-%dT%H:%M:%S.%f"
 DATE_FORMAT = "%Y-%m-%d"
+DEFAULT_DATE_FORMATS = (
+    DATETIME_FORMAT_DEFAULT, DATETIME_FORMAT_FALLBACK, DATETIME_FORMAT_FULL,
+    DATE_FORMAT,
+)
+# DATETIME_FORMAT_DEFAULT without strptime cost (i.e. AIS timestamps)
+DATETIME_DEFAULT_RE = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})Z\Z')
 
 
-def str2date(datestr, date_formats=(DATETIME_FORMAT_DEFAULT,
-                                    DATETIME_FORMAT_FALLBACK,
-                                    DATETIME_FORMAT_FULL,
-                                    DATE_FORMAT)):
+def str2date(datestr, date_formats=DEFAULT_DATE_FORMATS):
+    if date_formats is DEFAULT_DATE_FORMATS and isinstance(datestr, str):
+        match = DATETIME_DEFAULT_RE.match(datestr)
+        if match is not None:
+            try:
+                return datetime(*map(int, match.groups()))
+            except ValueError:
+                pass  # i.e. out of range, try all formats
+
     # support a single date format arg
     if not type(date_formats) is tuple:
         date_formats = [date_formats]
@@ -39,7 +39,7 @@ from screening_api.screenings_history.repositories import (
     ScreeningsHistoryRepository,
 )
 from screening_api.screenings_reports.repositories import (
-    ScreeningsReportsRepository,
+    ScreeningsReportsRepository, ScreeningsReportsFingerprintsRepository,
 )
 from screening_api.screenings_reports.validators import (
     ReportSchemaValidator,
@@ -53,9 +53,14 @@ from screening_api.ship_movements.repositories import ShipPortVisitsRepository
 
 from screening_workers.lib.smh_api.smh_client import SMHClient
 from screening_workers.lib.ais_api.ais_client import AISClient
+from screening_workers.lib.geoserver_api.geoserver_client import (
+    GeoServiceClient,
+)
+from screening_workers.lib.geoserver_api.zones import ZonesCache
 from screening_workers.lib.ports_api.portservice_client import (
     PortServiceClient, )
-from screening_workers.lib.api.clients import TastyPieClient
+from screening_workers.lib.api.cache.collections import ReadCache
+from screening_workers.lib.api.clients import Client, TastyPieClient
 from screening_workers.lib.compliance_api.cache.collections import (
     ShipSanctionsCollection, CompanyAssociationsCollection,
     CompanySanctionsCollection,
@@ -83,7 +88,9 @@ from screening_workers.lib.sis_api.cache.updaters import (
 from screening_workers.lib.sis_api.collections import (
     ShipsCollection as SisShipsCollection, InspectionsCollection,
 )
-from screening_workers.lib.blacklist import default_blacklisted_ports
+from screening_workers.lib.blacklist import (
+    BlacklistedPorts, default_blacklisted_ports,
+)
 
 from screening_workers.company_sanctions.checks import (
     ShipRegisteredOwnerCompanyCheck, ShipOperatorCompanyCheck,
@@ -129,8 +136,11 @@ from screening_workers.ship_inspections.tasks import (
 from screening_workers.ship_movements.checks import (
     ShipMovementsCheck, ZoneVisitsCheck,
 )
+from screening_workers.ship_movements.comparisons import (
+    PortVisitsComparison,
+)
 from screening_workers.ship_movements.tasks import (
-    ShipMovementsCheckTask, ZoneVisitsCheckTask,
+    PortVisitsComparisonTask, ShipMovementsCheckTask, ZoneVisitsCheckTask,
 )
 from screening_workers.ship_sanctions.checks import (
     ShipAssociationCheck, ShipSanctionCheck,
@@ -172,6 +182,20 @@ def get_database(config):
     )
 
 
+def get_http_client_options(config):
+    # connection pool fits worker concurrency (threads/greenlets pools)
+    pool_size = config.get('HTTP_POOL_SIZE') or max(
+        int(config.get('WORKER_CONCURRENCY') or 0), Client.POOL_SIZE)
+    return {
+        'pool_size': int(pool_size),
+        'timeout': (
+            float(config.get('HTTP_CONNECT_TIMEOUT', Client.CONNECT_TIMEOUT)),
+            float(config.get('HTTP_READ_TIMEOUT', Client.READ_TIMEOUT)),
+        ),
+        'retries': int(config.get('HTTP_RETRIES', Client.RETRIES)),
+    }
+
+
 def get_sis_client(config):
     return TastyPieClient(
         config.get(
@@ -181,6 +205,8 @@ def get_sis_client(config):
         config.get('SIS_USERNAME', 'screening'),
         config.get('SIS_API_KEY', ''),
         encoding='utf-8',
+        conditional=True,
+        **get_http_client_options(config)
     )
 
 
@@ -193,6 +219,8 @@ def get_compliance_client(config):
         config.get('COMPLIANCE_USERNAME', 'screening'),
         config.get('COMPLIANCE_API_KEY', ''),
         encoding='utf-8',
+        conditional=True,
+        **get_http_client_options(config)
     )
 
 
@@ -204,6 +232,7 @@ def get_smh_client(config):
         ),
         config.get('SMH_USERNAME', 'screening'),
         config.get('SMH_PASSWORD', ''),
+        **get_http_client_options(config)
     )
 
 
@@ -215,6 +244,7 @@ def get_ais_client(config):
         ),
         config.get('AIS_USERNAME', 'screening'),
         config.get('AIS_PASSWORD', ''),
+        **get_http_client_options(config)
     )
 
 
@@ -227,6 +257,14 @@ def get_portservice_client(config):
     )
 
 
+def get_zones_cache(config):
+    base_url = config.get('GEOSERVER_BASE_URL')
+    if not base_url:
+        return None
+
+    return ZonesCache(GeoServiceClient(base_url))
+
+
 def get_redis_url(dbhost, dbname, dbuser='', dbpassword='', port='6379'):
     netloc = '{0}:{1}'.format(dbhost, port)
     if dbuser and dbpassword:
@@ -266,6 +304,13 @@ def get_cache_manager(config):
     return CacheManager(**parse_cache_config_options(cache_opts))
 
 
+def get_read_cache(config):
+    return ReadCache(
+        ttl=int(config.get('READ_CACHE_TTL', '300')),
+        max_size=int(config.get('READ_CACHE_MAX_SIZE', '1000')),
+    )
+
+
 def enable_debugger(config):
     import ptvsd
     ptvsd_host = config.get('HOST', '0.0.0.0')
@@ -281,18 +326,28 @@ def enable_debugger(config):
         log.debug("* PTVSd already active")
 
 
-def setup_metrics(config):
+def get_metrics_publisher(config):
     metrics_enable = config.get('metrics_enable', False)
-    metrics_namespace = config.get('metrics_namespace', '')
     if not metrics_enable:
-        log.warning("Metrics disabled")
         return
 
     statsd_host = config.get('statsd_host', '127.0.0.1')
     statsd_port = config.get('statsd_port', 8125)
     statsd_prefix = config.get('statsd_prefix')
-    metrics_publisher = StatsDMetricsPublisher(
-        statsd_host, statsd_port, statsd_prefix)
+    return StatsDMetricsPublisher(
+        statsd_host, statsd_port, statsd_prefix,
+        max_buffer_size=config.get('statsd_max_buffer_size'),
+        flush_interval=config.get('statsd_flush_interval'),
+    )
+
+
+def setup_metrics(config):
+    metrics_namespace = config.get('metrics_namespace', '')
+    metrics_publisher = get_metrics_publisher(config)
+    if metrics_publisher is None:
+        log.warning("Metrics disabled")
+        return
+
     metrics_connector = CeleryMetricsConnector(
         metrics_publisher, metrics_namespace)
     metrics_connector.connect(signals)
@@ -343,7 +398,8 @@ def setup_app(
         ships_repository, ship_update_cache, locker, sis_ships_collection,
         ships_upserter,
     )
-    ships_collection = ShipsCollection(ships_repository, ship_updater)
+    ships_collection = ShipsCollection(
+        ships_repository, ship_updater, get_read_cache(config))
 
     company_sanctions_update_cache = cache_manager.get_cache_region(
         'company_sanctions_update', 'short_term')
@@ -362,6 +418,7 @@ def setup_app(
     )
     company_associations_collection = CompanyAssociationsCollection(
         company_associations_repository, company_sanctions_updater,
+        get_read_cache(config),
     )
 
     ship_inspections_update_cache = cache_manager.get_cache_region(
@@ -385,6 +442,7 @@ def setup_app(
     )
     ship_sanctions_collection = ShipSanctionsCollection(
         ship_sanctions_repository, ship_sanctions_updater,
+        get_read_cache(config),
     )
 
     ship_movements_repository = ShipPortVisitsRepository(session_factory)
@@ -438,75 +496,105 @@ def setup_app(
     screenings_history_repository = ScreeningsHistoryRepository(
         session_factory)
 
+    fingerprints_repository = ScreeningsReportsFingerprintsRepository(
+        session_factory)
+
     ship_registered_owner_company_check = ShipRegisteredOwnerCompanyCheck(
         screenings_repository, screenings_reports_repository, ships_collection,
         company_sanctions_collection,
+        fingerprints_repository=fingerprints_repository,
     )
     ship_operatior_company_check = ShipOperatorCompanyCheck(
         screenings_repository, screenings_reports_repository, ships_collection,
         company_sanctions_collection,
+        fingerprints_repository=fingerprints_repository,
     )
     ship_beneficial_owner_company_check = ShipBeneficialOwnerCompanyCheck(
         screenings_repository, screenings_reports_repository, ships_collection,
         company_sanctions_collection,
+        fingerprints_repository=fingerprints_repository,
     )
     ship_manager_company_check = ShipManagerCompanyCheck(
         screenings_repository, screenings_reports_repository, ships_collection,
         company_sanctions_collection,
+        fingerprints_repository=fingerprints_repository,
     )
     ship_technical_manager_company_check = ShipTechnicalManagerCompanyCheck(
         screenings_repository, screenings_reports_repository, ships_collection,
         company_sanctions_collection,
+        fingerprints_repository=fingerprints_repository,
     )
     ship_company_associates_check = ShipCompanyAssociatesCheck(
         screenings_repository, screenings_reports_repository, ships_collection,
         company_associations_collection,
+        fingerprints_repository=fingerprints_repository,
     )
     ship_flag_check = ShipFlagCheck(
         screenings_repository, screenings_reports_repository, ships_collection,
         blacklisted_countries_repository,
+        fingerprints_repository=fingerprints_repository,
     )
     ship_registered_owner_check = ShipRegisteredOwnerCheck(
         screenings_repository, screenings_reports_repository, ships_collection,
         blacklisted_countries_repository,
+        fingerprints_repository=fingerprints_repository,
     )
     ship_operator_check = ShipOperatorCheck(
         screenings_repository, screenings_reports_repository, ships_collection,
         blacklisted_countries_repository,
+        fingerprints_repository=fingerprints_repository,
     )
     ship_beneficial_owner_check = ShipBeneficialOwnerCheck(
         screenings_repository, screenings_reports_repository, ships_collection,
         blacklisted_countries_repository,
+        fingerprints_repository=fingerprints_repository,
     )
     ship_manager_check = ShipManagerCheck(
         screenings_repository, screenings_reports_repository, ships_collection,
         blacklisted_countries_repository,
+        fingerprints_repository=fingerprints_repository,
     )
     ship_technical_manager_check = ShipTechnicalManagerCheck(
         screenings_repository, screenings_reports_repository, ships_collection,
         blacklisted_countries_repository,
+        fingerprints_repository=fingerprints_repository,
     )
     doc_company_check = DocCompanyCheck(screenings_repository)
     ship_association_check = ShipAssociationCheck(screenings_repository)
     ship_sanction_check = ShipSanctionCheck(
         screenings_repository, screenings_reports_repository,
         ship_sanctions_collection,
+        fingerprints_repository=fingerprints_repository,
     )
     ship_inspections_check = ShipInspectionsCheck(
         screenings_repository, screenings_reports_repository,
         ship_inspections_collection,
+        fingerprints_repository=fingerprints_repository,
     )
 
-    ship_movements_check = ShipMovementsCheck(screenings_repository,
-                                              screenings_reports_repository,
-                                              ship_movements_repository,
-                                              ships_repository,
-                                              default_blacklisted_ports,
-                                              sis_client, config,
-                                              smh_client, ais_client,
-                                              portservice_client)
+    # indexed once, shared by the ship movements check and its comparison
+    blacklisted_ports = BlacklistedPorts(default_blacklisted_ports)
 
-    zone_visits_check = ZoneVisitsCheck(screenings_repository)
+    port_visits_comparison = PortVisitsComparison(
+        smh_client, blacklisted_ports,
+        get_metrics_publisher(app.conf),
+        app.conf.get('metrics_namespace', ''),
+    )
+    port_visits_comparison_task = PortVisitsComparisonTask(
+        port_visits_comparison)
+
+    ship_movements_check = ShipMovementsCheck(
+        screenings_repository, screenings_reports_repository,
+        ship_movements_repository, ships_repository,
+        blacklisted_ports, sis_client, config,
+        smh_client, ais_client, portservice_client,
+        port_visits_comparison_task=port_visits_comparison_task,
+    )
+
+    zone_visits_check = ZoneVisitsCheck(
+        screenings_repository, screenings_reports_repository,
+        ais_client, get_zones_cache(config), config,
+    )
 
     bulk_screening_validation_task = BulkScreeningValidationTask(
         screenings_creator)
@@ -572,8 +660,13 @@ def setup_app(
 
     screening_screen_killer_task = ScreeningScreenKillerTask(screening_killer)
 
+    screenings_bulk_screen_batch_size = app.conf.get(
+        'screenings_bulk_screen_batch_size', 500)
+
     screenings_bulk_screen_killer_task = ScreeningsBulkScreenKillerTask(
-        screenings_repository, screening_killer)
+        screenings_repository, screening_killer,
+        batch_size=screenings_bulk_screen_batch_size,
+    )
 
     screenings_bulk_screen_killer_time = app.conf.get(
         'screenings_bulk_screen_killer_time', '0 0 * * *')
@@ -594,7 +687,8 @@ def setup_app(
         screenings_repository, screening_scheduler,
         # default four hours
         task_time_limit=app.conf.get('task_time_limit', 4 * 60 * 60),
-        soft_time_limit=app.conf.get('task_soft_time_limit')
+        soft_time_limit=app.conf.get('task_soft_time_limit'),
+        batch_size=screenings_bulk_screen_batch_size,
     )
 
     screenings_bulk_screen_time = app.conf.get(
@@ -626,6 +720,9 @@ def setup_app(
     heartbeat_schedule = HeartbeatSchedule(heartbeat_task)
 
     check_tasks_registry.register(app, tasks)
+    # check tasks routed to their cost class queue first
+    app.conf.task_routes = (
+        check_tasks_registry.route, app.conf.task_routes)
 
     tasks.register(bulk_screening_validation_task)
     tasks.register(screening_screen_task)
@@ -635,6 +732,7 @@ def setup_app(
     tasks.register(ship_cache_update_task)
     tasks.register(ships_cache_update_task)
     tasks.register(heartbeat_task)
+    tasks.register(port_visits_comparison_task)
     app.register_task(bulk_screening_validation_task)
     app.register_task(screening_screen_task)
     app.register_task(screening_screen_killer_task)
@@ -643,6 +741,7 @@ def setup_app(
     app.register_task(ship_cache_update_task)
     app.register_task(ships_cache_update_task)
     app.register_task(heartbeat_task)
+    app.register_task(port_visits_comparison_task)
 
     screenings_bulk_screen_schedule.setup(sender=app)
     screenings_bulk_screen_killer_schedule.setup(sender=app)
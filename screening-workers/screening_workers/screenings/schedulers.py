@@ -1,5 +1,8 @@
 """Screening workers screenings schedulers module"""
 import logging
+from typing import List
+
+from sqlalchemy.orm.session import Session
 
 from screening_api.screenings.enums import Status
 from screening_api.screenings.models import Screening
@@ -16,6 +19,14 @@ log = logging.getLogger(__name__)
 
 class ScreeningScheduler:
 
+    # single ship screens preempt bulk rescreens on the check queues
+    # (AMQP order, the highest priority is consumed first)
+    INTERACTIVE_PRIORITY = 9
+    BULK_PRIORITY = 0
+    MAX_PRIORITY = 9
+    # transports consuming the lowest priority first
+    INVERTED_PRIORITY_TRANSPORTS = ('redis', )
+
     def __init__(
         self,
         screenings_repository: ScreeningsRepository,
@@ -33,15 +44,30 @@ class ScreeningScheduler:
             log.warning('Screening ID <%s> not completed', screening.id)
             return
 
-        self.screenings_history_creator.create(screening_id)
-        self._set_screening_scheduled(screening)
-
         log.info(
             'Scheduling screening: %s',
             screening_id
         )
-        for task in self.check_tasks_registry.values():
-            task.apply_async((screening_id, ))
+        self._schedule([screening_id], priority=self.INTERACTIVE_PRIORITY)
+
+    def schedule_many(self, screening_ids: List[int]) -> List[int]:
+        """
+        Schedule completed screenings from the given ones.
+
+        Scheduled status is set with one set-based update for all screenings.
+
+        Returns:
+            IDs of the scheduled screenings
+        """
+        scheduled_ids = self._schedule(
+            screening_ids, priority=self.BULK_PRIORITY)
+
+        log.info(
+            'Scheduled screenings: %s',
+            len(scheduled_ids)
+        )
+
+        return scheduled_ids
 
     def schedule_on_signal(
             self, sender: ScreeningsCreator, instance: Screening):
@@ -50,12 +76,70 @@ class ScreeningScheduler:
     def _get_screening(self, screening_id: int) -> Screening:
         return self.screenings_repository.get(id=screening_id)
 
-    def _set_screening_scheduled(self, screening: Screening) -> None:
-        status = Status.SCHEDULED
+    def _schedule(
+            self, screening_ids: List[int], priority: int = None,
+    ) -> List[int]:
+        # history and scheduled status are written in one transaction
+        session = self.screenings_repository.get_session()
+        session.begin()
+        try:
+            self.screenings_history_creator.create_many(
+                screening_ids, session=session)
+            scheduled_ids = self._set_screenings_scheduled(
+                screening_ids, session=session)
+        except Exception:
+            session.rollback()
+            raise
+        else:
+            session.commit()
+
+        self._schedule_checks(scheduled_ids, priority=priority)
 
-        self.screenings_repository.update(
-            screening.id,
+        return scheduled_ids
+
+    def _schedule_checks(
+            self, screening_ids: List[int], priority: int = None,
+    ) -> None:
+        # cheaper checks first, routed to their cost class queue
+        tasks = self.check_tasks_registry.get_tasks()
+        if not tasks or not screening_ids:
+            return
+
+        # publish all check tasks through one producer (broker connection)
+        with tasks[0].app.producer_or_acquire() as producer:
+            priority = self._get_transport_priority(producer, priority)
+            for screening_id in screening_ids:
+                for task in tasks:
+                    task.apply_async(
+                        (screening_id, ), producer=producer,
+                        priority=priority,
+                    )
+
+    def _get_transport_priority(self, producer, priority: int = None):
+        if priority is None:
+            return None
+
+        driver_type = producer.connection.transport.driver_type
+        if driver_type in self.INVERTED_PRIORITY_TRANSPORTS:
+            return self.MAX_PRIORITY - priority
+
+        return priority
+
+    def _set_screenings_scheduled(
+            self, screening_ids: List[int], session: Session = None,
+    ) -> List[int]:
+        data = self._get_scheduled_data()
+        completed_statuses = [status for status in Status if status.completed]
+
+        return self.screenings_repository.update_many(
+            screening_ids, statuses=completed_statuses,
+            status=Status.SCHEDULED, session=session, **data
+        )
+
+    def _get_scheduled_data(self) -> dict:
+        status = Status.SCHEDULED
 
+        return dict(
             ship_registered_owner_company_status=status,
             ship_operator_company_status=status,
             ship_beneficial_owner_company_status=status,
@@ -1,6 +1,10 @@
 """Screening workers screenings bulk tasks module"""
+from datetime import datetime
+from typing import Iterator, List
+
 from celery import Task
 
+from screening_api.screenings.enums import Status
 from screening_api.screenings.repositories import ScreeningsRepository
 
 from screening_workers.screenings.killers import ScreeningKiller
@@ -38,21 +42,24 @@ class ScreeningsBulkScreenTask(Task):
             screenings_repository: ScreeningsRepository,
             screening_scheduler: ScreeningScheduler,
             task_time_limit=None,
-            soft_time_limit=None
+            soft_time_limit=None,
+            batch_size=500,
     ):
         self.screenings_repository = screenings_repository
         self.screening_scheduler = screening_scheduler
         self.time_limit = task_time_limit
         self.soft_time_limit = soft_time_limit
+        self.batch_size = batch_size
 
     def run(self, *args, **kwargs):
-        screenings = self._find_screenings()
+        for screening_ids in self._find_screening_ids():
+            self.screening_scheduler.schedule_many(screening_ids)
 
-        for screening in screenings:
-            self.screening_scheduler.schedule(screening.id)
+    def _find_screening_ids(self) -> Iterator[List[int]]:
+        completed_statuses = [status for status in Status if status.completed]
 
-    def _find_screenings(self):
-        return self.screenings_repository.find()
+        return self.screenings_repository.find_ids(
+            batch_size=self.batch_size, statuses=completed_statuses)
 
 
 class ScreeningsBulkScreenKillerTask(Task):
@@ -62,15 +69,26 @@ class ScreeningsBulkScreenKillerTask(Task):
     def __init__(
             self,
             screenings_repository: ScreeningsRepository,
-            screening_killer: ScreeningKiller):
+            screening_killer: ScreeningKiller,
+            batch_size=500):
         self.screenings_repository = screenings_repository
         self.screening_killer = screening_killer
+        self.batch_size = batch_size
 
     def run(self, *args, **kwargs):
-        screenings = self._find_screenings()
-
-        for screening in screenings:
-            self.screening_killer.kill(screening.id)
-
-    def _find_screenings(self):
-        return self.screenings_repository.find()
+        for screening_ids in self._find_screening_ids():
+            for screening_id in screening_ids:
+                self.screening_killer.kill(screening_id)
+
+    def _find_screening_ids(self) -> Iterator[List[int]]:
+        # only not completed screenings not updated for a while
+        # can be killed
+        running_statuses = [
+            status for status in Status if not status.completed]
+        updated_treshold = datetime.utcnow() -\
+            self.screening_killer.UPDATED_TRESHOLD_TIMEDELTA
+
+        return self.screenings_repository.find_ids(
+            batch_size=self.batch_size, statuses=running_statuses,
+            updated__lte=updated_treshold,
+        )
@@ -39,14 +39,32 @@ class ScreeningsHistoryCreator:
             screening_id
         )
 
+    def create_many(self, screening_ids, session=None):
+        screenings = self._find_screenings(screening_ids, session=session)
+
+        for screening in screenings:
+            report = self._get_screening_report(
+                screening.id, session=session)
+
+            self._create_screening_history(screening, report, session=session)
+
+        log.info(
+            'Created screenings history <%s>',
+            len(screenings)
+        )
+
     def _get_screening(self, screening_id):
         return self.screenings_repository.get(id=screening_id)
 
-    def _get_screening_report(self, screening_id):
+    def _find_screenings(self, screening_ids, session=None):
+        return self.screenings_repository.find(
+            id__in=screening_ids, status=Status.DONE, session=session)
+
+    def _get_screening_report(self, screening_id, session=None):
         return self.screenings_reports_repository.get_or_none(
-            screening_id=screening_id)
+            screening_id=screening_id, session=session)
 
-    def _create_screening_history(self, screening, report):
+    def _create_screening_history(self, screening, report, session=None):
         reports = {}
         severities = {
             'ship_registered_owner_company_severity':
@@ -107,5 +125,9 @@ class ScreeningsHistoryCreator:
                 'port_visits': report.port_visits,
                 'zone_visits': report.zone_visits,
             }
+        # report sections unchanged since previous screenings are not
+        # copied, history references them by content hash
         return self.screenings_history_repository.create(
-            screening.id, screening.updated, **severities, **reports)
+            screening.id, screening.updated, reports=reports, **severities,
+            session=session,
+        )
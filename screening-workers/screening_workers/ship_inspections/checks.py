@@ -1,11 +1,15 @@
 """Screening Workers ship inspections checks module"""
+from datetime import datetime
+
 from screening_api.screenings_reports.repositories import (
     ScreeningsReportsRepository,
+    ScreeningsReportsFingerprintsRepository as FingerprintsRepository,
 )
 from screening_api.screenings.models import Screening
 from screening_api.screenings.repositories import ScreeningsRepository
 
 from screening_workers.lib.screening.checks import ReportCheck
+from screening_workers.lib.screening.fingerprints import get_models_data
 from screening_workers.lib.screening.providers import DataProvider
 from screening_workers.lib.sis_api.cache.collections import (
     ShipInspectionsCollection,
@@ -29,9 +33,12 @@ class ShipInspectionsCheck(ReportCheck):
             screenings_repository: ScreeningsRepository,
             screenings_reports_repository: ScreeningsReportsRepository,
             ship_inspections_collection: ShipInspectionsCollection,
+            fingerprints_repository: FingerprintsRepository = None,
     ):
         super(ShipInspectionsCheck, self).__init__(
-            screenings_repository, screenings_reports_repository)
+            screenings_repository, screenings_reports_repository,
+            fingerprints_repository,
+        )
         self.ship_inspections_collection = ship_inspections_collection
 
     def get_data_provider(self, screening: Screening) -> DataProvider:
@@ -54,6 +61,14 @@ class ShipInspectionsCheck(ReportCheck):
             data_provider.screening_profile,
         ).make_report(data_provider)
 
+    def get_fingerprint_data(self, data_provider: DataProvider) -> dict:
+        return {
+            # detention periods are counted back from the current date
+            'date': datetime.utcnow().date(),
+            'inspections': get_models_data(data_provider.inspections),
+            'critical_authorities': data_provider.critical_authorities,
+        }
+
     def _find_inspections(self, ship_id: int):
         return self.ship_inspections_collection.query(ship_id)
 
@@ -1,7 +1,6 @@
 """Screening Workers ship movement checks module"""
 from datetime import datetime, timedelta
 import logging
-import concurrent.futures
 
 from screening_workers.lib.utils import str2date, \
     json_logger, DATE_FORMAT, date2str
@@ -15,7 +14,10 @@ from screening_api.screenings.repositories import ScreeningsRepository
 from screening_workers.lib.screening.checks import BaseCheck
 from screening_workers.ship_movements.ihs_position import IHSPositionLogic
 
-from screening_workers.lib.blacklist import get_port_country_severity
+from screening_workers.lib.geoserver_api.zones import ZoneIndex, ZonesCache
+from screening_workers.lib.blacklist import (
+    BlacklistedPorts, get_port_country_severity,
+)
 from screening_workers.lib.sis_api.collections import (
     ShipsCollection, IhsMovementCollection,
 )
@@ -42,34 +44,24 @@ def _get_ports_from_positions(blacklisted_ports, positions) -> list:
             # longitude.
             continue
 
-        if position['port']['port_code'] != '0':
-            closest_port = position['port']
-        else:
+        closest_port = position['port']
+        if closest_port['port_code'] == '0':
             closest_port = None
 
-        if closest_port and not last_port:
-            bl_port = get_port_country_severity(
-                blacklisted_ports,
-                closest_port['port_name'],
-                closest_port['port_country_name'])
-            last_port = {
-                'port': closest_port,
-                'entered': position['timestamp'],
-                'departed': position.get('sail_date_full'),
-                'severity': bl_port.get('severity'),
-                'category': bl_port.get('category')
-            }
-            port_visits.append(last_port)
-
-        elif closest_port and \
-                last_port and \
-                last_port['port'] != closest_port:
+        if last_port and last_port['port'] != closest_port:
             # If we haven't picked up ``departed`` from IHS's
             # ``sail_date_full`` then set ``departed`` to
             # ``position.timestamp``
             if last_port['departed'] is None:
                 last_port['departed'] = position['timestamp']
 
+            # Create a new ``last_port`` dictionary.
+            last_port = {}
+
+        if not closest_port:
+            continue
+
+        if not last_port:
             bl_port = get_port_country_severity(
                 blacklisted_ports,
                 closest_port['port_name'],
@@ -83,22 +75,8 @@ def _get_ports_from_positions(blacklisted_ports, positions) -> list:
             }
             port_visits.append(last_port)
 
-        elif closest_port and \
-                last_port and \
-                last_port['port'] == closest_port and \
-                position.get('sail_date_full') is not None:
-            departed = position.get('sail_date_full')
-            last_port['departed'] = departed
-
-        elif not closest_port and last_port:
-            # If we haven't picked up ``departed`` from IHS's
-            # ``sail_date_full`` then set ``departed`` to
-            # ``position.timestamp``
-            if last_port['departed'] is None:
-                last_port['departed'] = position['timestamp']
-
-            # Create a new ``last_port`` dictionary.
-            last_port = {}
+        elif position.get('sail_date_full') is not None:
+            last_port['departed'] = position['sail_date_full']
 
     return port_visits
 
@@ -112,12 +90,13 @@ class ShipMovementsCheck(BaseCheck):
             screenings_reports_repository: ScreeningsReportsRepository,
             ship_movements_repository,
             ships_repository,
-            blacklisted_ports,
+            blacklisted_ports: BlacklistedPorts,
             sis_client,
             config,
             smh_client,
             ais_client,
-            portservice_client, log_level='INFO'
+            portservice_client, log_level='INFO',
+            port_visits_comparison_task=None,
     ):
         super(ShipMovementsCheck, self).__init__(
             screenings_repository, )
@@ -129,6 +108,7 @@ class ShipMovementsCheck(BaseCheck):
         self.smh_client = smh_client
         self.ais_client = ais_client
         self.portservice_client = portservice_client
+        self.port_visits_comparison_task = port_visits_comparison_task
         self.logger = json_logger(__name__, level=log_level)
         self.imo_id = None
         self.screening = None
@@ -143,6 +123,53 @@ class ShipMovementsCheck(BaseCheck):
         ports, elp = self.portservice_client.get_ports(track)
         return ports
 
+    def _filter_track(self, track, start_date, stop_date):
+        """ Message rate, date range and speed filtering of AIS positions.
+
+        Each position timestamp is parsed once, in a single pass over the
+        track (latest position first).
+
+        Args:
+            track (iterable): AIS positions.
+            start_date (datetime): Latest position date.
+            stop_date (datetime): Earliest position date.
+
+        Returns:
+            tuple of filtered positions timestamps and positions lists, and
+            the track size.
+        """
+        rate = self.DEFAULT_AIS_REPORTING_MINUTES * 60
+        # no filtering if disable
+        max_speed = self.VOYAGE_STOPPED_SPEED
+        if max_speed >= 99:
+            max_speed = None
+
+        timestamps = []
+        positions = []
+        track_size = 0
+        latest_ts = None  # latest AIS position
+        for pos in track:
+            track_size += 1
+            ts = str2date(pos.get('timestamp'))
+            if latest_ts is None:
+                latest_ts = ts
+
+            # message rate adjustment
+            if (latest_ts - ts).total_seconds() < rate or \
+                    not start_date >= ts >= stop_date:
+                continue
+            latest_ts = ts
+
+            # speed filtering
+            speed = pos['speed']
+            if max_speed is not None and speed and speed >= max_speed:
+                continue
+
+            timestamps.append(ts)
+            positions.append(pos)
+
+        return timestamps, positions, track_size
+
     def call_smh(self):
         """ Call SMH service using configuration parameters
         Args:
@@ -157,11 +184,20 @@ class ShipMovementsCheck(BaseCheck):
                self.config.get('USE_SMH_SERVICE_CACHE')
                )
         )
+        resp = self.smh_client.get_smh(self.imo_id, **self.get_smh_options())
+        return resp
+
+    def get_smh_options(self):
+        """ SMH service request options from configuration parameters
+        Args:
+
+        Returns:
+            dict of SMH service request parameters
+        """
         response_type = 0x07  # response with visits, positions and IHS data
         if self.USE_AIS_GAP_RATE > 0:
             response_type = 0x27  # include AIS reporting gap
-        resp = self.smh_client.get_smh(
-            self.imo_id,
+        return dict(
             end_date=self.DEFAULT_SHIP_MOVEMENT_DAYS,
             request_days=self.DEFAULT_SHIP_MOVEMENT_DAYS,
             overwrite_cache=1,
@@ -173,7 +209,22 @@ class ShipMovementsCheck(BaseCheck):
             use_cache=int(self.config.get('USE_SMH_SERVICE_CACHE', 1)),
             save_port_visits=0,
             external_id=self.screening.id)
-        return resp
+
+    def schedule_port_visits_comparison(self, visits, severity):
+        """ Send SMH service comparison with existing engine visits to its
+        own (low priority) queue.
+        Args:
+            visits (list): Port visits of the existing engine.
+            severity (Severity): Port visits severity.
+        """
+        if self.port_visits_comparison_task is None:
+            self.logger.warning("Port visits comparison not available")
+            return
+
+        port_codes = [visit.get('port_code') for visit in visits]
+        self.port_visits_comparison_task.apply_async((
+            self.imo_id, self.get_smh_options(), port_codes, severity.name,
+        ))
 
     def process_smh_request(self):
         """ Call SMH service using configuration parameters
@@ -186,34 +237,30 @@ class ShipMovementsCheck(BaseCheck):
         ais_track = []
         ihs_data = []
         response = {}
-        # Use the SMH service
-        if self.USE_SMH_SERVICE & 0x01:
-            # run in background
-            if self.USE_SMH_SERVICE & 0x02:
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    executor.submit(self.call_smh)
-            else:  # blocking call if Screening SMH is not required
-                try:
-                    response = self.call_smh()
-                    visits = response.get('visits', [])
-                    ais_track = response.get('positions', [])
-                    ihs_data = response.get('ihs_movement_data', [])
-                    error = response.get('metadata', []).get('error')
-                    # Add black listed port severity if any
-                    for visit in visits:
-                        bl_port = get_port_country_severity(
-                            self.blacklisted_ports,
-                            visit.get('port', {})['port_name'],
-                            visit.get('port', {})['port_country_name'])
-                        visit['port']['severity'] = bl_port.get('severity')
-                        visit['port']['category'] = bl_port.get('category')
-
-                except Exception as exc:
-                    error = 'Failed to get SMH results (%s): %s.' \
-                            % (self.screening, exc)
-
-                if error:
-                    self.logger.error(error)
+        # Use the SMH service, blocking call if Screening SMH is not required
+        # (otherwise compared with existing engine visits by a separate task)
+        if self.USE_SMH_SERVICE & 0x03 == 0x01:
+            try:
+                response = self.call_smh()
+                visits = response.get('visits', [])
+                ais_track = response.get('positions', [])
+                ihs_data = response.get('ihs_movement_data', [])
+                error = response.get('metadata', []).get('error')
+                # Add black listed port severity if any
+                for visit in visits:
+                    bl_port = get_port_country_severity(
+                        self.blacklisted_ports,
+                        visit.get('port', {})['port_name'],
+                        visit.get('port', {})['port_country_name'])
+                    visit['port']['severity'] = bl_port.get('severity')
+                    visit['port']['category'] = bl_port.get('category')
+
+            except Exception as exc:
+                error = 'Failed to get SMH results (%s): %s.' \
+                        % (self.screening, exc)
+
+            if error:
+                self.logger.error(error)
 
         self.logger.info(
             "SMH completed", imo_id=self.imo_id,
@@ -276,69 +323,43 @@ class ShipMovementsCheck(BaseCheck):
                 # backward compatible if ordering is not supported
                 ihs_data = ship_movement.query(imo_id=self.imo_id, limit=500)
 
-            # Filtering/dictionizing IHS movement data
-            ihs_positions = []
-            for pos in ihs_data:
-                if pos.entered > stop_date:
-                    ihs_positions.append(pos.position_dict())
-
-            # Get AIS positions
-            track = None
-            filtered = []
+            # Get AIS positions (timestamps and positions columns)
             if mmsi:
-                track = self.ais_client.get_all_track(
+                # positions are filtered while next track pages are fetched
+                track = self.ais_client.iter_track(
                     mmsi, position_count=500, stop_date=stop_date)
+                timestamps, positions, track_size = self._filter_track(
+                    track, start_date, stop_date)
 
-                if not track:
+                if not track_size:
                     log.warning("No AIS Positions found for MMSI %s", mmsi)
                     self.logger.info("No AIS Positions found", mmsi=mmsi)
-                    track = None
             else:
+                timestamps, positions = [], []
                 log.warning("No MMSI found for IMO %s", self.imo_id)
                 self.logger.info(
                     "No MMSI found", ship=screening.ship_id,
                     imo=str(self.imo_id))
 
-            if track:
-                # message rate adjustment
-                index = 1
-                miss = 0
-                latest = track[0]  # latest AIS position
-                filtered = []
-                latest_ts = str2date(latest.get('timestamp'))
-                for pos in track:
-                    ts = str2date(pos.get('timestamp'))
-                    diff = (latest_ts - ts).total_seconds()
-                    if diff >= self.DEFAULT_AIS_REPORTING_MINUTES * 60 and \
-                            start_date >= ts >= stop_date:
-                        filtered.append(pos)
-                        latest_ts = ts
-                    else:
-                        miss += 1
-
-                    index += 1
-
-                # speed filtering
-                if self.VOYAGE_STOPPED_SPEED < 99:  # no filtering if disable
-                    filtered = [pos for pos in filtered
-                                if not pos['speed'] or pos['speed'] <
-                                self.VOYAGE_STOPPED_SPEED]
+            # Filtering/dictionizing IHS movement data
+            for pos in ihs_data:
+                if pos.entered > stop_date:
+                    # same precision as position timestamp
+                    timestamps.append(pos.entered.replace(microsecond=0))
+                    positions.append(pos.position_dict())
 
             # Join AIS and IHS data and sort by timestamp
-            filtered.extend(ihs_positions)
-
-            positions = []
-            if len(filtered) > 0:
-                track = sorted(filtered, key=lambda post: post['timestamp'])
+            order = sorted(range(len(positions)), key=timestamps.__getitem__)
+            positions = [positions[index] for index in order]
 
+            if positions:
                 # get ports for all positions using port service
-                ports = self._get_ports(track)
+                ports = self._get_ports(positions)
 
                 # Attach port info to positions
-                for a, b in zip(track, ports):
-                    d = a.copy()
-                    d.update({'port': b})
-                    positions.append(d)
+                del positions[len(ports):]
+                for position, port in zip(positions, ports):
+                    position['port'] = port
 
             # finally compute port visits
             visits = _get_ports_from_positions(self.blacklisted_ports,
@@ -362,6 +383,9 @@ class ShipMovementsCheck(BaseCheck):
 
             port.update(p)
 
+        if self.USE_SMH_SERVICE & 0x03 == 0x03:
+            self.schedule_port_visits_comparison(visits, port_visits_severity)
+
         # Compute IHS movement data Severity
         ihs_check = IHSPositionLogic(
             self.portservice_client, self.blacklisted_ports,
@@ -410,6 +434,130 @@ class ShipMovementsCheck(BaseCheck):
 class ZoneVisitsCheck(BaseCheck):
     name = 'zone_visits'
 
+    ZONE_SEVERITIES = {
+        ZonesCache.SANCTION_ZONE: Severity.CRITICAL,
+        ZonesCache.WAR_ZONE: Severity.WARNING,
+        ZonesCache.CYCLONE: Severity.WARNING,
+    }
+    # the cyclones are the active ones, matched with recent positions only
+    ZONE_LOOKBACK_DAYS = {
+        ZonesCache.CYCLONE: 2,
+    }
+
+    def __init__(
+            self,
+            screenings_repository: ScreeningsRepository,
+            screenings_reports_repository: ScreeningsReportsRepository,
+            ais_client,
+            zones_cache: ZonesCache,
+            config, log_level='INFO',
+    ):
+        super(ZoneVisitsCheck, self).__init__(screenings_repository)
+        self.screenings_reports_repository = screenings_reports_repository
+        self.ais_client = ais_client
+        self.zones_cache = zones_cache
+        self.config = config
+        self.logger = json_logger(__name__, level=log_level)
+
     def process(self, screening: Screening) -> Severity:
-        # @todo: implement
-        return Severity.OK
+        if self.zones_cache is None:
+            self.logger.warning("Zone index not available")
+            return Severity.OK
+
+        days = int(self.config.get('DEFAULT_SHIP_MOVEMENT_DAYS', 365))
+        stop_date = datetime.utcnow() - timedelta(days=days)
+
+        # zones are tested in process for every position of the track
+        zone_index = self.zones_cache.get_index()
+        mmsi = screening.ship.mmsi
+        if mmsi:
+            track = self.ais_client.iter_track(
+                mmsi, position_count=500, stop_date=stop_date)
+            visits = self._get_zone_visits(zone_index, track, stop_date)
+        else:
+            visits = []
+            self.logger.info("No MMSI found", ship=screening.ship_id)
+
+        zone_visits_severity = Severity.OK
+        for visit in visits:
+            severity = visit['severity']
+            zone_visits_severity = max(zone_visits_severity, severity)
+            visit['severity'] = severity.name
+
+        self.logger.info(
+            "Zone visits computed", ship=screening.ship_id, mmsi=mmsi,
+            zones=len(zone_index), count_visits=len(visits),
+            severity=zone_visits_severity)
+
+        session = self.screenings_reports_repository.get_session()
+        report, _ = self.screenings_reports_repository.get_or_create(
+            screening_id=screening.id,
+            create_kwargs={self.name: {}, },
+            session=session
+        )
+        data = {self.name: {"zone_visits": visits}}
+        self.screenings_reports_repository.update(
+            report, **data, session=session)
+
+        return zone_visits_severity
+
+    def _get_zone_visits(
+            self, zone_index: ZoneIndex, track, stop_date) -> list:
+        """ Get the list of zone visits from AIS positions.
+
+        Args:
+            zone_index (ZoneIndex): Zones to look up the positions in.
+            track (iterable): AIS positions, latest first.
+            stop_date (datetime): Earliest position date, later for the
+                zone types with a lookback (ZONE_LOOKBACK_DAYS).
+
+        Returns:
+            list: List of dicts containing zone visits, latest first.
+        """
+        now = datetime.utcnow()
+        zone_stop_dates = {
+            zone_type: max(stop_date, now - timedelta(days=days))
+            for zone_type, days in self.ZONE_LOOKBACK_DAYS.items()
+        }
+
+        visits = []
+        current_visits = {}  # zone id: visit (zones the ship is in)
+        departed = None  # date of the next (later) position
+        # zones are entered/departed going back in time from latest position
+        for position in track:
+            timestamp = str2date(position.get('timestamp'))
+            if timestamp < stop_date:
+                break
+            if position['latitude'] is None or \
+                    position['longitude'] is None:
+                continue
+
+            date = date2str(timestamp)
+            zones = [
+                zone for zone in zone_index.query(
+                    float(position['longitude']), float(position['latitude']))
+                if timestamp >= zone_stop_dates.get(zone.type, stop_date)
+            ]
+            zone_ids = set(zone.id for zone in zones)
+            for zone_id in list(current_visits):
+                if zone_id not in zone_ids:
+                    del current_visits[zone_id]
+
+            for zone in zones:
+                visit = current_visits.get(zone.id)
+                if visit is None:
+                    visit = {
+                        'zone_name': zone.name,
+                        'zone_type': zone.type,
+                        'entered': None,
+                        'departed': departed,
+                        'severity': self.ZONE_SEVERITIES[zone.type],
+                    }
+                    current_visits[zone.id] = visit
+                    visits.append(visit)
+                visit['entered'] = date
+            departed = date
+
+        # latest visit first
+        visits.sort(key=lambda visit: visit['entered'], reverse=True)
+        return visits
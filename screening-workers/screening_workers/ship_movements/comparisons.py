@@ -0,0 +1,90 @@
+"""Screening Workers ship movement engines comparisons module"""
+import time
+
+from screening_workers.lib.blacklist import get_port_country_severity
+from screening_workers.lib.metrics.enums import MetricsEvent
+from screening_workers.lib.metrics.publishers import MetricsPublisher
+from screening_workers.lib.smh_api.smh_client import SMHClient
+from screening_workers.lib.utils import json_logger
+
+from screening_api.screenings.enums import Severity
+
+
+class PortVisitsComparison:
+    """
+    Compares port visits of the existing engine with the SMH service ones.
+
+    Runs out of band of the ship movements check (own task) so the SMH
+    call doesn't add to the check time.
+    """
+
+    def __init__(
+            self,
+            smh_client: SMHClient,
+            blacklisted_ports,
+            metrics_publisher: MetricsPublisher = None,
+            metrics_namespace: str = '',
+            log_level='INFO',
+    ):
+        self.smh_client = smh_client
+        self.blacklisted_ports = blacklisted_ports
+        self.metrics_publisher = metrics_publisher
+        self.metrics_namespace = metrics_namespace
+        self.logger = json_logger(__name__, level=log_level)
+
+    def compare(
+            self, imo_id: int, smh_options: dict, port_codes: list,
+            severity: str) -> dict:
+        start = time.monotonic()
+        response = self.smh_client.get_smh(imo_id, **smh_options)
+        elapsed = time.monotonic() - start
+
+        smh_port_codes = []
+        smh_severity = Severity.OK
+        for visit in response.get('visits', []):
+            port = visit.get('port', {})
+            smh_port_codes.append(port.get('port_code'))
+            bl_port = get_port_country_severity(
+                self.blacklisted_ports,
+                port.get('port_name'),
+                port.get('port_country_name'))
+            smh_severity = max(
+                smh_severity, bl_port.get('severity') or Severity.OK)
+
+        result = {
+            'imo_id': imo_id,
+            'visits': len(port_codes),
+            'smh_visits': len(smh_port_codes),
+            'missing_ports': len(set(port_codes) - set(smh_port_codes)),
+            'extra_ports': len(set(smh_port_codes) - set(port_codes)),
+            'severity': severity,
+            'smh_severity': smh_severity.name,
+            'smh_elapsed': elapsed,
+        }
+        result['match'] = port_codes == smh_port_codes and \
+            severity == smh_severity.name
+
+        self.logger.info("Port visits engines compared", **result)
+        self._publish(result, elapsed)
+
+        return result
+
+    def _publish(self, result: dict, elapsed: float) -> None:
+        if self.metrics_publisher is None:
+            return
+
+        event = MetricsEvent.PORT_VISITS_COMPARISON
+        name = event.value
+        if self.metrics_namespace:
+            name = f'{self.metrics_namespace}.{event.value}'
+        dimensions = {
+            'Application': 'screening',
+            'Component': 'workers',
+            'Match': str(result['match']),
+            'SeverityMatch': str(
+                result['severity'] == result['smh_severity']),
+        }
+        self.metrics_publisher.increase(name, dimensions=dimensions)
+        self.metrics_publisher.time(
+            f'{name}.SMHTime', elapsed * 1000, dimensions=dimensions)
+        self.metrics_publisher.flush()
@@ -1,3 +1,5 @@
+import concurrent.futures
+
 from screening_workers.lib.utils import json_logger
 
 from screening_workers.lib.blacklist import (
@@ -11,6 +13,8 @@ from screening_workers.lib.sis_api.collections import IhsMovementCollection
 
 class IHSPositionLogic:
 
+    PREFETCH_MAX_WORKERS = 4
+
     def __init__(self, portservice_client, blacklisted_ports,
                  smh_client=None, convert_ihs_data=False,
                  log_level='INFO'):
@@ -19,6 +23,8 @@ class IHSPositionLogic:
         self.smh_client = smh_client
         self.convert_ihs_data = convert_ihs_data
         self.logger = json_logger(__name__, level=log_level)
+        self._port_data = {}
+        self._severities = {}
 
     def _get_port_data(self, field, value):
         if self.smh_client:
@@ -30,6 +36,60 @@ class IHSPositionLogic:
 
         return self.portservice_client.get_port_data(field, value)
 
+    def _get_cached_port_data(self, field, value):
+        key = (field, value)
+        if key not in self._port_data:
+            self._port_data[key] = self._get_port_data(field, value)
+
+        return self._port_data[key]
+
+    def _prefetch_port_data(self, positions):
+        """ Fetch the distinct ports referenced by the positions at once.
+
+        Args:
+            positions (list): IHS positions to be processed.
+        """
+        lookups = set()
+        for position in positions:
+            lookups.update(self._get_position_lookups(position))
+
+        lookups = [key for key in lookups if key not in self._port_data]
+        if not lookups:
+            return
+
+        max_workers = min(self.PREFETCH_MAX_WORKERS, len(lookups))
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            futures = {
+                key: executor.submit(self._get_port_data, *key)
+                for key in lookups
+            }
+
+        for key, future in futures.items():
+            self._port_data[key] = future.result()
+
+    def _get_position_lookups(self, position):
+        """ Port data lookups done by the position severities. """
+        lookups = []
+        if position.port_name != '' or position.country_name != '':
+            if position.ihs_port_id is not None:
+                lookups.append(('ihs_port_id', position.ihs_port_id))
+            if position.port_name:
+                lookups.append(('port_name', position.port_name))
+
+        if position.last_port_of_call_name:
+            lookups.append(('port_name', position.last_port_of_call_name))
+        if position.last_port_of_call_country_code:
+            lookups.extend([
+                ('iso_3166_1_alpha_2',
+                 position.last_port_of_call_country_code),
+                ('country_code', position.last_port_of_call_country_code),
+            ])
+
+        if position.destination_port:
+            lookups.append(('port_name', position.destination_port))
+
+        return lookups
+
     def process_ihs_positions(self, ihs_positions, stop_date=None):
         self.logger.info('Starting to process IHS positions')
 
@@ -41,51 +101,59 @@ class IHSPositionLogic:
         overall_severity = Severity.OK
         ihs_movement_data = []
 
+        # ports and severities are memoized for this run only
+        self._port_data = {}
+        self._severities = {}
+
+        ihs_positions = [
+            position for position in ihs_positions
+            if stop_date is None or position.entered > stop_date
+        ]
+        self._prefetch_port_data(ihs_positions)
+
         for position in ihs_positions:
-            if stop_date is None or position.entered > stop_date:
-
-                # if port and country is empty then return movement_type
-                if position.port_name == '' and position.country_name == '':
-                    position.port_name = position.movement_type
-                    position.country_name = position.movement_type
-                    port_severity = Severity.OK
-                else:
-                    # Get current position port severity.
-                    port_severity = self.get_position_severity(
-                        ihs_port_id=position.ihs_port_id,
-                        port_name=position.port_name,
-                        country_name=position.country_name,
-                    )
-
-                # Get current position's previous port severity.
-                previous_port_severity = self.get_position_severity(
-                    port_name=position.last_port_of_call_name,
-                    country_code=position.last_port_of_call_country_code,
-                    country_name=position.last_port_of_call_country,
+            # if port and country is empty then return movement_type
+            if position.port_name == '' and position.country_name == '':
+                position.port_name = position.movement_type
+                position.country_name = position.movement_type
+                port_severity = Severity.OK
+            else:
+                # Get current position port severity.
+                port_severity = self.get_position_severity(
+                    ihs_port_id=position.ihs_port_id,
+                    port_name=position.port_name,
+                    country_name=position.country_name,
                 )
 
-                # Get current position's destination port severity.
-                destination_port_severity = self.get_position_severity(
-                    port_name=position.destination_port,
-                    country_code=None,
-                )
+            # Get current position's previous port severity.
+            previous_port_severity = self.get_position_severity(
+                port_name=position.last_port_of_call_name,
+                country_code=position.last_port_of_call_country_code,
+                country_name=position.last_port_of_call_country,
+            )
+
+            # Get current position's destination port severity.
+            destination_port_severity = self.get_position_severity(
+                port_name=position.destination_port,
+                country_code=None,
+            )
 
-                ihs_movement = position.ihs_movement_dict()
-                # adding severity for each record
-                ihs_movement['port_severity'] = str(port_severity.name)
-                ihs_movement['last_port_of_call_severity'] = \
-                    str(previous_port_severity.name)
-                ihs_movement['destination_port_severity'] = \
-                    str(destination_port_severity.name)
+            ihs_movement = position.ihs_movement_dict()
+            # adding severity for each record
+            ihs_movement['port_severity'] = str(port_severity.name)
+            ihs_movement['last_port_of_call_severity'] = \
+                str(previous_port_severity.name)
+            ihs_movement['destination_port_severity'] = \
+                str(destination_port_severity.name)
 
-                ihs_movement_data.append(ihs_movement)
+            ihs_movement_data.append(ihs_movement)
 
-                overall_severity = max([
-                    overall_severity,
-                    port_severity,
-                    previous_port_severity,
-                    destination_port_severity,
-                ])
+            overall_severity = max([
+                overall_severity,
+                port_severity,
+                previous_port_severity,
+                destination_port_severity,
+            ])
 
         return overall_severity, ihs_movement_data
 
@@ -136,7 +204,24 @@ class IHSPositionLogic:
             Severity: The severity of the position's
                 port information (previous, current, destination).
         """
+        key = (ihs_port_id, port_name, country_name, country_code)
+        if key not in self._severities:
+            self._severities[key] = self._get_position_severity(
+                ihs_port_id=ihs_port_id,
+                port_name=port_name,
+                country_name=country_name,
+                country_code=country_code,
+            )
+
+        return self._severities[key]
 
+    def _get_position_severity(
+        self,
+        ihs_port_id=None,
+        port_name=None,
+        country_name=None,
+        country_code=None,
+    ):
         severities = list()
         severities.extend(self._get_port_specific_severities_by_ihs_port_id(
             ihs_port_id
@@ -180,7 +265,7 @@ class IHSPositionLogic:
         """
         severities = list()
         if ihs_port_id is not None:
-            port = self._get_port_data('ihs_port_id', ihs_port_id)
+            port = self._get_cached_port_data('ihs_port_id', ihs_port_id)
             if port:
                 bl_port = get_port_country_severity(self.blacklisted_ports,
                                                     port['port_name'],
@@ -210,7 +295,7 @@ class IHSPositionLogic:
         if not port_name:
             return severities
 
-        port = self._get_port_data('port_name', port_name)
+        port = self._get_cached_port_data('port_name', port_name)
         if port:
             bl_port = get_port_country_severity(self.blacklisted_ports,
                                                 port['port_name'],
@@ -294,7 +379,7 @@ class IHSPositionLogic:
             return severities
 
         # 2 letter country code
-        country = self._get_port_data(
+        country = self._get_cached_port_data(
             'iso_3166_1_alpha_2', country_code
         )
         if country:
@@ -305,7 +390,7 @@ class IHSPositionLogic:
             severities.append(bl_port.get('severity') or Severity.OK)
 
         # 3 letter country code
-        country = self._get_port_data(
+        country = self._get_cached_port_data(
             'country_code', country_code
         )
         if country:
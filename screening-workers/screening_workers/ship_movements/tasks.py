@@ -1,4 +1,7 @@
+from celery import Task
+
 from screening_workers.lib.screening.tasks import CheckTask
+from screening_workers.ship_movements.comparisons import PortVisitsComparison
 
 
 class ShipMovementsCheckTask(CheckTask):
@@ -9,3 +12,18 @@ class ShipMovementsCheckTask(CheckTask):
 class ZoneVisitsCheckTask(CheckTask):
 
     name = 'screening.ship_movements.zone_visits_check'
+
+
+class PortVisitsComparisonTask(Task):
+
+    name = 'screening.ship_movements.port_visits_comparison'
+    ignore_result = True
+
+    def __init__(self, comparison: PortVisitsComparison):
+        self.comparison = comparison
+
+    def run(
+            self, imo_id: int, smh_options: dict, port_codes: list,
+            severity: str, *args, **kwargs):
+        return self.comparison.compare(
+            imo_id, smh_options, port_codes, severity)
@@ -3,6 +3,7 @@ from typing import List
 
 from screening_api.screenings_reports.repositories import (
     ScreeningsReportsRepository,
+    ScreeningsReportsFingerprintsRepository as FingerprintsRepository,
 )
 from screening_api.screenings.enums import Severity
 from screening_api.screenings.models import Screening
@@ -10,6 +11,7 @@ from screening_api.screenings.repositories import ScreeningsRepository
 from screening_api.ship_sanctions.models import ShipSanction
 
 from screening_workers.lib.screening.checks import BaseCheck, ReportCheck
+from screening_workers.lib.screening.fingerprints import get_models_data
 from screening_workers.lib.screening.providers import DataProvider
 from screening_workers.lib.compliance_api.cache.collections import (
     ShipSanctionsCollection,
@@ -38,9 +40,12 @@ class ShipSanctionCheck(ReportCheck):
             screenings_repository: ScreeningsRepository,
             screenings_reports_repository: ScreeningsReportsRepository,
             ship_sanctions_collection: ShipSanctionsCollection,
+            fingerprints_repository: FingerprintsRepository = None,
     ):
         super(ShipSanctionCheck, self).__init__(
-            screenings_repository, screenings_reports_repository)
+            screenings_repository, screenings_reports_repository,
+            fingerprints_repository,
+        )
         self.ship_sanctions_collection = ship_sanctions_collection
 
     def get_data_provider(self, screening: Screening) -> DataProvider:
@@ -60,6 +65,9 @@ class ShipSanctionCheck(ReportCheck):
             data_provider.screening_profile,
         ).make_report(data_provider)
 
+    def get_fingerprint_data(self, data_provider: DataProvider) -> dict:
+        return {'sanctions': get_models_data(data_provider.sanctions)}
+
     def _find_sanctions(
             self, ship_id: int, blacklisted_sanction_list_id: int = None,
     ) -> List[ShipSanction]:
@@ -1,4 +1,5 @@
 import json
+from unittest.mock import ANY
 
 import pytest
 import responses
@@ -7,8 +8,14 @@ from sqlalchemy.orm.exc import NoResultFound
 from screening_api.screenings.enums import Severity, Status
 from screening_api.screenings_bulk.enums import BulkScreeningStatus
 
+from screening_workers.screenings.schedulers import ScreeningScheduler
 from screening_workers.screenings_bulk.tasks import BulkScreeningValidationTask
 
+PUBLISH_OPTIONS = {
+    'producer': ANY,
+    'priority': ScreeningScheduler.INTERACTIVE_PRIORITY,
+}
+
 
 class TestBulkScreeningValidationTask:
 
@@ -219,33 +226,43 @@ class TestBulkScreeningValidationTask:
         assert screening.ship_id == ship.id
 
         args = (screening.id, )
-        check_tasks_mock.doc_company_task.assert_called_once_with(args)
+        check_tasks_mock.doc_company_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_technical_manager_task.assert_called_once_with(
-            args)
-        check_tasks_mock.ship_manager_task.assert_called_once_with(args)
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_manager_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_beneficial_owner_task.assert_called_once_with(
-            args)
-        check_tasks_mock.ship_operator_task.assert_called_once_with(args)
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_operator_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_registered_owner_task.assert_called_once_with(
-            args)
-        check_tasks_mock.ship_flag_task.assert_called_once_with(args)
-        check_tasks_mock.ship_flag_task.assert_called_once_with(args)
-        check_tasks_mock.ship_association_task.assert_called_once_with(args)
-        check_tasks_mock.ship_sanction_task.assert_called_once_with(args)
-        check_tasks_mock.port_visits_task.assert_called_once_with(args)
-        check_tasks_mock.zone_visits_task.assert_called_once_with(args)
-        check_tasks_mock.ship_inspections_task.assert_called_once_with(args)
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_flag_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_flag_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_association_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_sanction_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.port_visits_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.zone_visits_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_inspections_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
 
         check_tasks_mock.ship_reg_owner_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_operator_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_beneficial_owner_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_manager_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_technical_manager_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
 
     def test_existing_screening(
             self, task, factory, application, check_tasks_mock, sis_client):
@@ -375,35 +392,45 @@ class TestBulkScreeningValidationTask:
         assert screening.ship_id == ship.id
 
         args = (screening.id, )
-        check_tasks_mock.doc_company_task.assert_called_once_with(args)
+        check_tasks_mock.doc_company_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_technical_manager_task.assert_called_once_with(
-            args)
-        check_tasks_mock.ship_manager_task.assert_called_once_with(args)
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_manager_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_beneficial_owner_task.assert_called_once_with(
-            args)
-        check_tasks_mock.ship_operator_task.assert_called_once_with(args)
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_operator_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_registered_owner_task.assert_called_once_with(
-            args)
-        check_tasks_mock.ship_flag_task.assert_called_once_with(args)
-        check_tasks_mock.ship_flag_task.assert_called_once_with(args)
-        check_tasks_mock.ship_association_task.assert_called_once_with(args)
-        check_tasks_mock.ship_sanction_task.assert_called_once_with(args)
-        check_tasks_mock.port_visits_task.assert_called_once_with(args)
-        check_tasks_mock.zone_visits_task.assert_called_once_with(args)
-        check_tasks_mock.ship_inspections_task.assert_called_once_with(args)
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_flag_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_flag_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_association_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_sanction_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.port_visits_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.zone_visits_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_inspections_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
 
         check_tasks_mock.ship_reg_owner_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_operator_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_beneficial_owner_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_manager_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_technical_manager_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_company_associates_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
 
         history = application.screenings_history_repository.get_or_none(
             screening_id=screening.id)
@@ -708,33 +735,43 @@ class TestBulkScreeningValidationTask:
         assert screening.ship_id == ship.id
 
         args = (screening.id, )
-        check_tasks_mock.doc_company_task.assert_called_once_with(args)
+        check_tasks_mock.doc_company_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_technical_manager_task.assert_called_once_with(
-            args)
-        check_tasks_mock.ship_manager_task.assert_called_once_with(args)
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_manager_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_beneficial_owner_task.assert_called_once_with(
-            args)
-        check_tasks_mock.ship_operator_task.assert_called_once_with(args)
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_operator_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_registered_owner_task.assert_called_once_with(
-            args)
-        check_tasks_mock.ship_flag_task.assert_called_once_with(args)
-        check_tasks_mock.ship_flag_task.assert_called_once_with(args)
-        check_tasks_mock.ship_association_task.assert_called_once_with(args)
-        check_tasks_mock.ship_sanction_task.assert_called_once_with(args)
-        check_tasks_mock.port_visits_task.assert_called_once_with(args)
-        check_tasks_mock.zone_visits_task.assert_called_once_with(args)
-        check_tasks_mock.ship_inspections_task.assert_called_once_with(args)
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_flag_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_flag_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_association_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_sanction_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.port_visits_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.zone_visits_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_inspections_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
 
         check_tasks_mock.ship_reg_owner_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_operator_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_beneficial_owner_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_manager_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_technical_manager_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
 
     @responses.activate
     def test_new_ship_non_ascii_name(
@@ -875,33 +912,43 @@ class TestBulkScreeningValidationTask:
         assert screening.ship_id == ship.id
 
         args = (screening.id, )
-        check_tasks_mock.doc_company_task.assert_called_once_with(args)
+        check_tasks_mock.doc_company_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_technical_manager_task.assert_called_once_with(
-            args)
-        check_tasks_mock.ship_manager_task.assert_called_once_with(args)
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_manager_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_beneficial_owner_task.assert_called_once_with(
-            args)
-        check_tasks_mock.ship_operator_task.assert_called_once_with(args)
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_operator_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_registered_owner_task.assert_called_once_with(
-            args)
-        check_tasks_mock.ship_flag_task.assert_called_once_with(args)
-        check_tasks_mock.ship_flag_task.assert_called_once_with(args)
-        check_tasks_mock.ship_association_task.assert_called_once_with(args)
-        check_tasks_mock.ship_sanction_task.assert_called_once_with(args)
-        check_tasks_mock.port_visits_task.assert_called_once_with(args)
-        check_tasks_mock.zone_visits_task.assert_called_once_with(args)
-        check_tasks_mock.ship_inspections_task.assert_called_once_with(args)
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_flag_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_flag_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_association_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_sanction_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.port_visits_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.zone_visits_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_inspections_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
 
         check_tasks_mock.ship_reg_owner_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_operator_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_beneficial_owner_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_manager_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_technical_manager_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
 
     @responses.activate
     def test_new_ship_no_flag(
@@ -1026,30 +1073,40 @@ class TestBulkScreeningValidationTask:
         assert screening.ship_id == ship.id
 
         args = (screening.id, )
-        check_tasks_mock.doc_company_task.assert_called_once_with(args)
+        check_tasks_mock.doc_company_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_technical_manager_task.assert_called_once_with(
-            args)
-        check_tasks_mock.ship_manager_task.assert_called_once_with(args)
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_manager_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_beneficial_owner_task.assert_called_once_with(
-            args)
-        check_tasks_mock.ship_operator_task.assert_called_once_with(args)
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_operator_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_registered_owner_task.assert_called_once_with(
-            args)
-        check_tasks_mock.ship_flag_task.assert_called_once_with(args)
-        check_tasks_mock.ship_flag_task.assert_called_once_with(args)
-        check_tasks_mock.ship_association_task.assert_called_once_with(args)
-        check_tasks_mock.ship_sanction_task.assert_called_once_with(args)
-        check_tasks_mock.port_visits_task.assert_called_once_with(args)
-        check_tasks_mock.zone_visits_task.assert_called_once_with(args)
-        check_tasks_mock.ship_inspections_task.assert_called_once_with(args)
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_flag_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_flag_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_association_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_sanction_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.port_visits_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.zone_visits_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_inspections_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
 
         check_tasks_mock.ship_reg_owner_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_operator_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_beneficial_owner_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_manager_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_technical_manager_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
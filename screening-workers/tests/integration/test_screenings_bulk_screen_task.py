@@ -0,0 +1,49 @@
+import pytest
+
+from screening_api.screenings.enums import Status
+
+from screening_workers.screenings.schedulers import ScreeningScheduler
+from screening_workers.screenings.tasks import ScreeningsBulkScreenTask
+
+
+class TestScreeningsBulkScreenTask:
+
+    @pytest.fixture
+    def task(self, application):
+        return application.tasks[ScreeningsBulkScreenTask.name]
+
+    def test_registered(self, application):
+        assert ScreeningsBulkScreenTask.name in application.tasks
+
+    def test_screen_completed(
+            self, task, factory, application, check_tasks_mock):
+        task.batch_size = 1
+        ship = factory.create_ship()
+        done_screening = factory.create_screening(
+            ship=ship, status=Status.DONE)
+        created_screening = factory.create_screening(
+            ship=ship, status=Status.CREATED)
+        pending_screening = factory.create_screening(
+            ship=ship, status=Status.PENDING)
+
+        result = task.apply()
+
+        assert result.get() is None
+        screenings_repository = application.screenings_repository
+        for screening in [done_screening, created_screening]:
+            screening = screenings_repository.get(id=screening.id)
+            assert screening.status == Status.SCHEDULED
+            assert screening.ship_flag_status == Status.SCHEDULED
+        screening = screenings_repository.get(id=pending_screening.id)
+        assert screening.status == Status.PENDING
+        call_args = [
+            args for args, _ in check_tasks_mock.ship_flag_task.call_args_list
+        ]
+        assert sorted(call_args) == [
+            ((done_screening.id, ), ),
+            ((created_screening.id, ), ),
+        ]
+        assert all(
+            kwargs['priority'] == ScreeningScheduler.BULK_PRIORITY
+            for _, kwargs in check_tasks_mock.ship_flag_task.call_args_list
+        )
@@ -117,3 +117,20 @@ class TestScreeningsHistoryCreator:
 
         assert screening_history.ship_info == report.ship_info
         assert screening_history.port_visits == report.port_visits
+
+    def test_unchanged_reports_stored_once(
+            self, factory, creator, application):
+        ship = factory.create_ship(
+            imo_id=12345, country_id='PL', type='Bulk Carrier')
+        screening = factory.create_screening(
+            ship=ship, account_id=123456, status=Status.DONE)
+        report = factory.create_screening_report(screening=screening)
+
+        creator.create(screening.id)
+        creator.create(screening.id)
+
+        first, second = application.screenings_history_repository.find(
+            screening_id=screening.id)
+
+        assert first.reports_hashes == second.reports_hashes
+        assert first.port_visits == second.port_visits == report.port_visits
@@ -1,11 +1,19 @@
+from unittest.mock import ANY
+
 import pytest
 
 from sqlalchemy.orm.exc import NoResultFound
 
 from screening_api.screenings.enums import Severity, Status
 
+from screening_workers.screenings.schedulers import ScreeningScheduler
 from screening_workers.screenings.tasks import ScreeningScreenTask
 
+PUBLISH_OPTIONS = {
+    'producer': ANY,
+    'priority': ScreeningScheduler.INTERACTIVE_PRIORITY,
+}
+
 
 class TestScreeningScreenTask:
 
@@ -144,35 +152,45 @@ class TestScreeningScreenTask:
         assert screening.ship_id == ship.id
 
         args = (screening.id, )
-        check_tasks_mock.doc_company_task.assert_called_once_with(args)
+        check_tasks_mock.doc_company_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_technical_manager_task.assert_called_once_with(
-            args)
-        check_tasks_mock.ship_manager_task.assert_called_once_with(args)
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_manager_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_beneficial_owner_task.assert_called_once_with(
-            args)
-        check_tasks_mock.ship_operator_task.assert_called_once_with(args)
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_operator_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_registered_owner_task.assert_called_once_with(
-            args)
-        check_tasks_mock.ship_flag_task.assert_called_once_with(args)
-        check_tasks_mock.ship_flag_task.assert_called_once_with(args)
-        check_tasks_mock.ship_association_task.assert_called_once_with(args)
-        check_tasks_mock.ship_sanction_task.assert_called_once_with(args)
-        check_tasks_mock.port_visits_task.assert_called_once_with(args)
-        check_tasks_mock.zone_visits_task.assert_called_once_with(args)
-        check_tasks_mock.ship_inspections_task.assert_called_once_with(args)
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_flag_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_flag_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_association_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_sanction_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.port_visits_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.zone_visits_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
+        check_tasks_mock.ship_inspections_task.assert_called_once_with(
+            args, **PUBLISH_OPTIONS)
 
         check_tasks_mock.ship_reg_owner_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_operator_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_beneficial_owner_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_manager_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_technical_manager_company_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
         check_tasks_mock.ship_company_associates_task.\
-            assert_called_once_with(args)
+            assert_called_once_with(args, **PUBLISH_OPTIONS)
 
         history = application.screenings_history_repository.get_or_none(
             screening_id=screening.id)
@@ -5,7 +5,9 @@ from freezegun import freeze_time
 import pytest
 import responses
 from screening_api.screenings.enums import Severity, Status
-from screening_workers.lib.blacklist import default_blacklisted_ports
+from screening_workers.lib.blacklist import (
+    BlacklistedPorts, default_blacklisted_ports,
+)
 from screening_workers.ship_movements.ihs_position import IHSPositionLogic
 from screening_workers.ship_movements.checks import ShipMovementsCheck
 from screening_workers.ship_movements.tasks import ShipMovementsCheckTask
@@ -20,7 +22,7 @@ class TestShipMovementsTask:
             application.screenings_reports_repository,
             None,
             application.ships_repository,
-            default_blacklisted_ports, smh_client,
+            BlacklistedPorts(default_blacklisted_ports), smh_client,
             sis_client, {}, ais_client, portservice_client
         )
 
@@ -141,6 +141,33 @@ class TestShipSanctionsTask:
             'sanctions': [],
         }
 
+    @responses.activate
+    def test_unchanged_inputs_report_kept(
+            self, application, factory, task, ship_sanctions_update_cache):
+        ship = factory.create_ship(
+            imo_id=12345, country_id='PL', type='Bulk Carrier')
+        screening = factory.create_screening(ship=ship)
+        ship_sanctions_update_cache.put(str(ship.id), datetime.utcnow())
+        task_args = (screening.id, )
+
+        task.apply(task_args).get()
+        report = application.screenings_reports_repository.get(
+            screening_id=screening.id)
+        report_updated = report.updated
+
+        task.apply(task_args).get()
+
+        screening = application.screenings_repository.get(id=screening.id)
+        assert screening.ship_sanction_severity == Severity.OK
+        assert screening.ship_sanction_status == Status.DONE
+
+        report = application.screenings_reports_repository.get(
+            screening_id=screening.id)
+        assert report.updated == report_updated
+        assert report.ship_sanction == {
+            'sanctions': [],
+        }
+
     @responses.activate
     def test_no_sanctions_update_sanction(
             self, application, factory, task, compliance_client):
@@ -169,3 +169,45 @@ class TestAisClient:
         assert len(data) == 1
         assert data[0]['status'] == 'At anchor'
         assert data[0]['mmsi'] == 355443000
+
+    @responses.activate
+    def test_iter_track(self, client):
+        response1 = {
+            "next_link": "/api/v2/track/355443000?"
+                         "end_date=2017-12-30T00:20:37Z",
+            'count': 2,
+            'data': [
+                {'timestamp': '2018-01-11T19:24:37Z', 'mmsi': 355443000},
+                {'timestamp': '2018-01-10T19:24:37Z', 'mmsi': 355443000},
+            ],
+        }
+        response2 = {
+            "next_link": "/api/v2/track/355443000?"
+                         "end_date=2017-10-31T00:20:37Z",
+            'count': 1,
+            'data': [
+                {'timestamp': '2017-12-12T19:36:45Z', 'mmsi': 355443000},
+            ],
+        }
+        responses.add(
+            responses.GET,
+            'http://test/api/v2/track/355443000?position_count=2',
+            status=200, body=json.dumps(response1),
+            match_querystring=True,
+        )
+        responses.add(
+            responses.GET,
+            'http://test/api/v2/track/355443000?position_count=2&'
+            'end_date=2017-12-30T00%3A20%3A37Z',
+            status=200, body=json.dumps(response2),
+            match_querystring=True,
+        )
+
+        track = client.iter_track(
+            '355443000', position_count=2, stop_date=str2date('2017-11-01'))
+
+        assert next(track)['timestamp'] == '2018-01-11T19:24:37Z'
+        assert [
+            position['timestamp'] for position in track
+        ] == ['2018-01-10T19:24:37Z', '2017-12-12T19:36:45Z']
+        assert len(responses.calls) == 2
@@ -0,0 +1,134 @@
+import json
+from unittest import mock
+
+import pytest
+import responses
+
+from screening_workers.lib.api.clients import (
+    Client, ConditionalResponse, TastyPieClient,
+)
+
+
+class TestClient:
+
+    @pytest.fixture
+    def client(self):
+        return TastyPieClient(
+            'http://test/api/v1/', 'user', 'key', conditional=True)
+
+    @responses.activate
+    def test_conditional_not_modified(self, client):
+        body = json.dumps({'objects': [{'id': 1}]})
+
+        def callback(request):
+            if request.headers.get('If-None-Match') == '"v1"':
+                return 304, {}, ''
+            return 200, {'ETag': '"v1"'}, body
+
+        responses.add_callback(
+            responses.GET, 'http://test/api/v1/ships/',
+            callback=callback, content_type='application/json',
+        )
+
+        first = client.fetch('ships/', params={'limit': 1})
+        second = client.fetch('ships/', params={'limit': 1})
+
+        assert len(responses.calls) == 2
+        assert 'If-None-Match' not in responses.calls[0].request.headers
+        assert responses.calls[1].response.status_code == 304
+        assert second.status_code == 200
+        assert second.json() == first.json() == {'objects': [{'id': 1}]}
+
+    @responses.activate
+    def test_conditional_cache_validators_and_body_only(self, client):
+        responses.add(
+            responses.GET, 'http://test/api/v1/ships/', status=200,
+            body=json.dumps({'id': 1}), content_type='application/json',
+            headers={'Last-Modified': 'Mon, 19 Oct 2020 10:00:00 GMT'},
+        )
+
+        client.fetch('ships/')
+
+        assert client._conditional_responses == {
+            'http://test/api/v1/ships/': ConditionalResponse(
+                None, 'Mon, 19 Oct 2020 10:00:00 GMT', b'{"id": 1}', 'utf-8'),
+        }
+
+    @responses.activate
+    def test_conditional_cache_size(self, client):
+        client.CONDITIONAL_CACHE_SIZE = 25
+        for ship_id in (1, 2, 3):
+            responses.add(
+                responses.GET, 'http://test/api/v1/ships/{0}/'.format(ship_id),
+                status=200, body=json.dumps({'id': ship_id}),
+                headers={'ETag': '"v1"'},
+            )
+        responses.add(
+            responses.GET, 'http://test/api/v1/ships/', status=200,
+            body=json.dumps({'objects': [{'id': 1}] * 10}),
+            headers={'ETag': '"v1"'},
+        )
+
+        for ship_id in (1, 2, 3):
+            client.fetch('ships/{0}/'.format(ship_id))
+        # larger than the whole cache
+        client.fetch('ships/')
+
+        assert list(client._conditional_responses) == [
+            'http://test/api/v1/ships/2/', 'http://test/api/v1/ships/3/']
+        assert client._conditional_size == 18
+
+    @responses.activate
+    def test_environment_settings(self, client, monkeypatch):
+        monkeypatch.setenv('HTTP_PROXY', 'http://proxy:3128')
+        responses.add(
+            responses.GET, 'http://test/api/v1/ships/', status=200,
+            body=json.dumps({'id': 1}),
+        )
+
+        with mock.patch.object(
+                client.session, 'send', wraps=client.session.send) as send:
+            client.fetch('ships/')
+
+        assert send.call_args[1]['proxies']['http'] == 'http://proxy:3128'
+        assert send.call_args[1]['verify'] is False
+        assert send.call_args[1]['timeout'] == client.timeout
+
+    @responses.activate
+    def test_conditional_modified(self, client):
+        responses.add(
+            responses.GET, 'http://test/api/v1/ships/', status=200,
+            body=json.dumps({'id': 1}), headers={'ETag': '"v1"'},
+        )
+        responses.add(
+            responses.GET, 'http://test/api/v1/ships/', status=200,
+            body=json.dumps({'id': 2}), headers={'ETag': '"v2"'},
+        )
+
+        client.fetch('ships/')
+        response = client.fetch('ships/')
+
+        assert response.json() == {'id': 2}
+
+    @responses.activate
+    def test_not_conditional(self):
+        client = Client('http://test/api/v1/')
+        responses.add(
+            responses.GET, 'http://test/api/v1/ships/', status=200,
+            body=json.dumps({'id': 1}), headers={'ETag': '"v1"'},
+        )
+
+        client.fetch('ships/')
+        client.fetch('ships/')
+
+        assert 'If-None-Match' not in responses.calls[1].request.headers
+        assert client._conditional_responses == {}
+
+    def test_session_pool_and_timeout(self):
+        client = Client('http://test/api/v1/', pool_size=3, retries=2)
+
+        adapter = client.session.get_adapter('https://test/')
+
+        assert adapter._pool_maxsize == 3
+        assert adapter.max_retries.total == 2
+        assert client.timeout == (Client.CONNECT_TIMEOUT, Client.READ_TIMEOUT)
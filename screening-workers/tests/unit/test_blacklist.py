@@ -0,0 +1,38 @@
+import pytest
+
+from screening_api.screenings.enums import Severity
+
+from screening_workers.lib.blacklist import (
+    BlacklistedPorts, get_port_country_severity,
+)
+
+blacklisted_ports = [
+    {'port': None, 'country': 'Iran', 'severity': Severity.WARNING},
+    {'port': 'Kerch', 'country': None, 'severity': Severity.WARNING},
+    {'port': 'Bandar Abbas', 'country': 'Iran',
+     'severity': Severity.CRITICAL},
+    {'port': None, 'country': 'Cuba', 'severity': Severity.WARNING},
+    {'port': 'Havana', 'country': None, 'severity': Severity.CRITICAL},
+]
+
+
+class TestGetPortCountrySeverity:
+
+    @pytest.mark.parametrize('port_name,country_name,expected', [
+        ('Bandar Abbas', 'Iran', blacklisted_ports[2]),
+        ('Bushehr', 'Iran', blacklisted_ports[0]),
+        ('Kerch', 'Ukraine', blacklisted_ports[1]),
+        ('Havana', 'Cuba', blacklisted_ports[4]),
+        ('Kerch', 'Cuba', blacklisted_ports[3]),
+        ('Nagoya', 'Japan', {}),
+        (None, None, {}),
+    ])
+    def test_indexed_same_as_list(self, port_name, country_name, expected):
+        indexed = BlacklistedPorts(blacklisted_ports)
+
+        result = get_port_country_severity(
+            indexed, port_name=port_name, country_name=country_name)
+
+        assert result == expected
+        assert result == get_port_country_severity(
+            blacklisted_ports, port_name=port_name, country_name=country_name)
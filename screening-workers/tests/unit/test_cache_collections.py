@@ -0,0 +1,131 @@
+from datetime import datetime
+from unittest import mock
+
+from screening_api.companies.models import SISCompany
+from screening_api.ships.models import Ship
+
+from screening_workers.lib.api.cache.collections import ReadCache
+from screening_workers.lib.api.cache.snapshots import (
+    from_snapshot, get_snapshot,
+)
+from screening_workers.lib.sis_api.cache.collections import ShipsCollection
+
+
+class TestReadCache:
+
+    def test_get_value_created_once(self):
+        cache = ReadCache()
+        createfunc = mock.Mock(return_value='ship')
+
+        first = cache.get_value((1, ), 'v1', createfunc)
+        second = cache.get_value((1, ), 'v1', createfunc)
+
+        assert first == second == 'ship'
+        assert createfunc.call_count == 1
+
+    def test_version_changed(self):
+        cache = ReadCache()
+
+        cache.get_value((1, ), 'v1', lambda: 'old')
+        value = cache.get_value((1, ), 'v2', lambda: 'new')
+
+        assert value == 'new'
+        assert cache.get_value((1, ), 'v2', lambda: 'newer') == 'new'
+
+    def test_expired(self):
+        cache = ReadCache(ttl=60)
+
+        cache.get_value((1, ), 'v1', lambda: 'old')
+        version, created, value, item_ids = cache._values[(1, )]
+        cache._values[(1, )] = (version, created - 61, value, item_ids)
+
+        assert cache.get_value((1, ), 'v1', lambda: 'new') == 'new'
+
+    def test_max_size(self):
+        cache = ReadCache(max_size=2)
+
+        cache.get_value((1, ), 'v1', lambda: 'first')
+        cache.get_value((2, ), 'v1', lambda: 'second')
+        cache.get_value((1, ), 'v1', lambda: 'first')
+        cache.get_value((3, ), 'v1', lambda: 'third')
+
+        assert len(cache) == 2
+        assert cache.get_value((1, ), 'v1', lambda: 'new') == 'first'
+        assert cache.get_value((2, ), 'v1', lambda: 'new') == 'new'
+
+    def test_discard(self):
+        cache = ReadCache()
+        cache.get_value((1, 'a'), 'v1', lambda: 'first', item_ids=[1])
+        cache.get_value((1, 'b'), 'v1', lambda: 'first', item_ids=[1])
+        cache.get_value((2, 1), 'v1', lambda: 'second', item_ids=[2])
+        cache.get_value((1, 3), 'v1', lambda: 'both', item_ids=[1, 3])
+        cache.get_value('11', 'v1', lambda: 'key')
+
+        cache.discard(1)
+
+        assert list(cache._values) == [(2, 1), '11']
+
+    def test_discard_key(self):
+        cache = ReadCache()
+        cache.get_value(1, 'v1', lambda: 'first')
+        cache.get_value(11, 'v1', lambda: 'second')
+
+        cache.discard(1)
+
+        assert list(cache._values) == [11]
+
+
+class TestSnapshots:
+
+    def test_from_snapshot(self):
+        operator = SISCompany(id=2, name='Operator')
+        ship = Ship(id=1, imo_id=1234567, name='Ship',
+                    operator_company=operator)
+
+        snapshot = get_snapshot([ship, None])
+        copies = from_snapshot(snapshot)
+        other_copies = from_snapshot(snapshot)
+
+        assert copies[1] is None
+        assert copies[0] is not ship
+        assert copies[0] is not other_copies[0]
+        assert (copies[0].id, copies[0].imo_id, copies[0].name) == (
+            1, 1234567, 'Ship')
+        company = copies[0].operator_company
+        assert (company.id, company.name) == (2, 'Operator')
+        assert company is not operator
+
+
+class TestShipsCollection:
+
+    def test_get_cached_until_updated(self):
+        ships_repository = mock.Mock()
+        ships_repository.get.return_value = Ship(id=1, name='Ship')
+        ship_updater = mock.Mock()
+        ship_updater.get_version.return_value = datetime(2020, 1, 1)
+        collection = ShipsCollection(
+            ships_repository, ship_updater, ReadCache())
+
+        first = collection.get(1, joinedload_related=['operator'])
+        second = collection.get(1, joinedload_related=['operator'])
+
+        assert first.name == second.name == 'Ship'
+        assert first is not second  # not shared by the worker threads
+        ships_repository.get.assert_called_once_with(
+            id=1, joinedload_related=['operator'])
+        assert ship_updater.update.call_count == 2
+
+        ship_updater.get_version.return_value = datetime(2020, 1, 2)
+        collection.get(1, joinedload_related=['operator'])
+
+        assert ships_repository.get.call_count == 2
+
+    def test_get_with_session_not_cached(self):
+        ships_repository = mock.Mock()
+        collection = ShipsCollection(
+            ships_repository, mock.Mock(), ReadCache())
+
+        collection.get(1, session=mock.sentinel.session)
+        collection.get(1, session=mock.sentinel.session)
+
+        assert ships_repository.get.call_count == 2
@@ -0,0 +1,181 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+
+from screening_workers.lib.api.cache.updaters import BaseCacheUpdater
+from screening_workers.lib.compliance_api.cache.updaters import (
+    CompanySanctionsUpdater,
+)
+from screening_workers.lib.compliance_api.models import (
+    Organisation, OrganisationName,
+)
+
+
+class DictCache(dict):
+
+    def get_value(self, key, createfunc):
+        if key not in self:
+            self[key] = createfunc()
+        return self[key]
+
+    def put(self, key, value):
+        self[key] = value
+
+
+class CacheUpdater(BaseCacheUpdater):
+
+    lock_name_prefix = 'item'
+
+    WAIT_TIMEOUT = 0.05
+    WAIT_DELAY = 0.01
+
+    process = mock.Mock()
+
+
+class TestBaseCacheUpdater:
+
+    @pytest.fixture
+    def locker(self):
+        return mock.Mock()
+
+    @pytest.fixture
+    def lock(self, locker):
+        return locker.create_lock.return_value
+
+    @pytest.fixture
+    def update_cache(self):
+        return DictCache()
+
+    @pytest.fixture
+    def updater(self, update_cache, locker):
+        CacheUpdater.process.reset_mock()
+        return CacheUpdater(update_cache, locker)
+
+    def test_interval_not_passed(self, updater, update_cache, locker):
+        update_cache['1'] = datetime.utcnow()
+
+        updater.update(1)
+
+        assert not locker.create_lock.called
+        assert not updater.process.called
+
+    def test_update(self, updater, update_cache, lock):
+        lock.acquire.return_value = True
+
+        updater.update(1)
+
+        updater.process.assert_called_once_with(1)
+        lock.release.assert_called_once_with()
+        assert update_cache['1'] > datetime.utcnow() - timedelta(seconds=5)
+
+    def test_release_on_error(self, updater, update_cache, lock):
+        lock.acquire.return_value = True
+        updater.process.side_effect = ValueError
+
+        with pytest.raises(ValueError):
+            updater.update(1)
+
+        lock.release.assert_called_once_with()
+        assert update_cache['1'] == datetime(1890, 1, 1)
+        updater.process.side_effect = None
+
+    def test_updated_before_lock(self, updater, update_cache, lock):
+        def acquire():
+            update_cache['1'] = datetime.utcnow()
+            return True
+        lock.acquire.side_effect = acquire
+
+        updater.update(1)
+
+        assert not updater.process.called
+        lock.release.assert_called_once_with()
+
+    def test_lock_not_acquired(self, updater, update_cache, lock):
+        lock.acquire.return_value = False
+
+        updater.update(1)
+
+        assert not updater.process.called
+        assert not lock.release.called
+
+    def test_update_many(self, updater, update_cache, lock):
+        lock.acquire.return_value = True
+        update_cache['2'] = datetime.utcnow()
+
+        updater.update_many([3, 1, 2, 1])
+
+        assert sorted(
+            call[0][0] for call in updater.process.call_args_list) == [1, 3]
+        assert '1' in update_cache
+        assert '3' in update_cache
+
+    def test_update_many_error(self, updater, lock):
+        lock.acquire.return_value = True
+        updater.process.side_effect = ValueError
+
+        with pytest.raises(ValueError):
+            updater.update_many([1, 2])
+
+        assert updater.process.call_count == 2
+        updater.process.side_effect = None
+
+    def test_version_changed_by_update(self, updater, update_cache, lock):
+        lock.acquire.return_value = True
+        version = updater.get_version(1)
+
+        updater.update(1)
+
+        assert updater.get_version(1) != version
+        assert updater.get_versions([2, 1, 2]) == (
+            updater.get_version(1), updater.get_version(2))
+
+
+class TestCompanySanctionsUpdater:
+
+    @pytest.fixture
+    def organisation_names_collection(self):
+        return mock.Mock()
+
+    @pytest.fixture
+    def compliance_entities_repository(self):
+        return mock.Mock()
+
+    @pytest.fixture
+    def updater(
+            self, organisation_names_collection,
+            compliance_entities_repository,
+    ):
+        return CompanySanctionsUpdater(
+            mock.Mock(), DictCache(), mock.Mock(),
+            organisation_names_collection, mock.Mock(),
+            compliance_entities_repository,
+            mock.Mock(**{'find.return_value': []}),
+            mock.Mock(**{'find.return_value': []}),
+        )
+
+    def test_repeated_organisation(
+            self, updater, organisation_names_collection,
+            compliance_entities_repository,
+    ):
+        organisation = Organisation(
+            id=1, name='Company', status='Active',
+            sanctions=[], associations=[],
+        )
+        organisation_names_collection.query.return_value = [
+            OrganisationName(
+                id=name_id, name=name, name_type='Alias',
+                organisation=organisation,
+            )
+            for name_id, name in [(1, 'Company'), (2, 'Company Ltd')]
+        ]
+        entity = mock.Mock(compliance_id=1)
+        compliance_entities_repository.find.return_value = [entity]
+        company = mock.Mock(sis_code='1', compliance=[])
+        company.name = 'Company'
+        session = mock.Mock()
+
+        updater.process_company(company, session=session)
+
+        assert company.compliance == [entity]
+        session.commit.assert_called_once_with()
@@ -0,0 +1,39 @@
+from unittest import mock
+
+from screening_workers.lib.screening.enums import CheckCost
+from screening_workers.lib.screening.registries import CheckTasksRegistry
+
+
+def check_task(name, cost):
+    task = mock.Mock(cost=cost)
+    task.name = name
+    return task
+
+
+class TestCheckTasksRegistry:
+
+    def test_get_tasks(self):
+        flag = check_task('screening.country_sanctions.ship_flag_check',
+                          CheckCost.SLOW)
+        port_visits = check_task(
+            'screening.ship_movements.port_visits_check', CheckCost.SLOW)
+        registry = CheckTasksRegistry.create(flag, port_visits)
+
+        assert sorted(registry.get_tasks(), key=lambda task: task.name) == [
+            flag, port_visits]
+
+    def test_route(self):
+        registry = CheckTasksRegistry.create(
+            check_task('screening.ship_movements.port_visits_check',
+                       CheckCost.SLOW),
+        )
+
+        assert registry.route(
+            'screening.ship_movements.port_visits_check', (1, ), {}, {},
+        ) == {'queue': 'screening.checks.slow'}
+
+    def test_route_not_check_task(self):
+        registry = CheckTasksRegistry.create()
+
+        assert registry.route('screening.screenings.screen', (), {}, {}) \
+            is None
@@ -0,0 +1,61 @@
+from unittest import mock
+
+from screening_api.screenings.enums import Severity
+
+from screening_workers.ship_movements.ihs_position import IHSPositionLogic
+
+
+def make_position(**kwargs):
+    data = {
+        'ihs_port_id': '18346',
+        'port_name': 'Abidjan',
+        'country_name': "Cote d'Ivoire",
+        'last_port_of_call_name': 'Nagoya',
+        'last_port_of_call_country_code': 'JP',
+        'last_port_of_call_country': 'Japan',
+        'destination_port': 'Abidjan',
+    }
+    data.update(kwargs)
+    position = mock.Mock(**data)
+    position.ihs_movement_dict.return_value = {}
+    return position
+
+
+class TestIHSPositionLogic:
+
+    def test_port_data_memoized(self):
+        portservice_client = mock.Mock()
+        portservice_client.get_port_data.return_value = {
+            'port_name': 'Nagoya',
+            'port_code': 'JPNGO',
+            'port_country_name': 'Japan',
+        }
+        blacklisted_ports = [{
+            'port': None,
+            'country': 'Japan',
+            'severity': Severity.CRITICAL,
+        }]
+        logic = IHSPositionLogic(portservice_client, blacklisted_ports)
+        positions = [make_position() for _ in range(10)]
+
+        severity, movements = logic.process_ihs_positions(positions)
+
+        assert severity == Severity.CRITICAL
+        assert len(movements) == 10
+        # ihs port id, port names (2) and country codes (2)
+        assert portservice_client.get_port_data.call_count == 5
+
+    def test_empty_port_not_fetched(self):
+        portservice_client = mock.Mock()
+        portservice_client.get_port_data.return_value = None
+        logic = IHSPositionLogic(portservice_client, [])
+        position = make_position(
+            port_name='', country_name='', movement_type='At sea',
+            last_port_of_call_name='', last_port_of_call_country_code='',
+            destination_port='',
+        )
+
+        severity, movements = logic.process_ihs_positions([position])
+
+        assert severity == Severity.OK
+        assert not portservice_client.get_port_data.called
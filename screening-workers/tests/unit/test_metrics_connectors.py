@@ -0,0 +1,63 @@
+import time
+from unittest import mock
+
+import pytest
+
+from screening_workers.lib.metrics.connectors import CeleryMetricsConnector
+
+
+class TestCeleryMetricsConnector:
+
+    @pytest.fixture
+    def publisher(self):
+        return mock.Mock()
+
+    @pytest.fixture
+    def connector(self, publisher):
+        return CeleryMetricsConnector(publisher, 'test')
+
+    @pytest.fixture
+    def task(self):
+        task = mock.Mock(spec=['name', 'request', 'check'])
+        task.name = 'screening.ship_movements.port_visits_check'
+        task.check.name = 'port_visits'
+        task.request = mock.Mock(
+            spec=['id', 'hostname', 'eta', 'headers'],
+            id='task-1', hostname='worker-1', eta=None, headers=None,
+        )
+        return task
+
+    def test_before_publish(self, connector):
+        headers = {}
+
+        connector.on_before_publish(sender='task', headers=headers)
+
+        assert headers['published_at'] == pytest.approx(time.time(), abs=5)
+
+    def test_queue_time(self, connector, publisher, task):
+        task.request.headers = {'published_at': time.time() - 2}
+
+        connector.on_prerun(sender=task)
+
+        publisher.time.assert_called_once_with(
+            'test.TaskQueueTime', mock.ANY, dimensions=mock.ANY)
+        assert publisher.time.call_args[0][1] >= 2000
+
+    def test_queue_time_delayed(self, connector, publisher, task):
+        task.request.headers = {'published_at': time.time() - 2}
+        task.request.eta = '2020-01-01T00:00:00'
+
+        connector.on_prerun(sender=task)
+
+        assert not publisher.time.called
+
+    def test_check_time(self, connector, publisher, task):
+        connector.on_prerun(sender=task)
+        connector.on_postrun(sender=task, state='SUCCESS')
+
+        names = [call[0][0] for call in publisher.time.call_args_list]
+        assert names == ['test.TaskTime', 'test.CheckTime']
+        dimensions = publisher.time.call_args[1]['dimensions']
+        assert dimensions['CheckName'] == 'port_visits'
+        assert dimensions['Outcome'] == 'SUCCESS'
+        publisher.flush.assert_called_once_with()
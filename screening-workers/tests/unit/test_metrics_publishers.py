@@ -0,0 +1,62 @@
+from unittest import mock
+
+import pytest
+
+from screening_workers.lib.metrics.publishers import StatsDMetricsPublisher
+
+
+class TestStatsDMetricsPublisher:
+
+    @pytest.fixture
+    def publisher(self):
+        publisher = StatsDMetricsPublisher(
+            prefix='test', max_buffer_size=3, flush_interval=60)
+        publisher.client._send = mock.Mock()
+        return publisher
+
+    def test_buffered(self, publisher):
+        publisher.increase('TaskSuccess', dimensions={'TaskName': 'task'})
+        publisher.time('TaskTime', 12.5)
+
+        assert not publisher.client._send.called
+
+        publisher.flush()
+
+        publisher.client._send.assert_called_once_with(
+            'test.TaskSuccess:1|c|#TaskName:task\n'
+            'test.TaskTime:12.500000|ms'
+        )
+
+    def test_buffer_full(self, publisher):
+        for _ in range(3):
+            publisher.increase('TaskSuccess')
+
+        publisher.client._send.assert_called_once_with(
+            '\n'.join(['test.TaskSuccess:1|c'] * 3))
+
+    def test_flush_interval(self, publisher):
+        publisher.flush_interval = 0
+
+        publisher.increase('TaskSuccess')
+
+        publisher.client._send.assert_called_once_with('test.TaskSuccess:1|c')
+
+    def test_packet_size(self):
+        publisher = StatsDMetricsPublisher(
+            prefix='test', flush_interval=60, max_udp_size=50)
+        publisher.client._send = mock.Mock()
+        for _ in range(5):
+            publisher.increase('TaskSuccess')
+
+        publisher.flush()
+
+        packets = [
+            call[0][0] for call in publisher.client._send.call_args_list]
+        assert len(packets) == 3
+        assert all(len(packet) < 50 for packet in packets)
+        assert '\n'.join(packets).count('TaskSuccess') == 5
+
+    def test_flush_empty(self, publisher):
+        publisher.flush()
+
+        assert not publisher.client._send.called
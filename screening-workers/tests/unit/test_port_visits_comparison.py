@@ -0,0 +1,64 @@
+from unittest import mock
+
+import pytest
+
+from screening_api.screenings.enums import Severity
+
+from screening_workers.ship_movements.comparisons import (
+    PortVisitsComparison,
+)
+
+
+class TestPortVisitsComparison:
+
+    @pytest.fixture
+    def smh_client(self):
+        client = mock.Mock()
+        client.get_smh.return_value = {
+            'visits': [
+                {'port': {
+                    'port_code': 'IRBND', 'port_name': 'Bandar Abbas',
+                    'port_country_name': 'Iran',
+                }},
+                {'port': {
+                    'port_code': 'JPNGO', 'port_name': 'Nagoya',
+                    'port_country_name': 'Japan',
+                }},
+            ],
+        }
+        return client
+
+    @pytest.fixture
+    def metrics_publisher(self):
+        return mock.Mock()
+
+    @pytest.fixture
+    def comparison(self, smh_client, metrics_publisher):
+        blacklisted_ports = [{
+            'port': None, 'country': 'Iran', 'severity': Severity.WARNING,
+        }]
+        return PortVisitsComparison(
+            smh_client, blacklisted_ports, metrics_publisher, 'test')
+
+    def test_match(self, comparison, smh_client, metrics_publisher):
+        result = comparison.compare(
+            1234567, {'request_days': 365}, ['IRBND', 'JPNGO'], 'WARNING')
+
+        smh_client.get_smh.assert_called_once_with(1234567, request_days=365)
+        assert result['match'] is True
+        assert result['smh_severity'] == 'WARNING'
+        metrics_publisher.increase.assert_called_once_with(
+            'test.PortVisitsComparison', dimensions=mock.ANY)
+        dimensions = metrics_publisher.increase.call_args[1]['dimensions']
+        assert dimensions['Match'] == 'True'
+        metrics_publisher.flush.assert_called_once_with()
+
+    def test_mismatch(self, comparison, metrics_publisher):
+        result = comparison.compare(1234567, {}, ['JPNGO', 'CNSHA'], 'OK')
+
+        assert result['match'] is False
+        assert result['missing_ports'] == 1
+        assert result['extra_ports'] == 1
+        dimensions = metrics_publisher.increase.call_args[1]['dimensions']
+        assert dimensions['Match'] == 'False'
+        assert dimensions['SeverityMatch'] == 'False'
@@ -0,0 +1,111 @@
+from datetime import date
+from unittest import mock
+
+import pytest
+
+from screening_api.blacklisted_countries.models import BlacklistedCountry
+from screening_api.screenings.enums import Severity
+
+from screening_workers.lib.screening.checks import ReportCheck
+from screening_workers.lib.screening.fingerprints import (
+    get_fingerprint, get_model_data,
+)
+
+
+class ShipCheck(ReportCheck):
+
+    name = 'ship_check'
+
+    make_report = mock.Mock()
+
+    def get_fingerprint_data(self, data_provider):
+        return {'ship_name': data_provider.ship.name}
+
+
+class TestFingerprints:
+
+    def test_get_model_data(self):
+        country = mock.Mock(
+            __table__=BlacklistedCountry.__table__,
+            id=1, country_id='PL', country_name='Poland',
+            severity=Severity.WARNING, updated=date.today(),
+        )
+
+        data = get_model_data(country, extra=True)
+
+        assert data['country_name'] == 'Poland'
+        assert data['severity'] == Severity.WARNING
+        assert data['extra'] is True
+        assert 'updated' not in data
+        assert get_model_data(None) is None
+
+    def test_get_fingerprint_stable(self):
+        first = get_fingerprint({'b': date(2020, 1, 1), 'a': Severity.OK})
+        second = get_fingerprint({'a': Severity.OK, 'b': date(2020, 1, 1)})
+
+        assert first == second
+        assert get_fingerprint({'a': Severity.WARNING}) != first
+
+
+class TestReportCheckFingerprint:
+
+    @pytest.fixture
+    def fingerprints_repository(self):
+        return mock.Mock()
+
+    @pytest.fixture
+    def check(self, fingerprints_repository):
+        ShipCheck.make_report.reset_mock()
+        ShipCheck.make_report.return_value.severity = Severity.WARNING
+        screenings_reports_repository = mock.Mock()
+        screenings_reports_repository.get_or_create.return_value = (
+            mock.Mock(id=1), False)
+        return ShipCheck(
+            mock.Mock(), screenings_reports_repository,
+            fingerprints_repository=fingerprints_repository,
+        )
+
+    @pytest.fixture
+    def screening(self):
+        screening = mock.Mock(id=1)
+        screening.ship.name = 'Ship'
+        return screening
+
+    def test_report_made(self, check, fingerprints_repository, screening):
+        fingerprints_repository.get_or_none.return_value = None
+
+        severity = check.process(screening)
+
+        assert severity == Severity.WARNING
+        assert check.make_report.called
+        fingerprints_repository.set_fingerprint.assert_called_once_with(
+            1, 'ship_check', mock.ANY, Severity.WARNING)
+
+    def test_inputs_unchanged(
+            self, check, fingerprints_repository, screening):
+        fingerprints_repository.get_or_none.return_value = None
+        check.process(screening)
+        fingerprint = fingerprints_repository.set_fingerprint.call_args[0][2]
+        fingerprints_repository.get_or_none.return_value = mock.Mock(
+            fingerprint=fingerprint, severity=Severity.CRITICAL)
+
+        severity = check.process(screening)
+
+        assert severity == Severity.CRITICAL
+        assert check.make_report.call_count == 1
+        assert check.screenings_reports_repository.update.call_count == 1
+
+    def test_inputs_changed(self, check, fingerprints_repository, screening):
+        fingerprints_repository.get_or_none.return_value = mock.Mock(
+            fingerprint='0' * 64, severity=Severity.CRITICAL)
+
+        severity = check.process(screening)
+
+        assert severity == Severity.WARNING
+        assert check.make_report.called
+
+    def test_no_repository(self, check, screening):
+        check.fingerprints_repository = None
+
+        assert check.process(screening) == Severity.WARNING
+        assert check.make_report.called
@@ -0,0 +1,72 @@
+from unittest import mock
+
+from screening_workers.lib.screening.contexts import ScreeningDataContexts
+
+
+class TestScreeningDataContexts:
+
+    def test_get_value_created_once(self):
+        contexts = ScreeningDataContexts()
+        createfunc = mock.Mock(return_value='ship')
+
+        with contexts.activate('run-1'):
+            first = contexts.get(123).get_value(('ship', 1), createfunc)
+            second = contexts.get(123).get_value(('ship', 1), createfunc)
+
+        assert first == second == 'ship'
+        assert createfunc.call_count == 1
+
+    def test_get_values_missing_created_at_once(self):
+        contexts = ScreeningDataContexts()
+        createfunc = mock.Mock(
+            side_effect=lambda keys: [key[1] * 10 for key in keys])
+
+        with contexts.activate('run-1'):
+            context = contexts.get(123)
+            context.get_value(('company', 1), lambda: 'refreshed')
+            values = context.get_values(
+                [('company', 1), ('company', 2), ('company', 3),
+                 ('company', 2)],
+                createfunc,
+            )
+            again = context.get_values(
+                [('company', 2), ('company', 3)], createfunc)
+
+        assert values == ['refreshed', 20, 30, 20]
+        assert again == [20, 30]
+        createfunc.assert_called_once_with([('company', 2), ('company', 3)])
+
+    def test_no_run_not_shared(self):
+        contexts = ScreeningDataContexts()
+
+        assert contexts.get(123) is not contexts.get(123)
+
+    def test_new_run_new_context(self):
+        contexts = ScreeningDataContexts()
+
+        with contexts.activate('run-1'):
+            context = contexts.get(123)
+            assert contexts.get(456) is not context
+        with contexts.activate('run-2'):
+            assert contexts.get(123) is not context
+
+    def test_expired(self):
+        contexts = ScreeningDataContexts(ttl=60)
+
+        with contexts.activate('run-1'):
+            context = contexts.get(123)
+            context.created -= 61
+
+            assert contexts.get(123) is not context
+
+    def test_max_size(self):
+        contexts = ScreeningDataContexts(max_size=2)
+
+        with contexts.activate('run-1'):
+            context = contexts.get(1)
+            contexts.get(2)
+            contexts.get(1)
+            contexts.get(3)
+
+            assert contexts.get(1) is context
+            assert len(contexts._contexts) == 2
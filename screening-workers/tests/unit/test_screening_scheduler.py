@@ -0,0 +1,42 @@
+from unittest import mock
+
+import pytest
+
+from screening_workers.screenings.schedulers import ScreeningScheduler
+
+
+class TestScreeningScheduler:
+
+    def get_scheduler(self, driver_type):
+        task = mock.MagicMock()
+        producer = task.app.producer_or_acquire.return_value.__enter__.\
+            return_value
+        producer.connection.transport.driver_type = driver_type
+        check_tasks_registry = mock.Mock(**{'get_tasks.return_value': [task]})
+        scheduler = ScreeningScheduler(
+            mock.Mock(), mock.Mock(), check_tasks_registry)
+        return scheduler, task
+
+    @pytest.mark.parametrize('driver_type,interactive,bulk', [
+        ('amqp', 9, 0),
+        ('redis', 0, 9),
+    ])
+    def test_schedule_checks_priority(self, driver_type, interactive, bulk):
+        scheduler, task = self.get_scheduler(driver_type)
+
+        scheduler._schedule_checks(
+            [1], priority=ScreeningScheduler.INTERACTIVE_PRIORITY)
+        scheduler._schedule_checks(
+            [2], priority=ScreeningScheduler.BULK_PRIORITY)
+
+        assert [
+            (args, kwargs['priority'])
+            for args, kwargs in task.apply_async.call_args_list
+        ] == [(((1, ), ), interactive), (((2, ), ), bulk)]
+
+    def test_schedule_checks_no_priority(self):
+        scheduler, task = self.get_scheduler('redis')
+
+        scheduler._schedule_checks([1])
+
+        assert task.apply_async.call_args[1]['priority'] is None
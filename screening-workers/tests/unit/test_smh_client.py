@@ -141,3 +141,13 @@ class TestSmhClient:
         assert 'msg' in response
         assert resp['status_code'] == 200
         assert resp["route"] == '/api/v1/system/status'
+
+    def test_http_options(self):
+        client = SMHClient(
+            "http://test/api/v1", "one", "pass",
+            pool_size=32, timeout=(1.0, 5.0), retries=1,
+        )
+
+        assert client.pool_size == 32
+        assert client.timeout == (1.0, 5.0)
+        assert client.retries == 1
@@ -57,6 +57,11 @@ class TestUtils:
         with pytest.raises(ValueError):
             str2date(test_date_string)
 
+        # default format out of range
+        test_date_string = "2017-13-10T05:58:50Z"
+        with pytest.raises(ValueError):
+            str2date(test_date_string)
+
     def test_json_logger(self):
         import structlog
 
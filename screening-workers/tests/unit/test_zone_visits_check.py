@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+
+from screening_api.screenings.enums import Severity
+
+from screening_workers.lib.geoserver_api.zones import (
+    PreparedZone, ZoneIndex, ZonesCache,
+)
+from screening_workers.lib.utils import date2str
+from screening_workers.ship_movements.checks import ZoneVisitsCheck
+
+
+def square_zone(zone_id, zone_type, name):
+    coordinates = [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]]
+    return PreparedZone(zone_id, zone_type, name, {
+        'type': 'Polygon', 'coordinates': [coordinates],
+    })
+
+
+def position(hours_ago, longitude=5, latitude=5):
+    timestamp = datetime.utcnow() - timedelta(hours=hours_ago)
+    return {
+        'timestamp': date2str(timestamp),
+        'longitude': longitude,
+        'latitude': latitude,
+    }
+
+
+class TestZoneVisitsCheck:
+
+    @pytest.fixture
+    def check(self):
+        return ZoneVisitsCheck(
+            mock.Mock(), mock.Mock(), mock.Mock(), mock.Mock(), {})
+
+    @pytest.fixture
+    def zone_index(self):
+        return ZoneIndex([
+            square_zone('war.1', ZonesCache.WAR_ZONE, 'War zone'),
+            square_zone('cyclone.1', ZonesCache.CYCLONE, 'Cyclone'),
+        ])
+
+    def test_cyclone_recent_positions_only(self, check, zone_index):
+        track = [position(1), position(24), position(24 * 5)]
+        stop_date = datetime.utcnow() - timedelta(days=365)
+
+        visits = check._get_zone_visits(zone_index, track, stop_date)
+
+        visits = {visit['zone_type']: visit for visit in visits}
+        assert set(visits) == {ZonesCache.WAR_ZONE, ZonesCache.CYCLONE}
+        assert visits[ZonesCache.WAR_ZONE]['entered'] == \
+            track[2]['timestamp']
+        assert visits[ZonesCache.CYCLONE]['entered'] == track[1]['timestamp']
+        assert visits[ZonesCache.CYCLONE]['severity'] == Severity.WARNING
+
+    def test_cyclone_not_visited_recently(self, check, zone_index):
+        track = [position(1, longitude=20), position(24 * 5)]
+        stop_date = datetime.utcnow() - timedelta(days=365)
+
+        visits = check._get_zone_visits(zone_index, track, stop_date)
+
+        assert [visit['zone_type'] for visit in visits] == [
+            ZonesCache.WAR_ZONE]
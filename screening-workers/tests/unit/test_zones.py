@@ -0,0 +1,168 @@
+import math
+import random
+from unittest import mock
+
+import pytest
+
+from screening_workers.lib.geoserver_api.zones import (
+    PreparedRing, PreparedZone, ZoneIndex, ZonesCache,
+)
+
+
+def square(lon, lat, size):
+    return [
+        [lon, lat], [lon + size, lat], [lon + size, lat + size],
+        [lon, lat + size], [lon, lat],
+    ]
+
+
+def feature(feature_id, name, *rings):
+    return {
+        'id': feature_id,
+        'properties': {'zone_name': name},
+        'geometry': {'type': 'Polygon', 'coordinates': list(rings)},
+    }
+
+
+def naive_contains(coordinates, lon, lat):
+    inside = False
+    for (x1, y1), (x2, y2) in zip(coordinates, coordinates[1:]):
+        if (y1 > lat) != (y2 > lat) and \
+                lon < (x2 - x1) * (lat - y1) / (y2 - y1) + x1:
+            inside = not inside
+    return inside
+
+
+class TestPreparedRing:
+
+    def test_contains(self):
+        ring = PreparedRing(square(0, 0, 10))
+
+        assert ring.contains(5, 5)
+        assert not ring.contains(15, 5)
+        assert not ring.contains(5, -1)
+
+    def test_bands_same_as_all_edges(self):
+        random.seed(0)
+        # star shaped polygon with many edges
+        coordinates = []
+        for step in range(200):
+            radius = random.uniform(1, 10)
+            angle = step * 360 / 200
+            coordinates.append([
+                radius * math.cos(math.radians(angle)),
+                radius * math.sin(math.radians(angle)),
+            ])
+        coordinates.append(coordinates[0])
+        ring = PreparedRing(coordinates)
+
+        assert ring.bands_count > 1
+        for _ in range(2000):
+            lon, lat = random.uniform(-11, 11), random.uniform(-11, 11)
+            assert ring.contains(lon, lat) == \
+                naive_contains(coordinates, lon, lat)
+
+
+class TestPreparedZone:
+
+    def test_hole(self):
+        zone = PreparedZone(
+            'z.1', 'sanction', 'Zone', {
+                'type': 'Polygon',
+                'coordinates': [square(0, 0, 10), square(4, 4, 2)],
+            })
+
+        assert zone.contains(1, 1)
+        assert not zone.contains(5, 5)
+
+    def test_multipolygon(self):
+        zone = PreparedZone(
+            'z.1', 'warzone', 'Zone', {
+                'type': 'MultiPolygon',
+                'coordinates': [[square(0, 0, 1)], [square(10, 10, 1)]],
+            })
+
+        assert zone.bbox == (0, 0, 11, 11)
+        assert zone.contains(10.5, 10.5)
+        assert not zone.contains(5, 5)
+
+    def test_no_geometry(self):
+        zone = PreparedZone('z.1', 'cyclone', 'Zone', None)
+
+        assert zone.bbox is None
+        assert not zone.contains(0, 0)
+
+
+class TestZoneIndex:
+
+    def test_query(self):
+        zones = [
+            PreparedZone(
+                str(index), 'sanction', 'Zone {0}'.format(index), {
+                    'type': 'Polygon',
+                    'coordinates': [square(lon, lat, 2)],
+                })
+            for index, (lon, lat) in enumerate(
+                (lon, lat)
+                for lon in range(-180, 180, 10)
+                for lat in range(-80, 80, 10)
+            )
+        ]
+        zones.append(PreparedZone('all', 'warzone', 'All', {
+            'type': 'Polygon', 'coordinates': [square(-180, -90, 360)],
+        }))
+        index = ZoneIndex(zones)
+
+        assert len(index) == len(zones)
+        assert len(index.root) <= ZoneIndex.NODE_CAPACITY
+        random.seed(0)
+        for _ in range(1000):
+            lon, lat = random.uniform(-180, 180), random.uniform(-90, 90)
+            expected = set(
+                zone.id for zone in zones if zone.contains(lon, lat))
+            assert set(zone.id for zone in index.query(lon, lat)) == expected
+
+    def test_empty(self):
+        assert ZoneIndex([]).query(0, 0) == []
+
+
+class TestZonesCache:
+
+    @pytest.fixture
+    def geoserver_client(self):
+        client = mock.Mock()
+        client.get_sanction_zones.return_value = {
+            'features': [feature('s.1', ' Iran ', square(0, 0, 10))]}
+        client.get_war_zones.return_value = {
+            'features': [feature('w.1', 'Gulf', square(5, 5, 10))]}
+        client.get_active_cyclones.return_value = {
+            'features': [feature(None, 'Cyclone', square(20, 20, 1))]}
+        return client
+
+    def test_get_index(self, geoserver_client):
+        cache = ZonesCache(geoserver_client)
+
+        index = cache.get_index()
+
+        assert cache.get_index() is index
+        assert geoserver_client.get_sanction_zones.call_count == 1
+        zones = sorted(index.query(6, 6), key=lambda zone: zone.id)
+        assert [(zone.id, zone.type, zone.name) for zone in zones] == [
+            ('s.1', 'sanction', 'Iran'), ('w.1', 'warzone', 'Gulf')]
+        assert [zone.id for zone in index.query(20.5, 20.5)] == ['cyclone.2']
+
+    def test_update_failed(self, geoserver_client):
+        cache = ZonesCache(geoserver_client)
+        index = cache.get_index()
+        cache._updated -= ZonesCache.UPDATE_INTERVAL + 1
+        geoserver_client.get_war_zones.side_effect = ValueError
+
+        assert cache.get_index() is index
+        assert geoserver_client.get_sanction_zones.call_count == 2
+
+    def test_first_update_failed(self, geoserver_client):
+        cache = ZonesCache(geoserver_client)
+        geoserver_client.get_war_zones.side_effect = ValueError
+
+        with pytest.raises(ValueError):
+            cache.get_index()
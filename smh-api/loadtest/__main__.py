@@ -0,0 +1,328 @@
+"""
+Offline HTTP load test of the SMH API.
+
+Starts the Flask app from smh_service/smh_api.py against a local PostgreSQL
+(PostGIS) database and in-process fakes of the AIS, SIS and Port services,
+then drives a concurrent request mix and reports throughput, latency
+percentiles and error rates per request type.
+
+The database (--db-name) must be a dedicated one, never the database the
+service is configured with (DB_HOST, DB_PORT, DB_NAME): cold IMOs are deleted
+from its cache and a load test user is created in it (removed at the end).
+
+Usage (from the smh-api directory):
+    $> python -m loadtest --db-name smh_loadtest --requests 500 --concurrency 16 \\
+           --mix cache_hit=60,cold=10,portcalls=20,portdata=10
+"""
+import argparse
+import base64
+import json
+import logging
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import requests
+from werkzeug.serving import make_server
+
+from loadtest.fakes import FakeServices, voyage_position, PORTS
+
+SCENARIOS = ['cache_hit', 'cold', 'portcalls', 'portdata']
+USERNAME = 'loadtest'
+PASSWORD = 'loadtest'
+WARM_IMO_BASE = 9000000
+COLD_IMO_BASE = 9500000
+COLD_IMO_COUNT = 100000
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m loadtest', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200,
+                        help='total number of requests (default: %(default)s)')
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help='concurrent clients (default: %(default)s)')
+    parser.add_argument('--mix', default='cache_hit=60,cold=10,portcalls=20,portdata=10',
+                        help='weighted request mix (default: %(default)s)')
+    parser.add_argument('--warm-imos', type=int, default=20,
+                        help='IMOs cached before the run for cache hits (default: %(default)s)')
+    parser.add_argument('--smh-params', default='ais_rate=3600&response_type=7',
+                        help='query string of the SMH requests (default: %(default)s)')
+    parser.add_argument('--fake-workers', type=int, default=16,
+                        help='worker threads of the fake Port service (default: %(default)s)')
+    parser.add_argument('--db-name', required=True,
+                        help='dedicated load test database (the DB_* environment is ignored)')
+    parser.add_argument('--db-host', default='127.0.0.1',
+                        help='(default: %(default)s)')
+    parser.add_argument('--db-port', default='5432', help='(default: %(default)s)')
+    parser.add_argument('--db-user', default='postgres', help='(default: %(default)s)')
+    parser.add_argument('--db-password', default='postgres')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--max-p95-ms', type=float,
+                        help='fail (exit code 1) if any request type p95 is above this')
+    parser.add_argument('--max-error-rate', type=float, default=0.0,
+                        help='fail (exit code 1) if the error rate is above this '
+                             '(default: %(default)s)')
+    parser.add_argument('--json', dest='json_report', help='also write the report to this file')
+    return parser.parse_args(argv)
+
+
+def parse_mix(mix):
+    weights = {}
+    for item in mix.split(','):
+        name, _, weight = item.partition('=')
+        if name not in SCENARIOS:
+            raise SystemExit(f'Unknown request type "{name}" (one of {", ".join(SCENARIOS)})')
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def get_address(host):
+    try:
+        return socket.gethostbyname(host)
+    except socket.error:
+        return host
+
+
+def check_database(args):
+    """ Refuse to run against the database of the service config (before it is overridden) """
+    from ps_env_config import config
+
+    service_db = (get_address(config.get('DB_HOST')), str(config.get('DB_PORT')),
+                  config.get('DB_NAME'))
+    if (get_address(args.db_host), str(args.db_port), args.db_name) == service_db:
+        raise SystemExit(f'{args.db_host}:{args.db_port}/{args.db_name} is the database of the '
+                         'SMH service config (DB_HOST, DB_PORT, DB_NAME), the load test needs a '
+                         'dedicated database')
+
+
+def configure_environment(args, urls):
+    """ Point the SMH service config to the fakes and the local DB (before any import) """
+    os.environ.update(urls)
+    os.environ.update({
+        'DB_HOST': args.db_host,
+        'DB_PORT': str(args.db_port),
+        'DB_NAME': args.db_name,
+        'DB_USER': args.db_user,
+        'DB_PASSWORD': args.db_password,
+        'SIS_API_KEY': os.environ.get('SIS_API_KEY', 'loadtest'),
+        'CASSANDRA_AWS': os.environ.get('CASSANDRA_AWS', 'test'),
+        'CASSANDRA_KEYSPACE_USERNAME': os.environ.get('CASSANDRA_KEYSPACE_USERNAME', 'test'),
+        'CASSANDRA_KEYSPACE_PASSWORD': os.environ.get('CASSANDRA_KEYSPACE_PASSWORD', 'test'),
+        'USE_AISAPI': 'True',
+        'STATSD_HOST': os.environ.get('STATSD_HOST', 'localhost'),
+        'LOG_LEVEL': os.environ.get('LOG_LEVEL', 'ERROR'),
+    })
+
+
+def prepare_database():
+    """ Create the cache/user tables if needed and the load test user """
+    from smh_service.smh_config import app, db
+    from smh_service.models import SMHUsers, SMHData, SMHDataSegment
+
+    with app.app_context():
+        SMHUsers.metadata.create_all(db.engine, tables=[SMHUsers.__table__,
+                                                        SMHData.__table__,
+                                                        SMHDataSegment.__table__])
+        # cold IMOs must not be cached from a previous run
+        db.session.query(SMHData).filter(SMHData.imo_number.between(
+            str(COLD_IMO_BASE), str(COLD_IMO_BASE + COLD_IMO_COUNT - 1))).delete(
+            synchronize_session=False)
+        if not db.session.query(SMHUsers).filter_by(username=USERNAME).one_or_none():
+            db.session.add(SMHUsers(username=USERNAME, password=PASSWORD, request_count=0))
+        db.session.commit()
+
+
+def cleanup_database():
+    """ Remove the load test user """
+    from smh_service.smh_config import app, db
+    from smh_service.models import SMHUsers
+
+    with app.app_context():
+        db.session.query(SMHUsers).filter_by(username=USERNAME).delete(
+            synchronize_session=False)
+        db.session.commit()
+        db.session.remove()
+
+
+def cached_imo_count(imo_numbers):
+    from smh_service.smh_config import app, db
+    from smh_service.models import SMHData
+
+    with app.app_context():
+        return db.session.query(SMHData.imo_number).filter(
+            SMHData.imo_number.in_(imo_numbers)).distinct().count()
+
+
+def start_api():
+    from smh_service.smh_api import app
+
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)  # no access log
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+class LoadTest:
+
+    def __init__(self, base_url, args):
+        self.base_url = base_url
+        self.args = args
+        self.local = threading.local()
+        self.warm_imos = [str(WARM_IMO_BASE + index) for index in range(args.warm_imos)]
+        self.cold_imos = iter(range(COLD_IMO_BASE, COLD_IMO_BASE + COLD_IMO_COUNT))
+        self.lock = threading.Lock()
+        self.results = defaultdict(list)  # request type -> [(elapsed, ok)]
+        self.errors = defaultdict(lambda: defaultdict(int))
+
+    @property
+    def session(self):
+        if not hasattr(self.local, 'session'):
+            self.local.session = requests.Session()
+            token = base64.b64encode(f'{USERNAME}:{PASSWORD}'.encode()).decode()
+            self.local.session.headers['Authorization'] = f'Basic {token}'
+        return self.local.session
+
+    def smh_url(self, imo_number):
+        return f'{self.base_url}/api/v1/shipmovementhistory/{imo_number}?{self.args.smh_params}'
+
+    def request(self, scenario):
+        if scenario == 'cache_hit':
+            url, params = self.smh_url(random.choice(self.warm_imos)), None
+        elif scenario == 'cold':
+            with self.lock:
+                imo_number = next(self.cold_imos)
+            url, params = self.smh_url(imo_number), None
+        elif scenario == 'portcalls':
+            now = datetime.utcnow()
+            positions = [voyage_position(WARM_IMO_BASE, now - timedelta(hours=hours))
+                         for hours in range(0, 48, 4)]
+            url = f'{self.base_url}/api/v1/portcalls/'
+            params = {'positions': json.dumps(positions)}
+        else:
+            port = random.choice(PORTS)
+            url = f'{self.base_url}/api/v1/portdata/'
+            params = {'field': 'code', 'value': port['code']}
+
+        start = time.monotonic()
+        try:
+            response = self.session.get(url, params=params, timeout=600)
+            ok = response.status_code == 200
+            error = None if ok else f'HTTP {response.status_code}'
+        except requests.RequestException as exc:
+            ok, error = False, type(exc).__name__
+        elapsed = time.monotonic() - start
+
+        with self.lock:
+            self.results[scenario].append((elapsed, ok))
+            if error:
+                self.errors[scenario][error] += 1
+
+    def warm_up(self):
+        """ Perform and cache the SMH of the warm IMOs (cache writes are asynchronous) """
+        with ThreadPoolExecutor(max_workers=self.args.concurrency) as executor:
+            list(executor.map(lambda imo: self.session.get(self.smh_url(imo), timeout=600),
+                              self.warm_imos))
+        deadline = time.monotonic() + 60
+        while cached_imo_count(self.warm_imos) < len(self.warm_imos):
+            if time.monotonic() > deadline:
+                print('Warning: not all warm IMOs are cached', file=sys.stderr)
+                break
+            time.sleep(0.5)
+
+    def run(self, weights):
+        scenarios = random.choices(list(weights), weights=list(weights.values()),
+                                   k=self.args.requests)
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.args.concurrency) as executor:
+            list(executor.map(self.request, scenarios))
+        return time.monotonic() - start
+
+
+def percentile(values, percent):
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, int(round(percent / 100 * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+def make_report(load_test, duration):
+    report = {'duration_seconds': round(duration, 3), 'requests': 0, 'errors': 0,
+              'scenarios': {}}
+    for scenario, results in sorted(load_test.results.items()):
+        latencies = [elapsed * 1000 for elapsed, _ in results]
+        errors = sum(1 for _, ok in results if not ok)
+        report['requests'] += len(results)
+        report['errors'] += errors
+        report['scenarios'][scenario] = {
+            'requests': len(results),
+            'throughput_rps': round(len(results) / duration, 2) if duration else None,
+            'error_rate': round(errors / len(results), 4),
+            'errors': dict(load_test.errors[scenario]),
+            **{f'p{percent}_ms': round(percentile(latencies, percent), 1)
+               for percent in (50, 90, 95, 99)},
+            'max_ms': round(max(latencies), 1),
+        }
+    report['throughput_rps'] = round(report['requests'] / duration, 2) if duration else None
+    report['error_rate'] = round(report['errors'] / report['requests'], 4) \
+        if report['requests'] else 0
+    return report
+
+
+def print_report(report):
+    print(f"\n{'type':<10} {'requests':>8} {'rps':>8} {'errors':>7} "
+          f"{'p50 ms':>9} {'p90 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for scenario, stats in report['scenarios'].items():
+        print(f"{scenario:<10} {stats['requests']:>8} {stats['throughput_rps']:>8} "
+              f"{stats['error_rate']:>7.2%} {stats['p50_ms']:>9} {stats['p90_ms']:>9} "
+              f"{stats['p95_ms']:>9} {stats['p99_ms']:>9} {stats['max_ms']:>9}")
+        for error, count in stats['errors'].items():
+            print(f"{'':<10} {count:>8} x {error}")
+    print(f"\nTotal: {report['requests']} requests in {report['duration_seconds']}s, "
+          f"{report['throughput_rps']} requests/s, error rate {report['error_rate']:.2%}")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    random.seed(args.seed)
+    weights = parse_mix(args.mix)
+
+    check_database(args)
+    fakes = FakeServices(workers=args.fake_workers)
+    configure_environment(args, fakes.start())
+    try:
+        prepare_database()
+        try:
+            server, base_url = start_api()
+            load_test = LoadTest(base_url, args)
+            if 'cache_hit' in weights:
+                load_test.warm_up()
+            duration = load_test.run(weights)
+            server.shutdown()
+        finally:
+            cleanup_database()
+    finally:
+        fakes.stop()
+
+    report = make_report(load_test, duration)
+    print_report(report)
+    if args.json_report:
+        with open(args.json_report, 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+
+    failed = report['error_rate'] > args.max_error_rate
+    if args.max_p95_ms:
+        failed = failed or any(stats['p95_ms'] > args.max_p95_ms
+                               for stats in report['scenarios'].values())
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
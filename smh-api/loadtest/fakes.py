@@ -0,0 +1,280 @@
+"""
+In-process fakes of the AIS, SIS and Port services used by the SMH API.
+
+The fakes serve a deterministic synthetic voyage for every IMO: the ship
+shuttles between two ports, 12 hours in each port and 12 hours at sea,
+reporting a position every `TRACK_INTERVAL` seconds.
+"""
+import json
+import re
+import threading
+from concurrent import futures
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import urlparse, parse_qs
+
+import grpc
+
+from api_clients.portservice_api import portservice_pb2 as service_pb2
+from api_clients.portservice_api import portservice_pb2_grpc as service_pb2_grpc
+from api_clients.utils import date2str, str2date
+
+TRACK_INTERVAL = 600  # seconds between two AIS positions
+TRACK_DAYS = 180  # no AIS positions older than this
+VOYAGE_HOURS = 48  # port A (12h), sailing (12h), port B (12h), sailing (12h)
+PORTS = [
+    {'code': 'NLRTM', 'name': 'Rotterdam', 'country_name': 'Netherlands',
+     'latitude': 51.95, 'longitude': 4.13},
+    {'code': 'GBFXT', 'name': 'Felixstowe', 'country_name': 'United Kingdom',
+     'latitude': 51.95, 'longitude': 1.35},
+]
+PORT_RADIUS = 0.05  # degrees
+
+
+def mmsi_for_imo(imo_number):
+    return str(200000000 + int(imo_number) % 100000000)
+
+
+def imo_for_mmsi(mmsi):
+    return str(int(mmsi) - 200000000)
+
+
+def voyage_position(imo_number, timestamp):
+    """ Synthetic AIS position of the ship at the given time """
+    offset = int(imo_number) % VOYAGE_HOURS * 3600
+    phase = ((timestamp.timestamp() + offset) % (VOYAGE_HOURS * 3600)) / 3600
+    port_a, port_b = PORTS
+    if phase < 12:
+        latitude, longitude, speed = port_a['latitude'], port_a['longitude'], 0.0
+    elif phase < 24:
+        ratio = (phase - 12) / 12
+        latitude = port_a['latitude']
+        longitude = port_a['longitude'] + (port_b['longitude'] - port_a['longitude']) * ratio
+        speed = 8.6
+    elif phase < 36:
+        latitude, longitude, speed = port_b['latitude'], port_b['longitude'], 0.0
+    else:
+        ratio = (phase - 36) / 12
+        latitude = port_b['latitude']
+        longitude = port_b['longitude'] + (port_a['longitude'] - port_b['longitude']) * ratio
+        speed = 8.6
+
+    return {
+        'mmsi': int(mmsi_for_imo(imo_number)),
+        'timestamp': date2str(timestamp),
+        'latitude': round(latitude, 6),
+        'longitude': round(longitude, 6),
+        'speed': speed,
+        'course': 270.0 if speed else None,
+        'heading': None,
+        'status': 'Moored' if not speed else 'Under way using engine',
+        'source': 'T',
+    }
+
+
+def voyage_track(imo_number, end_date, count, frequency_seconds=None):
+    """ Synthetic AIS track (latest first) before end_date """
+    interval = max(TRACK_INTERVAL, frequency_seconds or 0)
+    start_date = datetime.utcnow() - timedelta(days=TRACK_DAYS)
+    epoch = int(end_date.timestamp()) // interval * interval
+    timestamp = datetime.utcfromtimestamp(epoch)
+    if timestamp >= end_date:
+        timestamp -= timedelta(seconds=interval)
+
+    track = []
+    while len(track) < count and timestamp > start_date:
+        track.append(voyage_position(imo_number, timestamp))
+        timestamp -= timedelta(seconds=interval)
+
+    return track
+
+
+def ihs_movements(imo_number, timestamp_gte=None):
+    """ Synthetic IHS port calls (oldest first, as listed by SIS) for the voyage """
+    now = datetime.utcnow()
+    start_date = max(timestamp_gte or now - timedelta(days=TRACK_DAYS),
+                     now - timedelta(days=TRACK_DAYS))
+    offset = int(imo_number) % VOYAGE_HOURS * 3600
+    epoch = (int(start_date.timestamp()) + offset) // (VOYAGE_HOURS * 3600) * \
+        (VOYAGE_HOURS * 3600) - offset
+    entered = datetime.utcfromtimestamp(epoch)
+
+    movements = []
+    while entered < now:
+        for index, port in enumerate(PORTS):
+            port_entered = entered + timedelta(hours=24 * index)
+            if start_date <= port_entered < now:
+                movements.append({
+                    'imo_id': imo_number,
+                    'timestamp': date2str(port_entered, '%Y-%m-%dT%H:%M:%S'),
+                    'sail_date_full': date2str(port_entered + timedelta(hours=12),
+                                               '%Y-%m-%dT%H:%M:%S'),
+                    'port_name': port['name'],
+                    'country_name': port['country_name'],
+                    'ihs_port_id': str(index + 1),
+                    'latitude': str(port['latitude']),
+                    'longitude': str(port['longitude']),
+                    'movement_type': '',
+                    'hours_in_port': 12,
+                })
+        entered += timedelta(hours=VOYAGE_HOURS)
+
+    return movements
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    """ http.server.ThreadingHTTPServer is not available before python 3.7 """
+    daemon_threads = True
+
+
+class FakeHandler(BaseHTTPRequestHandler):
+    """ JSON GET handler dispatching on the `routes` regex table """
+    routes = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        for pattern, method in self.routes:
+            match = re.fullmatch(pattern, url.path)
+            if match:
+                status, body = getattr(self, method)(params, *match.groups())
+                break
+        else:
+            status, body = 404, {'error': 'Not found'}
+
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass  # keep the load test report readable
+
+
+class FakeAISHandler(FakeHandler):
+    routes = [
+        (r'.*/system/status', 'system_status'),
+        (r'.*/ship', 'list_ships'),
+        (r'.*/ship/(\d+)', 'get_status'),
+        (r'.*/static_and_voyage/(\d+)', 'get_static_and_voyage'),
+        (r'.*/track/(\d+)', 'get_track'),
+    ]
+
+    def system_status(self, params):
+        return 200, {'version': '3.2.0'}
+
+    def list_ships(self, params):
+        imo_number = params.get('q', '').replace('imo_number:', '')
+        if not imo_number.isdigit():
+            return 200, {'data': [], 'count': 0}
+        return 200, {'data': [{'imo_number': imo_number,
+                               'mmsi': mmsi_for_imo(imo_number)}], 'count': 1}
+
+    def get_status(self, params, mmsi):
+        return 200, {'mmsi': mmsi, 'imo_number': imo_for_mmsi(mmsi)}
+
+    def get_static_and_voyage(self, params, mmsi):
+        return 200, {'mmsi': mmsi, 'draught': 10.2, 'destination': PORTS[0]['code']}
+
+    def get_track(self, params, mmsi):
+        end_date = str2date(params.get('end_date')) or datetime.utcnow()
+        track = voyage_track(imo_for_mmsi(mmsi), end_date,
+                             int(params.get('position_count', 500)),
+                             int(params.get('downsample_frequency_seconds', 0)))
+        return 200, {'data': track, 'count': len(track)}
+
+
+class FakeSISHandler(FakeHandler):
+    routes = [
+        (r'.*/system/status', 'system_status'),
+        (r'.*/ships/(\d+)', 'get_ship'),
+        (r'.*/mmsi_history', 'list_mmsi_history'),
+        (r'.*/ship_movement', 'list_ship_movement'),
+    ]
+
+    def system_status(self, params):
+        return 200, {'status': 'OK'}
+
+    def get_ship(self, params, imo_number):
+        return 200, {'imo_id': imo_number, 'mmsi': mmsi_for_imo(imo_number),
+                     'ship_name': f'LOADTEST {imo_number}', 'flag_name': 'Malta',
+                     'shiptype_level_5': 'Bulk Carrier', 'ship_status': 'In Service/Commission'}
+
+    def list_mmsi_history(self, params):
+        imo_number = params.get('imo_number', '0')
+        history = {'imo_number': imo_number, 'mmsi': mmsi_for_imo(imo_number),
+                   'effective_from': date2str(datetime.utcnow() - timedelta(days=TRACK_DAYS)),
+                   'effective_to': None}
+        return 200, {'objects': [history], 'meta': {'next': None, 'total_count': 1}}
+
+    def list_ship_movement(self, params):
+        imo_number = params.get('imo_id', '0')
+        limit = int(params.get('limit', 100))
+        offset = int(params.get('offset', 0))
+        movements = ihs_movements(imo_number, str2date(params.get('timestamp__gte')))
+        page = movements[offset:offset + limit]
+        next_page = 'next' if offset + limit < len(movements) else None
+        return 200, {'objects': page, 'meta': {'next': next_page,
+                                               'total_count': len(movements)}}
+
+
+class FakePortServicer(service_pb2_grpc.FindPortServicer):
+
+    @staticmethod
+    def find_port(latitude, longitude):
+        for port in PORTS:
+            if abs(port['latitude'] - latitude) <= PORT_RADIUS and \
+                    abs(port['longitude'] - longitude) <= PORT_RADIUS:
+                return service_pb2.Port(**port)
+        return service_pb2.Port(code='0')
+
+    def FindNearestPort(self, request, context):
+        return self.find_port(request.latitude, request.longitude)
+
+    def GetPort(self, request, context):
+        for port in PORTS:
+            if str(port.get(request.field)) == request.value:
+                return service_pb2.Port(**port)
+        return service_pb2.Port(code='0')
+
+    def FindClosestPorts(self, request_iterator, context):
+        for position in request_iterator:
+            yield self.find_port(position.latitude, position.longitude)
+
+
+class FakeServices:
+    """ Start/stop the fake AIS and SIS HTTP servers and the fake Port gRPC server """
+
+    def __init__(self, host='127.0.0.1', workers=16):
+        self.host = host
+        self.workers = workers
+        self.http_servers = []
+        self.grpc_server = None
+        self.urls = {}
+
+    def _start_http(self, handler):
+        server = ThreadingHTTPServer((self.host, 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.http_servers.append(server)
+        return f'http://{self.host}:{server.server_port}/api/v1'
+
+    def start(self):
+        self.urls['AIS_REST_BASE_URL'] = self._start_http(FakeAISHandler)
+        self.urls['SIS_BASE_URL'] = self._start_http(FakeSISHandler)
+
+        self.grpc_server = grpc.server(futures.ThreadPoolExecutor(max_workers=self.workers))
+        service_pb2_grpc.add_FindPortServicer_to_server(FakePortServicer(), self.grpc_server)
+        port = self.grpc_server.add_insecure_port(f'{self.host}:0')
+        self.grpc_server.start()
+        self.urls['PORT_SERVICE_BASE_URL'] = f'{self.host}:{port}'
+
+        return self.urls
+
+    def stop(self):
+        for server in self.http_servers:
+            server.shutdown()
+        if self.grpc_server:
+            self.grpc_server.stop(0)
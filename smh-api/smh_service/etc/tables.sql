@@ -144,7 +144,9 @@ CREATE TABLE public.smh_data
   ais_gaps jsonb,
   eez_visits jsonb,
   misc_data jsonb,
+  track_levels jsonb,
   update_count integer DEFAULT 0,
+  segment_count integer DEFAULT 0,
   CONSTRAINT smh_data_pkey PRIMARY KEY (id)
 )
 WITH (
@@ -158,6 +160,38 @@ CREATE INDEX "imo"
   USING btree
   (imo_number COLLATE pg_catalog."default");
 
+-- pre-downsampled position tracks (existing cache tables)
+ALTER TABLE public.smh_data ADD COLUMN IF NOT EXISTS track_levels jsonb;
+
+-- append-only cache segments (segmented_cache), folded into smh_data on compaction
+ALTER TABLE public.smh_data ADD COLUMN IF NOT EXISTS segment_count integer DEFAULT 0;
+
+CREATE TABLE public.smh_data_segments
+(
+  id serial NOT NULL,
+  smh_data_id integer NOT NULL,
+  "timestamp" timestamp without time zone,
+  imo_number character varying(10),
+  options jsonb,
+  port_visits jsonb,
+  positions jsonb,
+  ihs_movements jsonb,
+  ais_gaps jsonb,
+  eez_visits jsonb,
+  track_levels jsonb,
+  CONSTRAINT smh_data_segments_pkey PRIMARY KEY (id)
+)
+WITH (
+  OIDS=FALSE
+);
+ALTER TABLE public.smh_data_segments OWNER TO smh_api;
+GRANT ALL ON TABLE public.smh_data_segments TO smh_api;
+
+CREATE INDEX "smh_data_id"
+  ON public.smh_data_segments
+  USING btree
+  (smh_data_id);
+
 
 CREATE TABLE public.regions
 (
@@ -47,7 +47,9 @@ class SMHData(Base):
     ais_gaps = db.Column(postgresql.JSONB)
     eez_visits = db.Column(postgresql.JSONB)
     misc_data = db.Column(postgresql.JSONB)
+    track_levels = db.Column(postgresql.JSONB)
     update_count = db.Column(db.Integer, default=0)
+    segment_count = db.Column(db.Integer, default=0)
 
     # update from dict
     def update(self, data_dict):
@@ -68,7 +70,8 @@ class SMHData(Base):
 
         start_time = time.monotonic()
         cached_data = namedtuple('cached_data', ['options', 'port_visits', 'positions',
-                                                 'ihs_data', 'gap_data', 'eez_visits'])
+                                                 'ihs_data', 'gap_data', 'eez_visits',
+                                                 'track_levels'])
         cached_smh = db.session.query(cls).filter_by(imo_number=imo_number). \
             order_by(cls.timestamp.desc()).offset(offset).limit(1).one_or_none()
 
@@ -78,6 +81,7 @@ class SMHData(Base):
                 logger.debug(cached_smh=(cached_smh.id, cached_smh.timestamp, offset, elapsed))
                 cached_smh.options['read_db_elapsed'] = elapsed
                 cached_smh.options['update_count'] = cached_smh.update_count or 0
+                cached_smh.options['segment_count'] = cached_smh.segment_count or 0
                 cached_smh.options['timestamp'] = cached_smh.timestamp
                 cached_smh.options['id'] = str(cached_smh._id) if hasattr(cached_smh, '_id') \
                     else cached_smh.id
@@ -86,18 +90,20 @@ class SMHData(Base):
                 position_data = get_unzip_data(cached_smh.positions or {})
                 ihs_data = get_unzip_data(cached_smh.ihs_movements or [])
                 gap_data = get_unzip_data(cached_smh.ais_gaps or [])
+                track_levels = get_unzip_data(cached_smh.track_levels or {})
 
                 return cached_data(cached_smh.options,
                                    cached_smh.port_visits or {},
                                    position_data, ihs_data,
-                                   gap_data, cached_smh.eez_visits or []
+                                   gap_data, cached_smh.eez_visits or [],
+                                   track_levels
                                    )
         except Exception as exc:
             logger.warning('DB read exception', exc=exc)
 
-        return cached_data({}, {}, {}, [], [], [])
+        return cached_data({}, {}, {}, [], [], [], {})
 
-    def insert_update_smh_data(self, data, last_id=None, overwrite=True):
+    def insert_update_smh_data(self, data, last_id=None, overwrite=True, segment_ids=None):
         imo_number = data.get("imo_number")
         options = data.get("options")
 
@@ -112,13 +118,68 @@ class SMHData(Base):
             smh_data = db.session.query(SMHData).get(last_id)
             data['id'] = last_id
             smh_data.update(data)
+            if segment_ids:
+                # compaction - the data already includes these segments, the ones
+                # appended since they were read are kept for the next compaction
+                deleted = SMHDataSegment.delete_segments(last_id, segment_ids)
+                smh_data.segment_count = func.greatest(
+                    func.coalesce(SMHData.segment_count, 0) - deleted, 0)
             logger.debug('DB updated', id=last_id)
         else:
             smh_data = SMHData(**data)
             db.session.add(smh_data)
+            db.session.flush()
+            # a new cache (i.e. invalidated or not overwritten) supersedes the segments of
+            # the previous ones, they would never be read again
+            SMHDataSegment.delete_previous_segments(imo_number, smh_data.id)
         db.session.commit()
 
 
+class SMHDataSegment(Base):
+    """ New SMH data (only) of a cache refresh appended to an SMHData row """
+    __tablename__ = 'smh_data_segments'
+    smh_data_id = db.Column(db.Integer, nullable=False)
+    timestamp = db.Column(db.DateTime())
+    imo_number = db.Column(db.String(10))
+    options = db.Column(postgresql.JSONB)
+    port_visits = db.Column(postgresql.JSONB)
+    positions = db.Column(postgresql.JSONB)
+    ihs_movements = db.Column(postgresql.JSONB)
+    ais_gaps = db.Column(postgresql.JSONB)
+    eez_visits = db.Column(postgresql.JSONB)
+    track_levels = db.Column(postgresql.JSONB)
+
+    @classmethod
+    def get_segments(cls, smh_data_id):
+        return db.session.query(cls).filter_by(smh_data_id=smh_data_id). \
+            order_by(cls.timestamp, cls.id).all()
+
+    @classmethod
+    def add_segment(cls, data, smh_data_id):
+        logger.info("Appending to DB.", smh_data_id=smh_data_id,
+                    imo_number=data.get("imo_number"), smh_timestamp=data.get("timestamp"))
+        db.session.add(cls(smh_data_id=smh_data_id, **data))
+        db.session.query(SMHData).filter_by(id=smh_data_id).update(
+            {SMHData.segment_count: func.coalesce(SMHData.segment_count, 0) + 1},
+            synchronize_session=False)
+        db.session.commit()
+
+    @classmethod
+    def delete_previous_segments(cls, imo_number, smh_data_id):
+        previous_ids = db.session.query(SMHData.id).filter(
+            SMHData.imo_number == imo_number, SMHData.id != smh_data_id)
+        db.session.query(cls).filter(cls.smh_data_id.in_(previous_ids.subquery())).delete(
+            synchronize_session=False)
+        previous_ids.filter(SMHData.segment_count > 0).update(
+            {SMHData.segment_count: 0}, synchronize_session=False)
+
+    @classmethod
+    def delete_segments(cls, smh_data_id, segment_ids):
+        return db.session.query(cls).filter(
+            cls.smh_data_id == smh_data_id, cls.id.in_(segment_ids)).delete(
+            synchronize_session=False)
+
+
 class Regions(Base):
     __tablename__ = 'regions'
     code = db.Column(db.String(8), nullable=False)
@@ -19,6 +19,7 @@ MAX_AIS_RATE_TRACK = 240  # the maximum rate at which to store AIS track.
 NON_PORT_STOPS_RATE = 60  # The rate at which to detect non-port stops
 POSITION_SPLIT_SIZE = 1000
 SPEED_FILTER = 99  # default - disabled
+TRACK_LEVELS = [3600, 21600, 86400]  # pre-downsampled track levels (in seconds) kept in cache
 
 logger = json_logger(__name__, level=config.get('LOG_LEVEL'), sort_keys=False)
 
@@ -89,6 +90,194 @@ def split_list(alist, wanted_parts=1):
             for i in range(wanted_parts)]
 
 
+def downsample_positions(positions, frequency_seconds, last_timestamp=None):
+    """ Thin a track to at most one position per `frequency_seconds`.
+
+    Args:
+        positions (list): AIS positions in ascending timestamp order
+        frequency_seconds (int): minimum interval between kept positions
+        last_timestamp (str, optional): timestamp of the last already kept position
+    Returns:
+        list: The downsampled positions (ascending)
+    """
+    downsampled = []
+    last_ts = str2date(last_timestamp) if last_timestamp else None
+    for pos in positions:
+        ts = str2date(pos.get('timestamp'))
+        if last_ts is None or (ts - last_ts).total_seconds() >= frequency_seconds:
+            downsampled.append(pos)
+            last_ts = ts
+
+    return downsampled
+
+
+def update_track_levels(track_levels, ais_track, levels=None, stop_date=None):
+    """ Extend the pre-downsampled track levels with the new AIS track.
+
+    Positions older than `stop_date` are removed, as the AIS positions are.
+
+    Args:
+        track_levels (dict): cached levels keyed by frequency in seconds (as str)
+        ais_track (list): new AIS positions (latest first)
+        levels (list or None): level frequencies in seconds, TRACK_LEVELS by default
+        stop_date (datetime, optional): the oldest position date kept
+    Returns:
+        dict: The updated track levels
+    """
+    new_positions = [pos for pos in reversed(ais_track or [])
+                     if 'outlier' not in pos and pos.get('latitude')]
+    updated = {}
+    for level in levels or TRACK_LEVELS:
+        level_key = str(level)
+        level_positions = list((track_levels or {}).get(level_key, []))
+        last_timestamp = None
+        if level_positions:
+            last_timestamp = level_positions[-1].get('timestamp')
+            new_level = [pos for pos in new_positions
+                         if pos.get('timestamp') > last_timestamp]
+        else:
+            new_level = new_positions
+        level_positions.extend(downsample_positions(new_level, level, last_timestamp))
+        if stop_date:
+            # positions are oldest first
+            start = 0
+            while start < len(level_positions) and \
+                    str2date(level_positions[start].get('timestamp')) < stop_date:
+                start += 1
+            del level_positions[:start]
+        updated[level_key] = level_positions
+
+    return updated
+
+
+def seed_track_levels(position_list_dict, levels=None):
+    """ Build the pre-downsampled track levels of an SMH cached without them.
+
+    The finest cached positions are used (MAX_AIS_RATE_TRACK if cached).
+
+    Args:
+        position_list_dict (dict): cached positions (oldest first) keyed by rate (as str)
+        levels (list or None): level frequencies in seconds, TRACK_LEVELS by default
+    Returns:
+        dict: The track levels, empty without cached positions
+    """
+    if not position_list_dict:
+        return {}
+
+    rate_key = min(position_list_dict, key=int)
+    positions = [pos for pos in position_list_dict[rate_key] if is_ais_pos(pos)]
+    if not positions:
+        return {}
+
+    return update_track_levels({}, positions[::-1], levels=levels)
+
+
+def get_track_level(track_levels, frequency_seconds):
+    """ Get the positions from the nearest pre-downsampled track level.
+
+    The coarsest level not coarser than `frequency_seconds` is used and
+    thinned further if needed.
+
+    Args:
+        track_levels (dict): cached levels keyed by frequency in seconds (as str)
+        frequency_seconds (int): requested downsample frequency
+    Returns:
+        A Tuple of level used (or None) and the positions
+    """
+    if not track_levels or not frequency_seconds:
+        return None, []
+
+    available = [int(level) for level in track_levels if int(level) <= frequency_seconds]
+    if not available:
+        return None, []
+
+    level = max(available)
+    positions = track_levels.get(str(level), [])
+    if frequency_seconds > level:
+        positions = downsample_positions(positions, frequency_seconds)
+
+    return level, positions
+
+
+def join_visits(new_visits, last_visits):
+    """ Join new port visits with the cached ones (both latest first).
+
+    Cached visits entered after the oldest new visit are redundant and
+    removed. A cached visit still ongoing is merged into the oldest new visit
+    if in the same port, otherwise its departure is set.
+
+    Args:
+        new_visits (list): new port visits
+        last_visits (list): cached port visits
+    Returns:
+        list: The joined port visits
+    """
+    ports = new_visits
+    last_visit_departed = None
+    last_visit_entered = None
+    start = 0
+    if last_visits and ports:
+        new_visit_entered = ports[-1]["entered"]
+        # remove redundant calls
+        while start < len(last_visits):
+            last_visit_entered = last_visits[start].get("entered")
+            last_visit_departed = last_visits[start].get("departed")
+            if new_visit_entered > last_visit_entered:
+                break
+            start += 1
+
+        if not last_visit_departed and start < len(last_visits):
+            last_port = last_visits[start].get("port", {}).get("port_code")
+            new_port = ports[-1].get("port", {}).get("port_code")
+
+            if new_port == last_port:
+                ports[-1]["entered"] = last_visit_entered
+                start += 1
+            else:
+                last_visits[start]["departed"] = ports[-1]["entered"]
+
+    ports.extend(last_visits[start:])
+    return ports
+
+
+def join_positions(new_positions, last_positions):
+    """ Join new AIS positions with the cached ones (both oldest first).
+
+    Cached IHS positions and cached positions not older than the first new
+    position are removed.
+
+    Args:
+        new_positions (list): new AIS positions
+        last_positions (list): cached positions
+    Returns:
+        list: The joined AIS positions
+    """
+    last = [pos for pos in last_positions if is_ais_pos(pos)]
+    if new_positions:
+        new_timestamp = new_positions[0].get("timestamp")
+        # remove redundant positions
+        end = len(last)
+        while end and new_timestamp <= last[end - 1].get("timestamp"):
+            end -= 1
+        del last[end:]
+
+    last.extend(new_positions)
+    return last
+
+
+def join_ais_gaps(new_gaps, last_gaps):
+    """ Join new AIS gaps with the cached ones (both latest first).
+
+    The last cached gap is replaced if it was ongoing.
+    """
+    if new_gaps and last_gaps and isinstance(last_gaps, list) and \
+            last_gaps[0].get('current_report_timestamp') is None:
+        last_gaps = last_gaps[1:]
+    joined_gaps = list(new_gaps)
+    joined_gaps.extend(last_gaps)
+    return joined_gaps
+
+
 def get_ports_from_positions(positions, voyage_stopped_speed=None, detect_stops=0):
     """ Get list of port visits for AIS / IHS positions.
     Loop through positions and see if the (lat, lon) is within a port's
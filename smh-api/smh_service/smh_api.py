@@ -1,10 +1,13 @@
+import copy
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import threading
 import traceback
 
-from flask import jsonify, request
+import orjson
+from flask import Response, jsonify, request
 from flask_cors import cross_origin
 from flask_httpauth import HTTPBasicAuth
 from webargs.flaskparser import use_args
@@ -14,7 +17,7 @@ from api_clients.utils import json_logger, str2date
 from smh_service.smh import get_ports
 from smh_service.clients import port_service_client
 from smh_service import __version__
-from smh_service.smh_api_schema import SMHSchema, DEFAULT_EEZ_REGION_STATUS
+from smh_service.smh_api_schema import SMHSchema, SMHBatchSchema, DEFAULT_EEZ_REGION_STATUS
 from smh_service.smh_task import SMHTask, stats
 from smh_service.models import SMHUsers
 from smh_service.smh_config import app, db
@@ -26,6 +29,7 @@ name = "SMH API"
 logger = json_logger(__name__, level=config.get('LOG_LEVEL'), sort_keys=False)
 
 smh_schema = SMHSchema()
+smh_batch_schema = SMHBatchSchema()
 users = {}
 auth = HTTPBasicAuth()
 
@@ -83,6 +87,12 @@ def system():
     return index(f' - {status}', code=code)
 
 
+@app.errorhandler(400)
+def bad_request(error):
+    logger.error('Bad Request: %s' % request.path)
+    return index(f' - Invalid Inputs {error}', 400)
+
+
 @app.errorhandler(404)
 def page_not_found(error):
     logger.error('Page not found: %s' % request.path)
@@ -172,12 +182,14 @@ def get_port_calls():
     return resp
 
 
-@app.route('/api/v1/shipmovementhistory/<imo_number>', methods=['GET'])
-@cross_origin()
-@auth.login_required
-@stats.timer('smh_total_elapsed')
-@use_args(smh_schema)
-def get_ship_movement_history(args, imo_number):
+def get_smh_options(args):
+    """
+       Compute the SMH options from the request parameters
+       Args:
+           args (dict): parsed request args
+       Returns:
+           A Tuple of options dict and end date (or None)
+    """
     smh_datetime = datetime.utcnow()
     end_date = request.args.get('end_date')
     request_days = int(request.args.get('request_days') or 0)
@@ -211,12 +223,38 @@ def get_ship_movement_history(args, imo_number):
         )
     })
 
-    # process the request in SMH task
+    return options, end_date
+
+
+def run_smh_task(imo_number, options, end_date):
+    """
+       Perform the SMH for an IMO, using and updating its cached SMH
+       Args:
+           imo_number (str): IMO number of the ship
+           options (dict): SMH options
+           end_date (str): The selected date offset or None
+       Returns:
+           The SMHTask with the joined results
+    """
     smh_task = SMHTask(imo_number, options)
+    last_smh, cached_positions = smh_task.get_cached_smh(end_date)  # read/process cached SMH
+    smh_task.get_smh_results(last_smh, cached_positions)  # get new SMH results
+    smh_task.update_cache(last_smh)  # update cache with new/updated SMH results
+
+    return smh_task
+
+
+@app.route('/api/v1/shipmovementhistory/<imo_number>', methods=['GET'])
+@cross_origin()
+@auth.login_required
+@stats.timer('smh_total_elapsed')
+@use_args(smh_schema)
+def get_ship_movement_history(args, imo_number):
+    options, end_date = get_smh_options(args)
+
+    # process the request in SMH task
     try:
-        last_smh, cached_positions = smh_task.get_cached_smh(end_date)  # read/process cached SMH
-        smh_task.get_smh_results(last_smh, cached_positions)  # get new SMH results
-        smh_task.update_cache(last_smh)  # update cache with new/updated SMH results
+        smh_task = run_smh_task(imo_number, options, end_date)
         start = time.monotonic()
         response = smh_task.prepare_response()
         smh_task.options['response_creation_elapsed'] = round(time.monotonic() - start, 3)
@@ -237,6 +275,52 @@ def get_ship_movement_history(args, imo_number):
     return response
 
 
+@app.route('/api/v1/shipmovementhistory/batch', methods=['POST'])
+@cross_origin()
+@auth.login_required
+@use_args(smh_batch_schema, error_status_code=400)
+def get_ship_movement_history_batch(batch_args):
+    """
+       API method to perform the SMH for a list of IMO numbers (JSON body) sharing
+       the same options (query parameters as for a single SMH)
+       Returns:
+           Newline-delimited JSON - one SMH response per IMO in completion order
+    """
+    imo_numbers = list(dict.fromkeys(batch_args.get('imo_numbers', [])))  # no duplicates
+    max_imo_numbers = int(config.get('SMH_BATCH_MAX_IMO_NUMBERS'))
+    if not imo_numbers or len(imo_numbers) > max_imo_numbers:
+        return index(f' - Invalid Inputs (1 to {max_imo_numbers} IMO numbers)', code=400)
+
+    options, end_date = get_smh_options({})
+    stats.incr('smh_batch_requested')  # count of SMH batches requested
+    logger.info("SMH batch", imo_numbers=len(imo_numbers), user=options.get('user'))
+
+    def smh_batch_item(imo_number):
+        with app.app_context():
+            try:
+                smh_task = run_smh_task(imo_number, copy.deepcopy(options), end_date)
+                return {'imo_number': imo_number, **smh_task.get_response_json()}, smh_task
+            except Exception as exc:
+                error = str(exc)
+                logger.error("Exception", Exception_in_SMH=error, imo_number=imo_number)
+                stats.incr('smh_exception')  # exceptions in SMH
+                return {'imo_number': imo_number, 'error': error, 'status_code': 424}, None
+
+    def generate():
+        with ThreadPoolExecutor(max_workers=int(config.get('SMH_BATCH_WORKERS'))) as executor:
+            futures = [executor.submit(smh_batch_item, imo_number)
+                       for imo_number in imo_numbers]
+            for future in as_completed(futures):
+                response_json, smh_task = future.result()
+                yield orjson.dumps(response_json) + b'\n'
+
+                # Save/cache in DB by the same workers once the response line is sent
+                if smh_task and smh_task.options.get('cache_updated', 0) == 1:
+                    executor.submit(smh_task.cache_results, app)
+
+    return Response(generate(), mimetype='application/x-ndjson')
+
+
 if __name__ == '__main__':
     logger.info("Starting service")
     app.run(host="0.0.0.0", port=8080, threaded=True)
@@ -54,6 +54,10 @@ class SMHSchema(Schema):
     downsample_frequency_seconds = fields.Integer(
         default=int(config.get('DEFAULT_DOWNSAMPLE_FREQUENCY_SECONDS')))
     simple_smh = fields.Boolean(default=False)
+    # serve downsample_frequency_seconds from the cached pre-downsampled track levels
+    use_track_levels = fields.Boolean(default=False)
+    # append only the new data of a cache refresh as a segment (compacted periodically)
+    segmented_cache = fields.Boolean(default=False)
 
     # @FIXME
     # Move this stuff somewhere else
@@ -64,6 +68,10 @@ class SMHSchema(Schema):
     use_aisapi = fields.Boolean(default=True)
 
 
+class SMHBatchSchema(Schema):
+    imo_numbers = fields.List(fields.String(), required=True)
+
+
 class SMHDataDictMiscDataSubschema(Schema):
     mmsi_history = fields.List(fields.Dict())
     ship_status = fields.Dict()
@@ -84,4 +92,5 @@ class SMHDataDictSchema(Schema):
     ais_gaps = fields.List(fields.Dict())
     eez_visits = fields.List(fields.Dict())
     ihs_movements = fields.List(fields.Dict())
+    track_levels = fields.Dict()
     misc_data = fields.Nested(SMHDataDictMiscDataSubschema)
@@ -1,3 +1,4 @@
+import copy
 import orjson as json
 import time
 from datetime import datetime, timedelta
@@ -9,15 +10,21 @@ from api_clients.utils import json_zip
 
 from smh_service.smh_api_schema import SMHDataDictSchema, SMHDataDictMiscDataSubschema
 from smh_service.smh import get_port_visit_data, \
-    get_ship_movement_history_from_ihs, is_ais_pos, MAX_AIS_RATE_TRACK
+    get_ship_movement_history_from_ihs, MAX_AIS_RATE_TRACK, \
+    update_track_levels, seed_track_levels, get_track_level, join_visits, join_positions, \
+    join_ais_gaps
 from smh_service.clients import statsd_client
-from smh_service.models import SMHData
+from smh_service.models import SMHData, SMHDataSegment
 
 from ps_env_config import config
 
 logger = json_logger(__name__, level=config.get('LOG_LEVEL'), sort_keys=False)
 stats = statsd_client()
 
+# SMH data stored in a cache segment (new data of a cache refresh only)
+SEGMENT_FIELDS = ('timestamp', 'imo_number', 'options', 'port_visits', 'positions',
+                  'ihs_movements', 'ais_gaps', 'eez_visits', 'track_levels')
+
 
 # possible values for check_for_ihs_updates:
 # 0 = don't check for IHS updates
@@ -49,6 +56,7 @@ class SMHTask:
         self.options = options
         self.visit_list_dict = {}
         self.position_list_dict = {}
+        self.track_levels = {}
         self.ihs_list = []
         self.gaps_list = []
         self.eez_visit_list = []
@@ -65,14 +73,24 @@ class SMHTask:
         self.new_positions = {}
         self.ihs_list_updated = None
         self.non_port_stops = []
+        self.cache_segment = None
+        self.cache_segment_ids = []  # the cache segments joined to the cached SMH
 
-    @stats.timer('prepare_response_elapsed')
     def prepare_response(self):
         """
         Prepare the response and SMH data objects.
         Returns:
             The JSON response object.
         """
+        return Response(json.dumps(self.get_response_json()), mimetype='application/json')
+
+    @stats.timer('prepare_response_elapsed')
+    def get_response_json(self):
+        """
+        Prepare the SMH data objects requested by response_type.
+        Returns:
+            The response dict.
+        """
         self.options['imo_number'] = self.imo_number
         self.options['elapsed_seconds'] = self.elapsed.get('total_time')
         self.elapsed['read_cache_elapsed'] = self.options.get('read_cache_elapsed')
@@ -86,6 +104,13 @@ class SMHTask:
         positions = self.position_list_dict.get(
             str(rate if rate > MAX_AIS_RATE_TRACK else MAX_AIS_RATE_TRACK), []
         )
+        if self.options.get('use_track_levels'):
+            # use the nearest pre-downsampled track instead of the rate positions
+            track_level, level_positions = get_track_level(
+                self.track_levels, self.options.get('downsample_frequency_seconds'))
+            if track_level:
+                positions = level_positions
+            metadata['track_level'] = track_level
         ihs_data = self.ihs_list
         gap_data = self.gaps_list
 
@@ -100,12 +125,14 @@ class SMHTask:
         stops = []
         if detect_stops > 2:
             logger.info("Removing non-port stops", items=len(visits))
+            port_visits = []
             for visit in visits:
                 port_code = visit['port']['port_code']
                 if port_code == "STOPPED":
                     stops.append(visit)
-            visits = [item for item in visits if item not in stops]
-            # visits = list(set(visits) - set(stops))
+                else:
+                    port_visits.append(visit)
+            visits = port_visits
             logger.info("non-port stops removed", visits=len(visits), stops=len(stops))
 
         metadata['visits'] = len(visits)
@@ -239,7 +266,7 @@ class SMHTask:
                      visits=len(visits), positions=len(positions),
                      ihs=len(ihs_data), gaps=len(gap_data))
 
-        return Response(json.dumps(response_json), mimetype='application/json')
+        return response_json
 
     #  Write SMH results in DB
     @stats.timer('cache_results_elapsed')
@@ -260,30 +287,48 @@ class SMHTask:
             screen_datetime = self.options.get('screened_date')
             smh_timestamp = str2date(screen_datetime) if screen_datetime else datetime.utcnow()
 
-            # optionally ZIP ihs, gaps and position data for faster cache read/write
-            # This option is settable by 'zip_data' query parameter (disabled by default)
-            smh_data_dict = smh_data_schema.dump(dict(
-                timestamp=smh_timestamp,
-                imo_number=self.imo_number,
-                cached_days=self.options.get('ais_days'),
-                options=self.options,
-                port_visits=self.visit_list_dict,
-                positions=json_zip(self.position_list_dict)
-                if zip_data else self.position_list_dict,
-                ais_gaps=[json_zip(self.gaps_list)] if zip_data else self.gaps_list,
-                eez_visits=self.eez_visit_list,
-                ihs_movements=[json_zip(self.ihs_list)] if zip_data else self.ihs_list,
-                misc_data=SMHDataDictMiscDataSubschema().dump(dict(
-                    mmsi_history=self.mmsi_history,
-                    ship_status=self.ship_data,
-                    static_and_voyage=self.static_and_voyage,
-                    elapsed=self.elapsed,
-                    lengths=self.lengths,
-                    non_port_stops=self.non_port_stops
-                )),
-            ))
-            with app.app_context():
-                SMHData().insert_update_smh_data(smh_data_dict, last_id, overwrite_cache)
+            segment_count = self.options.get('segment_count') or 0
+            if self.cache_segment is not None and last_id and \
+                    segment_count < int(config.get('SMH_CACHE_MAX_SEGMENTS')):
+                # append only the new data to the cached SMH
+                cache_table = "smh_data_segments"
+                smh_data_dict = SMHDataDictSchema(only=SEGMENT_FIELDS).dump(dict(
+                    self.cache_segment,
+                    timestamp=smh_timestamp,
+                    imo_number=self.imo_number,
+                    options=self.options,
+                ))
+                with app.app_context():
+                    SMHDataSegment.add_segment(smh_data_dict, last_id)
+            else:
+                # optionally ZIP ihs, gaps and position data for faster cache read/write
+                # This option is settable by 'zip_data' query parameter (disabled by default)
+                smh_data_dict = smh_data_schema.dump(dict(
+                    timestamp=smh_timestamp,
+                    imo_number=self.imo_number,
+                    cached_days=self.options.get('ais_days'),
+                    options=self.options,
+                    port_visits=self.visit_list_dict,
+                    positions=json_zip(self.position_list_dict)
+                    if zip_data else self.position_list_dict,
+                    track_levels=json_zip(self.track_levels)
+                    if zip_data else self.track_levels,
+                    ais_gaps=[json_zip(self.gaps_list)] if zip_data else self.gaps_list,
+                    eez_visits=self.eez_visit_list,
+                    ihs_movements=[json_zip(self.ihs_list)] if zip_data else self.ihs_list,
+                    misc_data=SMHDataDictMiscDataSubschema().dump(dict(
+                        mmsi_history=self.mmsi_history,
+                        ship_status=self.ship_data,
+                        static_and_voyage=self.static_and_voyage,
+                        elapsed=self.elapsed,
+                        lengths=self.lengths,
+                        non_port_stops=self.non_port_stops
+                    )),
+                ))
+                # a new cache, or the compaction of the cache segments (if any)
+                with app.app_context():
+                    SMHData().insert_update_smh_data(smh_data_dict, last_id, overwrite_cache,
+                                                     self.cache_segment_ids)
 
             logger.info("SMH data Saved",
                         elapsed=time.monotonic() - start,
@@ -299,6 +344,46 @@ class SMHTask:
 
         return cache_table
 
+    def apply_cache_segments(self, options, ihs_list, gaps_list, eez_visit_list):
+        """
+           Join the cache segments (oldest first) of the cached SMH as done
+           by `update_cache` when they were cached.
+
+           Args:
+               options (dict): The cached SMH options
+               ihs_list (list): The cached IHS data
+               gaps_list (list): The cached AIS gaps
+               eez_visit_list (list): The cached EEZ visits
+           Returns:
+               A Tuple of options, IHS data, AIS gaps and EEZ visits
+        """
+        segments = SMHDataSegment.get_segments(options.get('id'))
+        self.cache_segment_ids = [segment.id for segment in segments]
+        for segment in segments:
+            for k, visits in (segment.port_visits or {}).items():
+                self.visit_list_dict[k] = join_visits(visits, self.visit_list_dict.get(k, []))
+            for k, positions in (segment.positions or {}).items():
+                self.position_list_dict[k] = join_positions(
+                    positions, self.position_list_dict.get(k, []))
+            for level, positions in (segment.track_levels or {}).items():
+                self.track_levels[level] = self.track_levels.get(level, []) + positions
+            ihs_list = (segment.ihs_movements or []) + ihs_list
+            gaps_list = join_ais_gaps(segment.ais_gaps or [], gaps_list)
+            eez_visit_list = (segment.eez_visits or []) + eez_visit_list
+
+        if segments:
+            # the latest segment options, for the cached SMH row
+            last_options = dict(segments[-1].options or {})
+            for key in ('id', 'read_db_elapsed'):
+                last_options[key] = options.get(key)
+            last_options['timestamp'] = segments[-1].timestamp
+            last_options['update_count'] = options.get('update_count', 0) + len(segments)
+            last_options['segment_count'] = len(segments)
+            options = last_options
+
+        logger.info("Cache segments joined", segments=len(segments))
+        return options, ihs_list, gaps_list, eez_visit_list
+
     @stats.timer('read_cache_elapsed')
     def get_cached_smh(self, end_date):
         """
@@ -333,8 +418,14 @@ class SMHTask:
             try:
                 # retrieve the latest SMH results
                 options, self.visit_list_dict, self.position_list_dict, \
-                    ihs_list, gaps_list, eez_visit_list = \
+                    ihs_list, gaps_list, eez_visit_list, self.track_levels = \
                     SMHData().get_cached_smh_data(self.imo_number, update)
+                if options and not self.track_levels:
+                    # cached before the track levels, the segments extend the seeded levels
+                    self.track_levels = seed_track_levels(self.position_list_dict)
+                if options.get('segment_count'):
+                    options, ihs_list, gaps_list, eez_visit_list = self.apply_cache_segments(
+                        options, ihs_list, gaps_list, eez_visit_list)
 
                 last_smh['options'] = options
                 last_smh['ihs'] = ihs_list
@@ -345,6 +436,7 @@ class SMHTask:
                         last_options = last_smh.get('options', {})
                         last_id = last_options.get('id')
                         self.options['last_update_count'] = last_options.get('update_count', 0)
+                        self.options['segment_count'] = last_options.get('segment_count', 0)
                         self.options['read_db_elapsed'] = last_options.get('read_db_elapsed')
                         self.cached_datetime = last_options.get('timestamp')
                         if isinstance(self.cached_datetime, str):
@@ -525,68 +617,55 @@ class SMHTask:
                         visits=len(self.visit_list_dict.get('3600', [])),
                         gaps=len(last_ais_gaps),
                         ihs=len(last_ihs))
+            if self.options.get('segmented_cache') and not use_cached_positions and \
+                    not self.ihs_list_updated:
+                # the new data only (before joining) to be cached as a segment
+                self.cache_segment = copy.deepcopy(dict(
+                    port_visits=self.new_visits,
+                    positions=self.new_positions,
+                    ihs_movements=self.ihs_list,
+                    ais_gaps=self.gaps_list,
+                    eez_visits=self.eez_visit_list,
+                ))
+
             if use_cached_positions:
                 joined_visits = self.new_visits
                 joined_positions = self.new_positions
             else:
                 for k, p in self.new_visits.items():
-                    ports = p
                     last_visits = self.visit_list_dict.get(str(k), [])
-                    last_visit_departed = None
-                    last_visit_entered = None
-                    if last_visits and ports:
-                        new_visit_entered = ports[-1]["entered"]
-                        # remove redundant calls
-                        while last_visits:
-                            last_visit_entered = last_visits[0].get("entered")
-                            last_visit_departed = last_visits[0].get("departed")
-                            if new_visit_entered > last_visit_entered:
-                                break
-                            last_visits.pop(0)
-
-                        if not last_visit_departed and last_visits:
-                            last_port = last_visits[0].get("port", {}).get("port_code")
-                            new_port = ports[-1].get("port", {}).get("port_code")
-
-                            if new_port == last_port:
-                                ports[-1]["entered"] = last_visit_entered
-                                last_visits.pop(0)
-                            else:
-                                last_visits[0]["departed"] = ports[-1]["entered"]
-
                     logger.debug("Joining", rate=k, last_visits_length=len(last_visits),
-                                 new_visits_length=len(ports))
-                    ports.extend(last_visits)
-                    joined_visits[k] = ports
+                                 new_visits_length=len(p))
+                    joined_visits[k] = join_visits(p, last_visits)
 
                 for k, p in self.new_positions.items():
-                    # positions = p
                     last_all = self.position_list_dict.get(str(k), [])
-                    last = [pos for pos in last_all if is_ais_pos(pos)]
-                    logger.debug("Last positions", rate=k,
-                                 all=len(last_all), len=len(last), new=len(p))
-                    if p:
-                        new_timestamp = p[0].get("timestamp")
-                        # remove redundant positions
-                        while last:
-                            last_timestamp = last[-1].get("timestamp")
-                            if new_timestamp > last_timestamp:
-                                break
-                            last.pop(-1)
-
-                    logger.debug("Last positions Removed", len=len(last), rate=k)
-                    last.extend(p)
-                    joined_positions[k] = last
+                    logger.debug("Last positions", rate=k, all=len(last_all), new=len(p))
+                    joined_positions[k] = join_positions(p, last_all)
 
                 # join IHS data and EEZ visits
                 self.ihs_list.extend(last_ihs)
                 self.eez_visit_list.extend(last_eez_visits)
 
-            # remove the last gap if it was on going
-            if self.gaps_list and last_ais_gaps and isinstance(last_ais_gaps, list) and \
-                    last_ais_gaps[0].get('current_report_timestamp') is None:
-                last_ais_gaps.pop(0)
-            self.gaps_list.extend(last_ais_gaps)  # join gaps data
+            # join gaps data (the last gap is removed if it was on going)
+            self.gaps_list = join_ais_gaps(self.gaps_list, last_ais_gaps)
+
+            # extend the pre-downsampled track levels with the new AIS track
+            # (trimmed to the requested AIS days, older positions are removed)
+            last_timestamps = {
+                level: positions[-1].get('timestamp')
+                for level, positions in (self.track_levels or {}).items() if positions
+            }
+            self.track_levels = update_track_levels(
+                self.track_levels, self.ais_track,
+                stop_date=self.get_track_levels_stop_date(ports_days))
+            if self.cache_segment is not None:
+                self.cache_segment['track_levels'] = {
+                    level: [pos for pos in positions
+                            if level not in last_timestamps or
+                            pos.get('timestamp') > last_timestamps[level]]
+                    for level, positions in self.track_levels.items()
+                }
 
             self.elapsed['total_time'] = time.monotonic() - self.start_time
             self.visit_list_dict = joined_visits
@@ -602,9 +681,20 @@ class SMHTask:
             self.options['first_smh_timestamp'] = self.options['screened_date']
             self.visit_list_dict = self.new_visits
             self.position_list_dict = self.new_positions
+            self.track_levels = update_track_levels(
+                {}, self.ais_track,
+                stop_date=self.get_track_levels_stop_date(self.options.get('ais_days')))
 
         return
 
+    @staticmethod
+    def get_track_levels_stop_date(ais_days):
+        """ The oldest track levels position date, the AIS positions cutoff. """
+        if not ais_days:
+            return None
+
+        return datetime.utcnow() - timedelta(days=int(ais_days))
+
     @stats.timer('check_ihs_update_elapsed')
     def check_for_ihs_update(self, ais_days, ihs_visits):
         # check if IHS movement data is updated
@@ -37,7 +37,7 @@ def gap_item(current_report_timestamp=None, current_report_gps=(0, 0),
 
 def smh_data(id=1, timestamp=None, imo_number='123', port_calls=None, visits=None,
              positions=None, ihs=None,
-             options=None, update_count=None):
+             options=None, update_count=None, track_levels=None):
     if not options:
         options = {}
     options['read_db_elapsed'] = 1
@@ -48,7 +48,7 @@ def smh_data(id=1, timestamp=None, imo_number='123', port_calls=None, visits=Non
 
     gap = []
     eez_visits = []
-    return options, visits or {}, positions or {}, ihs or [], gap, eez_visits
+    return options, visits or {}, positions or {}, ihs or [], gap, eez_visits, track_levels or {}
 
 
 def visit_data(entered="2020-07-29T18:27:35Z", departed=None, speed=None,
@@ -0,0 +1,121 @@
+import base64
+from unittest.mock import Mock, patch
+
+import orjson
+import pytest
+from werkzeug.security import generate_password_hash
+
+from smh_service.smh_config import app
+
+# users are read from the DB when the API module is imported
+with patch('smh_service.smh_config.db.session'):
+    from smh_service import smh_api
+
+BATCH_URL = '/api/v1/shipmovementhistory/batch'
+
+
+def smh_task_item(imo_number, cache_updated=0):
+    smh_task = Mock(options={'cache_updated': cache_updated})
+    smh_task.get_response_json.return_value = {
+        'data': {'imo_number': imo_number, 'port_visits': []}, 'status_code': 200}
+
+    return smh_task
+
+
+class TestSMHApiBatch:
+    client = None
+    headers = None
+
+    def setup(self):
+        self.client = app.test_client()
+        credentials = base64.b64encode(b'batch_user:batch_password').decode()
+        self.headers = {'Authorization': f'Basic {credentials}'}
+
+    @pytest.fixture(autouse=True)
+    def user(self):
+        password_hash = generate_password_hash('batch_password')
+        with patch.dict(smh_api.users, {'batch_user': password_hash}), \
+                patch.object(smh_api.SMHUsers, 'update_user_request_count'):
+            yield
+
+    def post_batch(self, body):
+        response = self.client.post(BATCH_URL, json=body, headers=self.headers)
+        response.get_data()  # the ndjson lines are streamed
+        return response
+
+    @staticmethod
+    def get_lines(response):
+        return {line['imo_number']: line for line in map(
+            orjson.loads, response.data.splitlines())}
+
+    @pytest.mark.parametrize('body', [
+        {},
+        {'imo_numbers': []},
+        {'imo_numbers': '1234567'},
+        {'imo_numbers': [1234567, {}]},
+        {'imo_numbers': [str(imo_number) for imo_number in range(1001)]},
+    ])
+    def test_invalid_imo_numbers(self, body):
+        with patch.object(smh_api, 'run_smh_task') as run_smh_task:
+            response = self.post_batch(body)
+
+        assert response.status_code == 400
+        assert response.json['status_code'] == 400
+        assert 'Invalid Inputs' in response.json['msg']
+        run_smh_task.assert_not_called()
+
+    def test_unauthorized(self):
+        response = self.client.post(BATCH_URL, json={'imo_numbers': ['1234567']})
+
+        assert response.status_code == 401
+
+    def test_ship_results(self):
+        smh_tasks = {imo_number: smh_task_item(imo_number)
+                     for imo_number in ('1234567', '7654321')}
+
+        with patch.object(smh_api, 'run_smh_task',
+                          side_effect=lambda imo_number, *args: smh_tasks[imo_number]) \
+                as run_smh_task:
+            response = self.post_batch({'imo_numbers': ['1234567', '7654321', '1234567']})
+
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        assert self.get_lines(response) == {
+            imo_number: {'imo_number': imo_number, 'status_code': 200,
+                         'data': {'imo_number': imo_number, 'port_visits': []}}
+            for imo_number in smh_tasks
+        }
+        # duplicates are screened once
+        assert sorted(call[0][0] for call in run_smh_task.call_args_list) == \
+            ['1234567', '7654321']
+
+    def test_cached_and_missing_ships(self):
+        smh_tasks = {
+            '1111111': smh_task_item('1111111', cache_updated=0),  # cached
+            '2222222': smh_task_item('2222222', cache_updated=1),  # missing
+            '3333333': smh_task_item('3333333', cache_updated=0),  # cached
+            '4444444': smh_task_item('4444444', cache_updated=1),  # missing
+        }
+
+        def run_smh_task(imo_number, *args):
+            if imo_number == '5555555':
+                raise Exception('AIS API error')
+            return smh_tasks[imo_number]
+
+        with patch.object(smh_api, 'run_smh_task', side_effect=run_smh_task):
+            response = self.post_batch({'imo_numbers': [*smh_tasks, '5555555']})
+
+        assert response.status_code == 200
+        lines = self.get_lines(response)
+        assert set(lines) == {*smh_tasks, '5555555'}
+        for imo_number in smh_tasks:
+            assert lines[imo_number]['status_code'] == 200
+            assert lines[imo_number]['data']['imo_number'] == imo_number
+        assert lines['5555555'] == {
+            'imo_number': '5555555', 'error': 'AIS API error', 'status_code': 424}
+
+        # only the missing ships are saved in the cache
+        smh_tasks['1111111'].cache_results.assert_not_called()
+        smh_tasks['3333333'].cache_results.assert_not_called()
+        smh_tasks['2222222'].cache_results.assert_called_once_with(app)
+        smh_tasks['4444444'].cache_results.assert_called_once_with(app)
@@ -9,6 +9,7 @@ from unittest.mock import patch
 from api_clients.base_client import ResponseDict
 from api_clients.utils import str2date, date2str, ZIPJSON_KEY
 
+from smh_service.models import SMHDataSegment
 from smh_service.smh_task import SMHTask
 from smh_service.smh import compute_ais_gaps
 from smh_service.tests.helpers import ihs_item, gap_item, smh_data, visit_data, ais_position_item
@@ -307,6 +308,40 @@ class TestSMHTask:
         assert last_smh is None
         assert cached_positions == {}
 
+    @patch('smh_service.smh_task.SMHData.get_cached_smh_data')
+    def test_get_cached_smh_track_levels_seeded(self, mock_get_cache):
+        """Cached before the track levels - levels are seeded from the cached positions"""
+        positions = {
+            '3600': [ais_position_item(timestamp="2020-08-01T00:00:00Z")],
+            '240': [ais_position_item(timestamp="2020-08-01T00:00:00Z"), ihs_item(),
+                    ais_position_item(timestamp="2020-08-01T02:00:00Z"),
+                    ais_position_item(timestamp="2020-08-01T07:00:00Z")],
+        }
+        mock_get_cache.return_value = smh_data(id=5, timestamp=datetime.utcnow(),
+                                               options={'ais_days': 15},
+                                               positions=copy.deepcopy(positions))
+
+        self.smh_task.options['use_cache'] = 1
+        self.smh_task.options['ais_days'] = 12
+        self.smh_task.options['check_for_ihs_updates'] = 0
+        last_smh, _ = self.smh_task.get_cached_smh(None)
+
+        assert last_smh is not None
+        assert [pos['timestamp'] for pos in self.smh_task.track_levels['3600']] == \
+            ["2020-08-01T00:00:00Z", "2020-08-01T02:00:00Z", "2020-08-01T07:00:00Z"]
+        assert [pos['timestamp'] for pos in self.smh_task.track_levels['21600']] == \
+            ["2020-08-01T00:00:00Z", "2020-08-01T07:00:00Z"]
+
+        # cached track levels are used as is
+        track_levels = {'3600': [ais_position_item(timestamp="2020-08-01T07:00:00Z")]}
+        mock_get_cache.return_value = smh_data(id=5, timestamp=datetime.utcnow(),
+                                               options={'ais_days': 15},
+                                               positions=copy.deepcopy(positions),
+                                               track_levels=copy.deepcopy(track_levels))
+        self.smh_task.get_cached_smh(None)
+
+        assert self.smh_task.track_levels == track_levels
+
     @patch('smh_service.smh_task.SMHData.get_cached_smh_data')
     def test_get_cached_smh_new_format_cache_found(self, mock_get_cache):
         """Cache found and will be used"""
@@ -715,6 +750,116 @@ class TestSMHTask:
         assert len(self.smh_task.visit_list_dict.get('3600')) == 3
         assert len(self.smh_task.position_list_dict.get('3600')) == 2
 
+    def test_update_cache_with_ongoing_cached_call(self):
+        """ an ongoing cached port call is merged into the new call in the same port """
+        port = {'port_code': 'NLRTM', 'port_name': 'Rotterdam'}
+        self.smh_task.new_visits = {'3600': [
+            visit_data(entered="2020-08-06T10:00:00Z", port={'port_code': 'GBFXT'}),
+            visit_data(entered="2020-08-05T10:00:00Z", departed="2020-08-05T20:00:00Z",
+                       port=port),
+        ]}
+        self.smh_task.new_positions = {}
+        self.smh_task.cached_datetime = str2date('2020-08-05 00:00:00')
+        self.smh_task.visit_list_dict = {'3600': [
+            visit_data(entered="2020-08-05T12:00:00Z", port=port),  # redundant
+            visit_data(entered="2020-08-04T10:00:00Z", port=port),  # ongoing when cached
+            visit_data(entered="2020-08-01T10:00:00Z", departed="2020-08-02T10:00:00Z"),
+        ]}
+        self.smh_task.update_cache({'options': {'smh_count': 1, 'ais_days': 15}})
+
+        visits = self.smh_task.visit_list_dict['3600']
+        assert [visit['entered'] for visit in visits] == \
+            ["2020-08-06T10:00:00Z", "2020-08-04T10:00:00Z", "2020-08-01T10:00:00Z"]
+        assert visits[1]['departed'] == "2020-08-05T20:00:00Z"
+
+    def test_prepare_response_remove_stops(self):
+        """ non-port stops are removed with detect_stops > 2 """
+        self.smh_task.options.update({'ais_rate': 3600, 'request_days': 0, 'port_count_limit': 0,
+                                      'response_type': 0x01, 'detect_stops': 3})
+        self.smh_task.visit_list_dict = {'3600': [
+            visit_data(port={'port_code': 'NLRTM'}),
+            visit_data(port={'port_code': 'STOPPED'}),
+            visit_data(port={'port_code': 'GBFXT'}),
+        ]}
+
+        response = json.loads(self.smh_task.prepare_response().data)
+
+        assert [visit['port']['port_code'] for visit in response['visits']] == \
+            ['NLRTM', 'GBFXT']
+        assert response['metadata']['visits'] == 2
+
+    def test_update_cache_track_levels(self):
+        """ cached track levels are extended with the new AIS track only """
+        self.smh_task.new_visits = {}
+        self.smh_task.new_positions = {}
+        self.smh_task.cached_datetime = str2date('2020-08-05 00:00:00')
+        self.smh_task.track_levels = {
+            '3600': [ais_position_item(timestamp="2020-08-04T22:00:00Z")],
+            '86400': [ais_position_item(timestamp="2020-08-04T22:00:00Z")],
+        }
+        # latest first as returned by the SMH engine
+        self.smh_task.ais_track = [
+            ais_position_item(timestamp="2020-08-05T03:00:00Z"),
+            ais_position_item(timestamp="2020-08-05T01:30:00Z"),
+            ais_position_item(timestamp="2020-08-05T01:00:00Z"),
+            ais_position_item(timestamp="2020-08-04T22:00:00Z"),
+        ]
+
+        self.smh_task.update_cache({'options': {'smh_count': 1, 'ais_days': 15}})
+
+        assert [pos['timestamp'] for pos in self.smh_task.track_levels['3600']] == \
+            ["2020-08-04T22:00:00Z", "2020-08-05T01:00:00Z", "2020-08-05T03:00:00Z"]
+        assert len(self.smh_task.track_levels['86400']) == 1
+        # level not in cache yet is built from the new track
+        assert len(self.smh_task.track_levels['21600']) == 1
+
+    def test_update_cache_track_levels_trimmed(self):
+        """ cached track levels older than the requested AIS days are removed """
+        self.smh_task.new_visits = {}
+        self.smh_task.new_positions = {}
+        self.smh_task.options['ais_days'] = 5
+        self.smh_task.cached_datetime = str2date('2020-08-05 00:00:00')
+        self.smh_task.track_levels = {
+            '3600': [ais_position_item(timestamp="2020-07-20T22:00:00Z"),
+                     ais_position_item(timestamp="2020-08-04T22:00:00Z"),
+                     ais_position_item(timestamp="2020-08-05T22:00:00Z")],
+        }
+        self.smh_task.ais_track = [ais_position_item(timestamp="2020-08-09T03:00:00Z")]
+
+        self.smh_task.update_cache({'options': {'smh_count': 1, 'ais_days': 15}})
+
+        assert [pos['timestamp'] for pos in self.smh_task.track_levels['3600']] == \
+            ["2020-08-05T22:00:00Z", "2020-08-09T03:00:00Z"]
+        assert all(pos['timestamp'] >= "2020-08-05T00:00:00Z"
+                   for positions in self.smh_task.track_levels.values()
+                   for pos in positions)
+
+    def test_prepare_response_track_levels(self):
+        """ downsample_frequency_seconds is served from the nearest track level """
+        self.smh_task.options.update({'ais_rate': 3600, 'request_days': 0, 'port_count_limit': 0,
+                                      'response_type': 0x02, 'use_track_levels': True,
+                                      'downsample_frequency_seconds': 43200})
+        self.smh_task.position_list_dict = {'3600': [ais_position_item()]}
+        self.smh_task.track_levels = {
+            '3600': [ais_position_item(timestamp=f"2020-08-05T{hour:02}:00:00Z")
+                     for hour in range(24)],
+            '21600': [ais_position_item(timestamp=f"2020-08-05T{hour:02}:00:00Z")
+                      for hour in range(0, 24, 6)],
+        }
+
+        response = json.loads(self.smh_task.prepare_response().data)
+
+        assert response['metadata']['track_level'] == 21600
+        assert [pos['timestamp'] for pos in response['positions']] == \
+            ["2020-08-05T00:00:00Z", "2020-08-05T12:00:00Z"]
+
+        # finer than any level - the rate positions are used
+        self.smh_task.options['downsample_frequency_seconds'] = 600
+        response = json.loads(self.smh_task.prepare_response().data)
+
+        assert response['metadata']['track_level'] is None
+        assert len(response['positions']) == 1
+
     @patch('smh_service.smh_task.SMHData.insert_update_smh_data')
     def test_cache_results_new_cache(self, mock_insert_to_db):
         """ cache build with new cache table"""
@@ -788,6 +933,93 @@ class TestSMHTask:
         assert ZIPJSON_KEY in gaps[0]  # gap data is zipped as an array of length 1
         assert ZIPJSON_KEY not in visits  # visit data is never zipped
 
+    @patch('smh_service.smh_task.SMHDataSegment.get_segments')
+    def test_update_cache_segmented(self, mock_get_segments):
+        """ cached SMH + cache segment is joined as the refreshed SMH """
+        port = {'port_code': 'NLRTM'}
+        cached_visits = {'3600': [visit_data(entered="2020-08-04T10:00:00Z", port=port),
+                                  visit_data(entered="2020-08-01T10:00:00Z",
+                                             departed="2020-08-02T10:00:00Z")]}
+        cached_positions = {'3600': [ais_position_item(timestamp="2020-08-04T10:00:00Z"),
+                                     ihs_item(),
+                                     ais_position_item(timestamp="2020-08-04T20:00:00Z")]}
+        cached_track_levels = {'3600': [ais_position_item(timestamp="2020-08-04T20:00:00Z")]}
+
+        self.smh_task.options['segmented_cache'] = True
+        self.smh_task.cached_datetime = str2date('2020-08-05 00:00:00')
+        self.smh_task.visit_list_dict = copy.deepcopy(cached_visits)
+        self.smh_task.position_list_dict = copy.deepcopy(cached_positions)
+        self.smh_task.track_levels = copy.deepcopy(cached_track_levels)
+        self.smh_task.new_visits = {'3600': [
+            visit_data(entered="2020-08-06T10:00:00Z", port={'port_code': 'GBFXT'}),
+            visit_data(entered="2020-08-05T10:00:00Z", departed="2020-08-05T20:00:00Z",
+                       port=port)]}
+        self.smh_task.new_positions = {'3600': [
+            ais_position_item(timestamp="2020-08-04T20:00:00Z"),
+            ais_position_item(timestamp="2020-08-06T10:00:00Z")]}
+        self.smh_task.ais_track = [ais_position_item(timestamp="2020-08-06T10:00:00Z")]
+        self.smh_task.gaps_list = self.gaps[:1]
+        self.smh_task.update_cache({'options': {'smh_count': 1, 'ais_days': 15},
+                                    'ais_gaps': self.gaps[1:]})
+
+        # only the new data is in the segment
+        segment = self.smh_task.cache_segment
+        assert len(segment['port_visits']['3600']) == 2
+        assert segment['port_visits']['3600'][-1]['entered'] == "2020-08-05T10:00:00Z"
+        assert len(segment['positions']['3600']) == 2
+        assert len(segment['track_levels']['3600']) == 1
+
+        # the cached SMH + segment is the refreshed SMH
+        mock_get_segments.return_value = [SMHDataSegment(
+            id=7, timestamp=str2date('2020-08-10 00:00:00'), options={'smh_count': 2},
+            **copy.deepcopy(segment))]
+        cached_task = SMHTask('123', {})
+        cached_task.visit_list_dict = copy.deepcopy(cached_visits)
+        cached_task.position_list_dict = copy.deepcopy(cached_positions)
+        cached_task.track_levels = copy.deepcopy(cached_track_levels)
+        options, ihs, gaps, eez_visits = cached_task.apply_cache_segments(
+            {'id': 5, 'update_count': 3, 'segment_count': 1}, [], self.gaps[1:], [])
+
+        assert cached_task.visit_list_dict == self.smh_task.visit_list_dict
+        assert cached_task.position_list_dict == self.smh_task.position_list_dict
+        assert cached_task.track_levels['3600'] == self.smh_task.track_levels['3600']
+        assert gaps == self.smh_task.gaps_list
+        assert options['id'] == 5
+        assert options['smh_count'] == 2
+        assert options['update_count'] == 4
+        assert options['timestamp'] == str2date('2020-08-10 00:00:00')
+        assert cached_task.cache_segment_ids == [7]  # deleted by the compaction only
+
+    @patch('smh_service.smh_task.SMHDataSegment.add_segment')
+    @patch('smh_service.smh_task.SMHData.insert_update_smh_data')
+    def test_cache_results_segment(self, mock_insert_to_db, mock_add_segment):
+        """ cache segment is appended until the segments are compacted """
+        self.smh_task.options['last_smh_id'] = 5
+        self.smh_task.options['overwrite_cache'] = True
+        self.smh_task.options['segment_count'] = 2
+        self.smh_task.visit_list_dict = {'3600': [visit_data(), visit_data()]}
+        self.smh_task.cache_segment = {'port_visits': {'3600': [visit_data()]},
+                                       'positions': {}, 'ihs_movements': [], 'ais_gaps': [],
+                                       'eez_visits': [], 'track_levels': {}}
+
+        result = self.smh_task.cache_results(self.app)
+
+        assert result == "smh_data_segments"
+        assert not mock_insert_to_db.called
+        assert mock_add_segment.call_args[0][1] == 5
+        assert len(mock_add_segment.call_args[0][0]['port_visits']['3600']) == 1
+        assert 'cached_days' not in mock_add_segment.call_args[0][0]
+
+        # compaction
+        self.smh_task.options['segment_count'] = 24
+        self.smh_task.cache_segment_ids = [11, 12]
+        result = self.smh_task.cache_results(self.app)
+
+        assert result == "smh_data"
+        assert len(mock_insert_to_db.call_args[0][0]['port_visits']['3600']) == 2
+        assert mock_insert_to_db.call_args[0][3] == [11, 12]  # the joined segments only
+        assert mock_add_segment.call_count == 1
+
 
 if __name__ == '__main__':
     t = TestSMHTask()
@@ -827,6 +1059,12 @@ if __name__ == '__main__':
     t.test_update_cache_without_cache()
     t.test_update_cache_with_cache_and_ihs_updated()
     t.test_update_cache_with_some_duplicate_calls()
+    t.test_update_cache_with_ongoing_cached_call()
+    t.test_prepare_response_remove_stops()
+    t.test_update_cache_track_levels()
+    t.test_prepare_response_track_levels()
 
     t.test_cache_results_new_cache()
     t.test_cache_results_zip_data()
+    t.test_update_cache_segmented()
+    t.test_cache_results_segment()